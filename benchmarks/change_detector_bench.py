@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Change Detector Benchmark
+Replays the gold dataset frames through the legacy single-thumbnail check
+and the tile change detector, and reports skip rate and CPU cost per frame.
+Both paths are timed from the same decoded RGB image; the cost of turning it
+into each path's input (PIL grayscale / NumPy view) is also reported on its own.
+
+Usage: python benchmarks/change_detector_bench.py [--limit N] [--threshold 0.12]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.change_detector import TileChangeDetector
+
+
+DATASET_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "training_data", "gold_dataset")
+
+
+def legacy_thumb(gray, size=64):
+    """The original _compute_thumb: full-frame grayscale 64x64 resize (of img.convert('L'))."""
+    return np.asarray(gray.resize((size, size), Image.Resampling.BILINEAR), dtype=np.uint8)
+
+
+def percentile(values, pct):
+    return float(np.percentile(values, pct)) if values else 0.0
+
+
+def run(limit=None, threshold=0.12):
+    paths = sorted(glob.glob(os.path.join(DATASET_DIR, "*.jpg")))
+    if limit:
+        paths = paths[:limit]
+    if not paths:
+        print(f"❌ No frames found in {DATASET_DIR}")
+        return
+
+    detector = TileChangeDetector(luma_threshold=threshold)
+    last_thumb = None
+    legacy_skips = tile_skips = 0
+    legacy_ms, tile_ms = [], []
+    legacy_convert_ms, tile_convert_ms = [], []
+    reasons = {}
+
+    print(f"📂 Replaying {len(paths)} frames from {DATASET_DIR}")
+    for path in paths:
+        img = Image.open(path).convert('RGB')
+        img.load()
+
+        # Legacy: one 64x64 thumbnail, mean absolute difference
+        started = time.perf_counter()
+        gray = img.convert('L')
+        legacy_convert_ms.append((time.perf_counter() - started) * 1000)
+        thumb = legacy_thumb(gray)
+        if last_thumb is not None:
+            diff = np.mean(np.abs(thumb.astype(np.int16) - last_thumb.astype(np.int16))) / 255.0
+            if diff < threshold:
+                legacy_skips += 1
+        last_thumb = thumb
+        legacy_ms.append((time.perf_counter() - started) * 1000)
+
+        # Tile detector, from the same image (the live capture hands it a raw buffer view instead)
+        started = time.perf_counter()
+        view = np.asarray(img)
+        tile_convert_ms.append((time.perf_counter() - started) * 1000)
+        report = detector.analyze_frame(view, 'RGB')
+        tile_ms.append((time.perf_counter() - started) * 1000)
+        if not report.changed:
+            tile_skips += 1
+        reasons[report.reason] = reasons.get(report.reason, 0) + 1
+
+    checks = max(1, len(paths) - 1)
+    print("\n" + "="*60)
+    print(" CHANGE DETECTOR BENCHMARK")
+    print("="*60)
+    print(f"{'method':<16}{'skip rate':>12}{'mean ms':>12}{'p95 ms':>12}{'input ms':>12}")
+    print(f"{'legacy thumb':<16}{legacy_skips / checks:>12.1%}{np.mean(legacy_ms):>12.2f}"
+          f"{percentile(legacy_ms, 95):>12.2f}{np.mean(legacy_convert_ms):>12.2f}")
+    print(f"{'tile detector':<16}{tile_skips / checks:>12.1%}{np.mean(tile_ms):>12.2f}"
+          f"{percentile(tile_ms, 95):>12.2f}{np.mean(tile_convert_ms):>12.2f}")
+    print("(mean/p95 include the input conversion from the decoded RGB image; 'input ms' is that part alone)")
+    print("\nTile detector decisions:")
+    for reason, count in sorted(reasons.items(), key=lambda item: -item[1]):
+        print(f"   • {reason}: {count}")
+    print(f"\nDetector state: {detector.get_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark proactive change detection")
+    parser.add_argument("--limit", type=int, default=None, help="Only replay the first N frames")
+    parser.add_argument("--threshold", type=float, default=0.12, help="Luminance change threshold")
+    args = parser.parse_args()
+    run(limit=args.limit, threshold=args.threshold)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Cloud Path Soak Test
+Drives the real cloud stack (CloudMindConnector -> LLMRouter -> RequestScheduler)
+against the local mock LLM server with injected latency and faults, and
+reports end-to-end latency, time to first token, failovers and errors.
+No network or API key needed.
+
+Usage: python benchmarks/cloud_soak.py [--requests 200] [--concurrency 4] [--arrival 0.1] [--latency lognormal:0.4,0.4]
+                                       [--faults 429:0.05,500:0.05,timeout:0.01] [--stream 0.5] [--proactive 0.5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_llm_server import MockLLMServer
+from src.core.cloud_connector import CloudMindConnector
+from src.core.llm_router import LLMRouter
+from src.core.request_scheduler import (RequestScheduler, RequestPreempted, TokenBucket,
+                                        PRIORITY_USER, PRIORITY_PROACTIVE)
+
+UTTERANCES = ["open firefox", "what is this error", "search for rust async", "how is my code looking",
+              "launch spotify", "explain this function"]
+
+
+def percentile(values, pct):
+    return float(np.percentile(values, pct)) if values else 0.0
+
+
+def build_stack(server, read_timeout, rate_per_min):
+    """Groq + Ollama connectors pointed at the mock, behind the router and scheduler."""
+    saved = {key: os.environ.get(key) for key in ("GROQ_BASE_URL", "OLLAMA_BASE_URL")}
+    os.environ["GROQ_BASE_URL"] = server.openai_base_url
+    os.environ["OLLAMA_BASE_URL"] = server.ollama_base_url
+    try:
+        groq = CloudMindConnector(api_key="mock-key")
+        ollama = CloudMindConnector(provider="ollama")
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    for connector in (groq, ollama):
+        connector.read_timeout = read_timeout
+        connector.total_timeout = read_timeout * 2
+    router = LLMRouter({"groq": groq, "ollama": ollama}, order=["groq", "ollama"],
+                       limits={"groq": TokenBucket(rate_per_min, max(1, int(rate_per_min // 6)))})
+    return router, RequestScheduler()
+
+
+async def soak(router, scheduler, requests, concurrency, stream_fraction, proactive_fraction, seed, arrival):
+    rng = random.Random(seed)
+    offsets, at = [], 0.0
+    for _ in range(requests):
+        offsets.append(at)
+        at += rng.expovariate(1.0 / arrival) if arrival > 0 else 0.0
+    results = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        await asyncio.sleep(offsets[i])
+        proactive = rng.random() < proactive_fraction
+        stream = not proactive and rng.random() < stream_fraction
+        speech = None if proactive else rng.choice(UTTERANCES)
+        first_delta = None
+        started = time.perf_counter()
+
+        def on_delta(_):
+            nonlocal first_delta
+            if first_delta is None:
+                first_delta = time.perf_counter() - started
+
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                _, status, _ = await scheduler.run(
+                    PRIORITY_PROACTIVE if proactive else PRIORITY_USER,
+                    lambda: router.think(priority="proactive" if proactive else "user",
+                                         visual_facts="MODE: PROACTIVE" if proactive else "MODE: USER_SPOKE",
+                                         user_speech=speech, history=[],
+                                         on_delta=on_delta if stream else None))
+            except RequestPreempted:
+                status = "PREEMPTED"
+        results.append({"proactive": proactive, "stream": stream, "status": status,
+                        "latency": time.perf_counter() - started, "first_token": first_delta})
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    await router.aclose()
+    return results
+
+
+def run(requests=200, concurrency=4, latency="lognormal:0.4,0.4", token_delay=0.02,
+        faults="429:0.05,500:0.05,timeout:0.01", stream=0.5, proactive=0.5, read_timeout=2.0,
+        rate_per_min=600, arrival=0.1, seed=7):
+    with MockLLMServer(latency=latency, token_delay=token_delay, faults=faults, retry_after=1,
+                       hang=read_timeout * 3, seed=seed) as server:
+        router, scheduler = build_stack(server, read_timeout, rate_per_min)
+        started = time.perf_counter()
+        results = asyncio.run(soak(router, scheduler, requests, concurrency, stream, proactive, seed, arrival))
+        elapsed = time.perf_counter() - started
+        server_stats = dict(server.stats)
+
+    print("\n" + "="*60)
+    print(" CLOUD PATH SOAK TEST (mock backend)")
+    print("="*60)
+    print(f"Requests: {requests} (mean gap {arrival:g}s, concurrency {concurrency}) in {elapsed:.1f}s "
+          f"({requests / elapsed:.1f} req/s), latency {latency}, faults {faults or 'none'}")
+    print("(ok % excludes proactive requests preempted by user turns)")
+    print(f"{'class':<12}{'count':>6}{'preempt':>8}{'ok %':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'TTFT p50':>10}")
+    for label, select in [("user", lambda r: not r["proactive"]), ("proactive", lambda r: r["proactive"]),
+                          ("all", lambda r: True)]:
+        rows = [r for r in results if select(r)]
+        if not rows:
+            continue
+        preempted = sum(1 for r in rows if r["status"] == "PREEMPTED")
+        ok = [r for r in rows if r["status"] == "success"]
+        latencies = [r["latency"] * 1000 for r in ok]
+        ttft = [r["first_token"] * 1000 for r in ok if r["first_token"] is not None]
+        ttft_p50 = f"{percentile(ttft, 50):.0f}" if ttft else "-"
+        print(f"{label:<12}{len(rows):>6}{preempted:>8}{len(ok) / max(1, len(rows) - preempted):>8.1%}"
+              f"{percentile(latencies, 50):>10.0f}{percentile(latencies, 95):>10.0f}"
+              f"{percentile(latencies, 99):>10.0f}{ttft_p50:>10}")
+
+    statuses = {}
+    for r in results:
+        statuses[r["status"]] = statuses.get(r["status"], 0) + 1
+    stats = router.get_stats()
+    print(f"\nStatuses: {statuses}")
+    print(f"Injected faults: {server_stats['faults']}")
+    print(f"Router: {stats['failovers']} failovers, {stats['rate_limited']} rate-limited, "
+          f"{stats['all_failed']} with every backend failing")
+    for name, backend in stats["backends"].items():
+        print(f"   {name}: {backend['calls']} calls, circuit {backend['state']} "
+              f"(opened {backend['times_opened']}x), errors {backend['error_rate']:.0%}")
+    return results, stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Soak-test the cloud path against the mock LLM server")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", default="lognormal:0.4,0.4")
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--faults", default="429:0.05,500:0.05,timeout:0.01")
+    parser.add_argument("--stream", type=float, default=0.5, help="Fraction of user requests that stream")
+    parser.add_argument("--proactive", type=float, default=0.5, help="Fraction of proactive requests")
+    parser.add_argument("--read-timeout", type=float, default=2.0, help="Connector read timeout (s)")
+    parser.add_argument("--rate", type=float, default=600, help="Client-side Groq requests per minute")
+    parser.add_argument("--arrival", type=float, default=0.1, help="Mean seconds between request arrivals (0 = all at once)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(requests=args.requests, concurrency=args.concurrency, latency=args.latency,
+        token_delay=args.token_delay, faults=args.faults, stream=args.stream, proactive=args.proactive,
+        read_timeout=args.read_timeout, rate_per_min=args.rate, arrival=args.arrival, seed=args.seed)
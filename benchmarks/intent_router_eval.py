@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Local Intent Router Evaluation
+Replays the user transcripts of the gold dataset through LocalIntentRouter
+and compares its decisions with the actions the cloud model chose for the
+same utterances ([ACTION:...] markers in the logged responses).
+
+Precision: of the commands routed locally, how many match the cloud's action.
+Recall: of the cloud actions the router supports, how many it routed correctly.
+Disagreements are listed for manual review (the cloud labels are not perfect).
+
+Usage: python benchmarks/intent_router_eval.py [--dataset path] [--threshold 0.85] [--log intent_router_log.jsonl]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.action_executor import ActionExecutor
+from src.core.cloud_connector import MarkerParser
+from src.core.intent_router import LocalIntentRouter
+
+DEFAULT_DATASET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "training_data", "gold_dataset", "partha_rl_dataset.json")
+
+
+def load_transcripts(path):
+    """(transcript, cloud action or None) for every user turn in the dataset."""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    samples = []
+    for entry in entries:
+        text = entry.get("state", {}).get("audio_transcript")
+        if not text or text == "[PROACTIVE]":
+            continue
+        actions = MarkerParser().feed(entry.get("action", {}).get("response", ""))
+        samples.append((text, actions[0] if actions else None))
+    return samples
+
+
+def load_log(path):
+    """(text, None) for every logged decision; without cloud labels only routed decisions are listed."""
+    samples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                samples.append((json.loads(line)["text"], None))
+    return samples
+
+
+def same_action(executor, match, gold):
+    if match.intent != gold["intent"]:
+        return False
+    if match.intent in ("open_application", "close_application"):
+        return executor.resolve_app_name(gold["params"].get("app_name", ""), partial=True) == match.params["app_name"]
+    if match.intent == "media_control":
+        return gold["params"].get("command") == match.params["command"]
+    if match.intent == "volume_control":
+        return gold["params"].get("action") == match.params["action"]
+    return True
+
+
+def run(dataset=None, threshold=None, log=None):
+    executor = ActionExecutor()
+    router = LocalIntentRouter(executor, threshold=threshold, log_path=None)
+    samples = load_log(log) if log else load_transcripts(dataset or DEFAULT_DATASET)
+
+    tp, fp, fn = [], [], []
+    started = time.perf_counter()
+    for text, gold in samples:
+        match = router.route(text)
+        routed = match is not None and match.routed
+        supported = gold is not None and gold["intent"] in router.available_intents
+
+        if routed and gold is not None and same_action(executor, match, gold):
+            tp.append((text, match, gold))
+        elif routed:
+            fp.append((text, match, gold))
+        elif supported:
+            fn.append((text, match, gold))
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print("\n" + "="*60)
+    print(" LOCAL INTENT ROUTER EVALUATION")
+    print("="*60)
+    labelled = sum(1 for _, gold in samples if gold is not None)
+    print(f"Utterances: {len(samples)} ({labelled} with a cloud action), threshold {router.threshold}")
+    print(f"Routed locally: {len(tp) + len(fp)}  (mean decision {elapsed / max(1, len(samples)):.3f}ms)")
+    precision = len(tp) / max(1, len(tp) + len(fp))
+    recall = len(tp) / max(1, len(tp) + len(fn))
+    print(f"Precision: {precision:.2f}  ({len(tp)} agree, {len(fp)} disagree)")
+    print(f"Recall:    {recall:.2f}  ({len(fn)} supported cloud actions not routed)")
+
+    if fp:
+        print("\nRouted locally, cloud did something else (review):")
+        for text, match, gold in fp:
+            print(f"   • {text!r}: local {match.intent} {match.params} ({match.confidence:.2f}) | "
+                  f"cloud {gold['raw'] if gold else 'no action'}")
+    if fn:
+        print("\nCloud acted, router did not route:")
+        for text, match, gold in fn:
+            local = f"{match.intent} ({match.confidence:.2f})" if match else "no match"
+            print(f"   • {text!r}: cloud {gold['raw']} | local {local}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the local intent router against the gold dataset")
+    parser.add_argument("--dataset", default=None, help="Dataset JSON (default gold dataset)")
+    parser.add_argument("--threshold", type=float, default=None, help="Routing threshold (LOCAL_INTENT_THRESHOLD)")
+    parser.add_argument("--log", default=None, help="Replay utterances from a router decision log instead")
+    args = parser.parse_args()
+    run(dataset=args.dataset, threshold=args.threshold, log=args.log)
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Mock LLM Server
+Local stand-in for Groq (OpenAI chat completions) and Ollama (/api/generate,
+/api/chat, /api/tags) so the cloud path can be measured and soak-tested
+with no network and no API key.
+
+- scripted replies: regex on the user's text -> reply (may carry [ACTION:...] markers)
+- latency distributions: fixed, uniform, normal, lognormal (time to first token)
+- streaming: SSE for OpenAI, NDJSON for Ollama, with a per-chunk delay
+- fault injection: 429 (with Retry-After), 5xx and hung requests (timeouts)
+- GET /mock/stats and POST /mock/config for inspection and runtime changes
+
+Run Friday against it:
+    python benchmarks/mock_llm_server.py --port 8765 --latency lognormal:0.4,0.5 --faults 429:0.05,500:0.05
+    GROQ_BASE_URL=http://127.0.0.1:8765/openai/v1 OLLAMA_BASE_URL=http://127.0.0.1:8765 python main.py
+
+Or in-process (tests, benchmarks):
+    with MockLLMServer(latency="fixed:0.2", faults="429:0.1") as server:
+        os.environ["GROQ_BASE_URL"] = server.openai_base_url
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+# Replies for a plain run: proactive checks stay silent, simple commands produce markers
+DEFAULT_SCRIPT = [
+    {"match": r"MODE: PROACTIVE", "reply": "[SILENCE]"},
+    {"match": r"\b(?:open|launch) (\w+)", "reply": "Opening \\1, Sir. [ACTION:open_application|app_name=\\1]"},
+    {"match": r"\bsearch (?:for )?([^\n]+)", "reply": "Searching for that, Sir. [ACTION:search_web|query=\\1]"},
+]
+DEFAULT_REPLY = "Understood, Sir. Everything on the screen looks fine. Let me know if you need anything."
+
+FAULT_KINDS = ("429", "500", "502", "503", "timeout")
+
+
+class LatencyModel:
+    """
+    Seconds to the first token, from a spec string:
+    "0.3" / "fixed:0.3", "uniform:0.1,0.6", "normal:0.4,0.1", "lognormal:0.4,0.5" (median, sigma)
+    """
+
+    def __init__(self, spec: str = "fixed:0", rng: Optional[random.Random] = None):
+        self.spec = spec or "fixed:0"
+        self.rng = rng or random.Random()
+        kind, _, args = self.spec.partition(":") if ":" in self.spec else ("fixed", "", self.spec)
+        self.kind = kind.strip().lower()
+        self.args = [float(value) for value in args.split(",") if value.strip()]
+        if self.kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution '{self.kind}'")
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            value = self.args[0] if self.args else 0.0
+        elif self.kind == "uniform":
+            value = self.rng.uniform(self.args[0], self.args[1])
+        elif self.kind == "normal":
+            value = self.rng.gauss(self.args[0], self.args[1])
+        else:
+            value = self.args[0] * math.exp(self.rng.gauss(0.0, self.args[1]))
+        return max(0.0, value)
+
+
+def parse_faults(spec) -> Dict[str, float]:
+    """"429:0.1,500:0.05,timeout:0.01" (or a dict) -> {kind: probability}."""
+    if not spec:
+        return {}
+    if isinstance(spec, dict):
+        faults = {str(kind): float(p) for kind, p in spec.items()}
+    else:
+        faults = {}
+        for item in str(spec).split(","):
+            if item.strip():
+                kind, _, probability = item.partition(":")
+                faults[kind.strip()] = float(probability)
+    unknown = [kind for kind in faults if kind not in FAULT_KINDS]
+    if unknown:
+        raise ValueError(f"Unknown fault kind(s): {', '.join(unknown)} (use {', '.join(FAULT_KINDS)})")
+    return faults
+
+
+class MockLLMServer:
+    """
+    OpenAI- and Ollama-compatible mock with scripted replies, latency and faults.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: str = "fixed:0",
+                 token_delay: float = 0.0, faults=None, retry_after: float = 1.0, hang: float = 30.0,
+                 script: Optional[List[Dict]] = None, default_reply: str = DEFAULT_REPLY,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            host, port: Bind address (port 0 = pick a free one)
+            latency: Time-to-first-token distribution (see LatencyModel)
+            token_delay: Seconds between streamed chunks (one chunk per word)
+            faults: {kind: probability} or "429:0.1,500:0.05,timeout:0.01"
+            retry_after: Retry-After seconds sent with 429s
+            hang: Seconds a "timeout" fault holds the request before dropping it
+            script: [{"match": regex, "reply": text}] tried in order (\\1 etc. refer to groups)
+            default_reply: Reply when no script entry matches
+            seed: Seed for latency and fault sampling (reproducible runs)
+        """
+        self.host = host
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.configure(latency=latency, token_delay=token_delay, faults=faults, retry_after=retry_after,
+                       hang=hang, script=script if script is not None else DEFAULT_SCRIPT,
+                       default_reply=default_reply)
+        self.stats = {"requests": 0, "streamed": 0, "by_path": {}, "faults": {kind: 0 for kind in FAULT_KINDS}}
+        self._server = _QuietServer((host, port), _MockHandler)
+        self._server.mock = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    @property
+    def openai_base_url(self) -> str:
+        """Value for GROQ_BASE_URL."""
+        return f"{self.url}/openai/v1"
+
+    @property
+    def ollama_base_url(self) -> str:
+        """Value for OLLAMA_BASE_URL."""
+        return self.url
+
+    def configure(self, **settings):
+        """Change latency/faults/script at runtime (same keywords as __init__)."""
+        with self._lock:
+            if "latency" in settings:
+                self.latency = LatencyModel(settings["latency"], self.rng)
+            if "token_delay" in settings:
+                self.token_delay = float(settings["token_delay"])
+            if "faults" in settings:
+                self.faults = parse_faults(settings["faults"])
+            if "retry_after" in settings:
+                self.retry_after = float(settings["retry_after"])
+            if "hang" in settings:
+                self.hang = float(settings["hang"])
+            if "script" in settings:
+                self.script = [(re.compile(entry["match"], re.IGNORECASE), entry["reply"])
+                               for entry in settings["script"]]
+            if "default_reply" in settings:
+                self.default_reply = settings["default_reply"]
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="mock-llm")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reply_for(self, text: str) -> str:
+        """Scripted reply for the request text."""
+        for pattern, reply in self.script:
+            match = pattern.search(text or "")
+            if match:
+                return match.expand(reply).strip()
+        return self.default_reply
+
+    def draw(self):
+        """(fault kind or None, first-token latency) for one request."""
+        with self._lock:
+            roll = self.rng.random()
+            fault = None
+            for kind, probability in self.faults.items():
+                if roll < probability:
+                    fault = kind
+                    break
+                roll -= probability
+            return fault, self.latency.sample()
+
+    def record(self, path: str, fault: Optional[str], streamed: bool):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["by_path"][path] = self.stats["by_path"].get(path, 0) + 1
+            if fault:
+                self.stats["faults"][fault] += 1
+            if streamed:
+                self.stats["streamed"] += 1
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients hanging up on purpose (timeout faults)
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def mock(self) -> MockLLMServer:
+        return self.server.mock
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            return self._json(200, {"models": [{"name": "llava-phi3:latest"}, {"name": "mock"}]})
+        if self.path.endswith("/models"):
+            return self._json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+        if self.path == "/mock/stats":
+            return self._json(200, self.mock.stats)
+        self._json(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._json(400, {"error": "invalid JSON"})
+
+        if self.path == "/mock/config":
+            self.mock.configure(**request)
+            return self._json(200, {"ok": True})
+        if self.path.endswith("/chat/completions"):
+            return self._serve(request, _openai_text(request), "openai")
+        if self.path == "/api/generate":
+            return self._serve(request, request.get("prompt", ""), "ollama_generate")
+        if self.path == "/api/chat":
+            messages = request.get("messages") or [{}]
+            return self._serve(request, messages[-1].get("content", ""), "ollama_chat")
+        self._json(404, {"error": f"unknown path {self.path}"})
+
+    def _serve(self, request, text, api):
+        stream = bool(request.get("stream", api != "openai"))
+        fault, latency = self.mock.draw()
+        self.mock.record(self.path, fault, stream and not fault)
+
+        if fault == "timeout":
+            time.sleep(self.mock.hang)
+            self.close_connection = True
+            return
+        if fault == "429":
+            return self._json(429, {"error": {"message": "Rate limit reached (mock)", "type": "rate_limit"}},
+                              {"Retry-After": f"{self.mock.retry_after:g}"})
+        if fault:
+            return self._json(int(fault), {"error": {"message": f"Mock server error {fault}"}})
+
+        reply = self.mock.reply_for(text)
+        model = request.get("model", "mock")
+        time.sleep(latency)
+        if not stream:
+            if api == "openai":
+                body = {"id": "mock", "object": "chat.completion", "model": model,
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": reply},
+                                     "finish_reason": "stop"}],
+                        "usage": {"prompt_tokens": len(text.split()), "completion_tokens": len(reply.split())}}
+            elif api == "ollama_chat":
+                body = {"model": model, "message": {"role": "assistant", "content": reply}, "done": True}
+            else:
+                body = {"model": model, "response": reply, "done": True}
+            return self._json(200, body)
+
+        chunks = re.findall(r'\S+\s*', reply) or [reply]
+        if api == "openai":
+            events = [f"data: {json.dumps({'choices': [{'index': 0, 'delta': {'content': chunk}}]})}\n\n"
+                      for chunk in chunks] + ["data: [DONE]\n\n"]
+            content_type = "text/event-stream"
+        else:
+            key = "message" if api == "ollama_chat" else "response"
+            events = [json.dumps({key: {"role": "assistant", "content": chunk} if key == "message" else chunk,
+                                  "done": False}) + "\n" for chunk in chunks]
+            events.append(json.dumps({"model": model, "done": True}) + "\n")
+            content_type = "application/x-ndjson"
+        payload = [event.encode() for event in events]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(sum(len(part) for part in payload)))
+        self.end_headers()
+        for i, part in enumerate(payload):
+            if i and self.mock.token_delay:
+                time.sleep(self.mock.token_delay)
+            self.wfile.write(part)
+            self.wfile.flush()
+
+    def _json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _openai_text(request) -> str:
+    """Text of the last user message (string or multimodal content list)."""
+    for message in reversed(request.get("messages", [])):
+        if message.get("role") != "user":
+            continue
+        content = message.get("content", "")
+        if isinstance(content, list):
+            return "\n".join(part.get("text", "") for part in content if part.get("type") == "text")
+        return str(content)
+    return ""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock Groq/Ollama server with latency and fault injection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="lognormal:0.4,0.4", help="fixed:S | uniform:A,B | normal:MEAN,SD | lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--token-delay", type=float, default=0.03, help="Seconds between streamed chunks")
+    parser.add_argument("--faults", default="", help="e.g. 429:0.05,500:0.05,503:0.02,timeout:0.01")
+    parser.add_argument("--retry-after", type=float, default=2.0, help="Retry-After seconds on 429")
+    parser.add_argument("--hang", type=float, default=30.0, help="Seconds a timeout fault holds the request")
+    parser.add_argument("--script", default=None, help='JSON file: [{"match": "regex", "reply": "text"}, ...]')
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            script = json.load(f)
+    server = MockLLMServer(args.host, args.port, latency=args.latency, token_delay=args.token_delay,
+                           faults=args.faults, retry_after=args.retry_after, hang=args.hang,
+                           script=script, seed=args.seed)
+    print(f"🧪 Mock LLM server on {server.url} (latency {args.latency}, faults {args.faults or 'none'})")
+    print(f"   GROQ_BASE_URL={server.openai_base_url} OLLAMA_BASE_URL={server.ollama_base_url} python main.py")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Mock server stopped")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Vision Pipeline Benchmark
+Runs the capture -> change detection -> downscale -> encode path on the
+replay capture backend, so it works on headless machines and CI.
+Reports per-stage latency, how many frames would reach the cloud and the
+payload they would send.
+
+Usage: python benchmarks/pipeline_bench.py [--dir training_data/gold_dataset] [--limit N] [--max-side 768]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.capture_backends import ReplayBackend
+from src.core.change_detector import TileChangeDetector
+from src.core.frame_encoder import FrameEncoder
+from src.core.frame_processing import downscale_to_rgb
+from src.core.payload_controller import PayloadController
+
+
+STAGES = ["grab", "detect", "downscale", "encode", "total"]
+
+
+def percentile(values, pct):
+    return float(np.percentile(values, pct)) if values else 0.0
+
+
+def run(directory=None, limit=None, max_side=768):
+    backend = ReplayBackend(directory, realtime=False, loop=False)
+    if not backend.available():
+        print(f"❌ No frames found in {backend.directory}")
+        return
+    total_frames = min(limit or len(backend.paths), len(backend.paths))
+
+    detector = TileChangeDetector()
+    controller = PayloadController()
+    encoder = FrameEncoder()
+    timings = {stage: [] for stage in STAGES}
+    payloads, kinds = [], {}
+
+    print(f"📂 Replaying {total_frames} frames from {backend.directory}")
+    for _ in range(total_frames):
+        started = time.perf_counter()
+        frame = backend.grab()
+        grabbed = time.perf_counter()
+
+        report = detector.analyze_frame(frame.view(), frame.channel_order)
+        detected = time.perf_counter()
+        timings["grab"].append((grabbed - started) * 1000)
+        timings["detect"].append((detected - grabbed) * 1000)
+        if not report.changed:
+            timings["total"].append((detected - started) * 1000)
+            continue
+
+        # Same path as AdvancedImageProcessor.preprocess_frame + encode_for_budget
+        img = downscale_to_rgb(frame.view(), max_side, max_side, frame.channel_order)
+        scaled = time.perf_counter()
+        plan = controller.encode(img, encoder.encode)
+        encoded = time.perf_counter()
+
+        timings["downscale"].append((scaled - detected) * 1000)
+        timings["encode"].append((encoded - scaled) * 1000)
+        timings["total"].append((encoded - started) * 1000)
+        payloads.append(plan.encoded.payload_bytes)
+        kinds[plan.content.kind] = kinds.get(plan.content.kind, 0) + 1
+    encoder.shutdown()
+
+    print("\n" + "="*60)
+    print(" VISION PIPELINE BENCHMARK (replay backend)")
+    print("="*60)
+    print(f"{'stage':<12}{'frames':>8}{'mean ms':>12}{'p50 ms':>12}{'p95 ms':>12}")
+    for stage in STAGES:
+        values = timings[stage]
+        mean = float(np.mean(values)) if values else 0.0
+        print(f"{stage:<12}{len(values):>8}{mean:>12.2f}{percentile(values, 50):>12.2f}{percentile(values, 95):>12.2f}")
+
+    sent = len(payloads)
+    print(f"\nFrames sent to the cloud: {sent}/{total_frames} ({sent / max(1, total_frames):.1%})")
+    if payloads:
+        print(f"Payload: mean {np.mean(payloads) / 1024:.1f} KB, p95 {percentile(payloads, 95) / 1024:.1f} KB")
+    print("Content classes:")
+    for kind, count in sorted(kinds.items(), key=lambda item: -item[1]):
+        print(f"   • {kind}: {count}")
+    print(f"\nEncoder: {encoder.get_stats()['by_setting']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the vision pipeline on replayed frames")
+    parser.add_argument("--dir", default=None, help="Frame directory (default CAPTURE_REPLAY_DIR / gold dataset)")
+    parser.add_argument("--limit", type=int, default=None, help="Only replay the first N frames")
+    parser.add_argument("--max-side", type=int, default=768, help="Processing size (VISION_MAX_SIDE)")
+    args = parser.parse_args()
+    run(directory=args.dir, limit=args.limit, max_side=args.max_side)
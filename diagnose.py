@@ -58,8 +58,9 @@ def check_api_key():
             
         print(f"   Using Key: ...{API_KEY[-8:]}")
         
+        base_url = os.getenv('GROQ_BASE_URL', 'https://api.groq.com/openai/v1').rstrip('/')
         response = requests.post(
-            "https://api.groq.com/openai/v1/chat/completions",
+            f"{base_url}/chat/completions",
             headers={
                 "Authorization": f"Bearer {API_KEY}",
                 "Content-Type": "application/json"
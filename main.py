@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 """
 🕉️ SAARTHIKA: THE STRATEGIC SHADOW
-Usage: ./venv/bin/python3 main.py
+Usage: ./venv/bin/python3 main.py [--record [DIR]]
+       ./venv/bin/python3 main.py --replay DIR [--speed 0] [--cloud recorded|live] [--report out.json]
 """
 
 import os
+import json
+import argparse
 import sys
 import time
 import asyncio
@@ -37,7 +40,9 @@ async def main_loop():
     # Initialize Partner
     try:
         partner = InteractiveGamingPartner()
+        partner.bind_event_loop()
         partner.start_listening()
+        partner.start_capture()
         print("✅ Core Systems Initialized")
     except Exception as e:
         print(f"❌ Failed to initialize: {e}")
@@ -70,19 +75,32 @@ async def main_loop():
     last_user_speech_time = time.time()
     last_proactive_spoken_time = None
     awaiting_engagement = False
+
+    def on_spoken(job):
+        # Turns run in the pipeline (capture -> think -> speak), so the user is answered
+        # even while Saarthika looks at the screen or is still talking
+        nonlocal last_proactive_spoken_time, awaiting_engagement
+        print(f"🤖 Saarthika: {job.reply}")
+        if job.proactive:
+            last_proactive_spoken_time = time.time()
+            awaiting_engagement = True
+
+    partner.pipeline.on_spoken = on_spoken
+    partner.pipeline.start()
+    # Canned phrases into the TTS cache while the first turns run
+    partner.prewarm_tts()
     
     try:
         while True:
-            # 1. Listen for user voice (Short timeout for responsiveness)
-            user_speech = partner.listen_to_user(timeout=0.3)
-            
-            should_respond = False
-            is_proactive = False
+            # 1. Sleep until the user speaks, the screen changes or the next check is due
+            deadline = last_proactive_time + proactive_interval
+            if awaiting_engagement and last_proactive_spoken_time:
+                deadline = min(deadline, last_proactive_spoken_time + IGNORE_WINDOW)
+            kind, user_speech = await partner.next_event(timeout=max(0.0, deadline - time.time()))
             
             # Logic A: User Spoke -> React Immediately
-            if user_speech:
+            if kind == "speech":
                 print(f"\n👤 You said: {user_speech}")
-                should_respond = True
                 last_user_speech_time = time.time()
 
                 if awaiting_engagement and last_proactive_spoken_time:
@@ -90,12 +108,15 @@ async def main_loop():
                         proactive_interval = max(MIN_PROACTIVE_INTERVAL, proactive_interval - 5)
                         print(f"📉 Engagement detected → proactive interval: {proactive_interval}s")
                     awaiting_engagement = False
+
+                print("🧠 Thinking...")
+                await partner.pipeline.submit(user_speech=user_speech)
             
-            # Logic B: Silent -> Check periodically (Proactive)
-            elif (time.time() - last_proactive_time) > proactive_interval:
-                print("\n⏰ Proactive visual check...")
-                should_respond = True # Or make this conditional on scene verification
-                is_proactive = True
+            # Logic B: Silent -> Check when due, or early when the screen changed (Proactive)
+            elif partner.proactive_due(kind, last_proactive_time, proactive_interval):
+                print("\n👀 Screen changed → proactive visual check..." if kind == "screen"
+                      else "\n⏰ Proactive visual check...")
+                await partner.pipeline.submit(proactive=True)
                 last_proactive_time = time.time()
 
             if awaiting_engagement and last_proactive_spoken_time:
@@ -103,26 +124,6 @@ async def main_loop():
                     proactive_interval = min(MAX_PROACTIVE_INTERVAL, proactive_interval + 10)
                     print(f"📈 No engagement → proactive interval: {proactive_interval}s")
                     awaiting_engagement = False
-            
-            if should_respond:
-                # 2. Capture & Think & Speak
-                # Note: generate_response handles capture internally now
-                print("🧠 Thinking...")
-                reply = await partner.generate_response(
-                    user_speech=user_speech, 
-                    proactive=is_proactive
-                )
-                
-                if reply:
-                    print(f"🤖 Saarthika: {reply}")
-                    asyncio.create_task(partner.speak(reply))
-
-                    if is_proactive:
-                        last_proactive_spoken_time = time.time()
-                        awaiting_engagement = True
-            
-            # Small breather
-            await asyncio.sleep(0.05)
 
     except KeyboardInterrupt:
         print("\n\n🛑 Saarthika Disconnected.")
@@ -132,9 +133,53 @@ async def main_loop():
         print(f"\n❌ CRITICAL ERROR: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # Ctrl+C under asyncio.run arrives as CancelledError: clean up here, not in the except
+        partner.stop_capture()
+        await partner.pipeline.stop()
+        await partner.speech_scheduler.stop()
+        await partner.llm_router.aclose()
+        if partner.recorder is not None:
+            partner.recorder.close()
+        partner.tracer.report()
+        partner.tracer.close()
+
+async def replay_loop(args):
+    """Run a recorded session through the full pipeline and report per-stage latency"""
+    from src.core.session_recorder import SessionLog, SessionReplayer
+
+    session = SessionLog(args.replay)
+    os.environ['SESSION_RECORD'] = '0'
+    partner = InteractiveGamingPartner()
+    replayer = SessionReplayer(partner, session, speed=args.speed, cloud=args.cloud,
+                               latency_scale=args.cloud_latency)
+    report = await replayer.run()
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"📄 Replay report saved: {args.report}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Saarthika: the strategic shadow")
+    parser.add_argument("--record", nargs="?", const="", default=None, metavar="DIR",
+                        help="Record this session for replay (default dir: training_data/sessions/<timestamp>)")
+    parser.add_argument("--replay", metavar="DIR", help="Replay a recorded session instead of going live")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Replay speed: 1 = recorded timing, 0 = turns back to back (default)")
+    parser.add_argument("--cloud", choices=["recorded", "live"], default="recorded",
+                        help="Replay with the recorded cloud replies, or the configured backends (e.g. the mock server)")
+    parser.add_argument("--cloud-latency", type=float, default=1.0,
+                        help="Scale for the recorded cloud latency (0 = instant)")
+    parser.add_argument("--report", metavar="FILE", help="Save the replay report as JSON")
+    return parser.parse_args()
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.record is not None:
+        os.environ['SESSION_RECORD'] = '1'
+        if args.record:
+            os.environ['SESSION_DIR'] = args.record
     try:
-        asyncio.run(main_loop())
+        asyncio.run(replay_loop(args) if args.replay else main_loop())
     except KeyboardInterrupt:
         pass
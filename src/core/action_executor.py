@@ -121,29 +121,8 @@ class ActionExecutor:
         # Application mapping for common apps (OS-specific)
         app_map = self._get_app_map()
         
-        # Add aliases for common terms in different languages
-        aliases = {
-            # Hindi aliases
-            "कैलकुलेटर": "calculator",
-            "कैल्कुलेटर": "calculator",
-            "ब्राउज़र": "browser",
-            "फाइल": "files",
-            "फाइल मैनेजर": "file manager",
-            "टर्मिनल": "terminal",
-            "संगीत": "spotify",
-            "वीडियो": "vlc",
-            # English variations
-            "calc": "calculator",
-            "math": "calculator",
-            "internet": "browser",
-            "web": "browser",
-            "editor": "code",
-            "ide": "code",
-            "command prompt": "terminal",
-            "cmd": "terminal" if self.system == "Linux" else "cmd",
-            "bash": "terminal",
-            "shell": "terminal",
-        }
+        # Aliases for common terms in different languages
+        aliases = self._get_app_aliases()
         
         # Check aliases first
         if normalized_name in aliases:
@@ -564,7 +543,44 @@ class ActionExecutor:
             return {"status": "error", "message": "Could not get active window"}
         except Exception as e:
             return {"status": "error", "message": f"Failed to get active window: {str(e)}"}
-    
+
+    def get_active_window_geometry(self) -> Optional[Dict]:
+        """Get the active window's position and size in screen pixels (Linux/X11)."""
+        values = self._xdotool_shell(["getactivewindow", "getwindowgeometry", "--shell"])
+        if not values or not all(key in values for key in ("X", "Y", "WIDTH", "HEIGHT")):
+            return None
+        return {
+            "x": values["X"],
+            "y": values["Y"],
+            "width": values["WIDTH"],
+            "height": values["HEIGHT"],
+            "window_id": values.get("WINDOW")
+        }
+
+    def get_cursor_position(self) -> Optional[Tuple[int, int]]:
+        """Get the mouse cursor position in screen pixels (Linux/X11)."""
+        values = self._xdotool_shell(["getmouselocation", "--shell"])
+        if not values or "X" not in values or "Y" not in values:
+            return None
+        return values["X"], values["Y"]
+
+    def _xdotool_shell(self, args: List[str]) -> Optional[Dict[str, int]]:
+        """Run an xdotool query with --shell output and parse its KEY=VALUE lines."""
+        if self.system != "Linux":
+            return None
+        try:
+            result = subprocess.run(["xdotool", *args], capture_output=True, text=True, timeout=1)
+            if result.returncode != 0:
+                return None
+            values = {}
+            for line in result.stdout.splitlines():
+                key, _, value = line.partition("=")
+                if value.strip().lstrip("-").isdigit():
+                    values[key.strip()] = int(value)
+            return values
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+
     def _click_screen(self, x: Optional[int], y: Optional[int]) -> Dict:
         """Click at screen coordinates."""
         if x is None or y is None:
@@ -678,6 +694,69 @@ class ActionExecutor:
         
         return base_map
     
+    def _get_app_aliases(self) -> Dict[str, str]:
+        """Spoken names (Hindi, Devanagari transliterations, short forms) -> app map keys."""
+        return {
+            # Hindi aliases
+            "कैलकुलेटर": "calculator",
+            "कैल्कुलेटर": "calculator",
+            "ब्राउज़र": "browser",
+            "ब्राउजर": "browser",
+            "फाइल": "files",
+            "फाइल मैनेजर": "file manager",
+            "टर्मिनल": "terminal",
+            "संगीत": "spotify",
+            "वीडियो": "vlc",
+            # Devanagari transliterations from hi-IN speech recognition
+            "क्रोम": "chrome",
+            "गूगल क्रोम": "chrome",
+            "फायरफॉक्स": "firefox",
+            "स्पॉटिफाई": "spotify",
+            "डिस्कॉर्ड": "discord",
+            "वीएस कोड": "vscode",
+            "कोड": "code",
+            "सेटिंग्स": "settings",
+            "कैलेंडर": "calendar",
+            "नोटपैड": "text editor",
+            # English variations
+            "calc": "calculator",
+            "math": "calculator",
+            "internet": "browser",
+            "web": "browser",
+            "google chrome": "chrome",
+            "vs code": "vscode",
+            "editor": "code",
+            "ide": "code",
+            "command prompt": "terminal",
+            "cmd": "terminal" if self.system == "Linux" else "cmd",
+            "bash": "terminal",
+            "shell": "terminal",
+        }
+    
+    def resolve_app_name(self, app_name: str, partial: bool = False) -> Optional[str]:
+        """
+        Map a spoken application name to a key of the app map.
+        
+        Args:
+            app_name: Name as spoken (any language / alias)
+            partial: Also accept substring matches (as _open_application does)
+            
+        Returns:
+            App map key, or None if the name is unknown
+        """
+        normalized_name = (app_name or "").lower().strip()
+        if not normalized_name:
+            return None
+        normalized_name = self._get_app_aliases().get(normalized_name, normalized_name)
+        app_map = self._get_app_map()
+        if normalized_name in app_map:
+            return normalized_name
+        if partial:
+            for key in app_map:
+                if normalized_name in key or key in normalized_name:
+                    return key
+        return None
+    
     def get_available_intents(self) -> List[str]:
         """Return list of available action intents."""
         return [
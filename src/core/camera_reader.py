@@ -0,0 +1,187 @@
+"""
+Friday's Camera Reader
+Dedicated webcam thread with latest-frame semantics.
+The device is drained continuously (grab only, no decode) so the driver
+queue never holds stale frames; the newest frame is decoded and shrunk to
+the overlay size a few times per second, ready for the next response.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+class CameraReader:
+    """
+    Friday's background webcam reader.
+    Keeps only the newest frame, already converted to RGB and downscaled.
+    """
+
+    def __init__(self, device: int = 0, width: int = 640, height: int = 480, fps: int = 30,
+                 overlay_height: Optional[int] = None, preview_fps: Optional[float] = None):
+        """
+        Initialize CameraReader.
+
+        Args:
+            device: OpenCV device index
+            width: Requested capture width
+            height: Requested capture height
+            fps: Requested device frame rate
+            overlay_height: Height the frame is shrunk to (None = keep capture size)
+            preview_fps: How often the newest frame is decoded and resized (CAMERA_PREVIEW_FPS, default 5)
+        """
+        self.device = device
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.overlay_height = overlay_height
+        self.preview_fps = float(preview_fps or os.getenv('CAMERA_PREVIEW_FPS', '5') or 5)
+
+        self._cap = None
+        self._latest = None
+        self._latest_time = 0.0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Stats
+        self.frames_grabbed = 0
+        self.frames_prepared = 0
+        self.read_errors = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop_event.is_set()
+
+    @property
+    def is_stopping(self) -> bool:
+        """stop() was called but the reader has not exited yet (still blocked in grab())."""
+        return self._thread is not None and self._thread.is_alive() and self._stop_event.is_set()
+
+    def start(self) -> bool:
+        """
+        Open the device and start the reader thread. Returns False if no camera is
+        available or the previous reader is still stopping (it holds the device).
+        """
+        if self.is_stopping:
+            print("⚠️ Previous camera reader is still stopping; camera not restarted")
+            return False
+        if not CV2_AVAILABLE:
+            print("⚠️ OpenCV not installed. Camera disabled.")
+            return False
+        if self.is_running:
+            return True
+
+        self._cap = cv2.VideoCapture(self.device)
+        if not self._cap.isOpened():
+            self._cap.release()
+            self._cap = None
+            return False
+        self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self._cap.set(cv2.CAP_PROP_FPS, self.fps)
+        # Keep the driver queue as short as the backend allows
+        self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="camera-reader", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the reader thread; the thread releases the device on its way out."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                # Still blocked in grab(): releasing now would pull the device from under it
+                print("⚠️ Camera reader did not stop in time; it releases the device when grab() returns")
+                return
+            self._thread = None
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+    def get_latest(self, max_age: Optional[float] = None):
+        """
+        Get the newest prepared frame without touching the device.
+
+        Args:
+            max_age: Ignore the frame if it is older than this many seconds
+
+        Returns:
+            PIL RGB image at overlay size, or None
+        """
+        with self._lock:
+            image, stamp = self._latest, self._latest_time
+        if image is None:
+            return None
+        if max_age is not None and time.time() - stamp > max_age:
+            return None
+        return image
+
+    def get_stats(self) -> Dict:
+        """Get reader statistics."""
+        with self._lock:
+            age = (time.time() - self._latest_time) if self._latest is not None else None
+        return {
+            "running": self.is_running,
+            "frames_grabbed": self.frames_grabbed,
+            "frames_prepared": self.frames_prepared,
+            "read_errors": self.read_errors,
+            "latest_age": age,
+        }
+
+    def _run(self):
+        """Worker loop: grab every frame, prepare the newest one at preview_fps."""
+        prepare_interval = 1.0 / max(0.1, self.preview_fps)
+        next_prepare = 0.0
+        cap = self._cap
+
+        try:
+            while not self._stop_event.is_set():
+                # grab() blocks for the next frame, so this loop runs at the device rate
+                if not cap.grab():
+                    self.read_errors += 1
+                    self._stop_event.wait(0.5)
+                    continue
+                self.frames_grabbed += 1
+
+                now = time.time()
+                if now < next_prepare:
+                    continue
+                next_prepare = now + prepare_interval
+
+                ok, frame = cap.retrieve()
+                if not ok or frame is None:
+                    self.read_errors += 1
+                    continue
+                self._publish(self._prepare(frame), now)
+        finally:
+            # The worker owns the device while it runs, so it is released only once grab() is done
+            cap.release()
+            if self._cap is cap:
+                self._cap = None
+
+    def _prepare(self, frame):
+        """BGR device frame -> RGB PIL image at overlay height."""
+        from PIL import Image
+
+        if self.overlay_height and frame.shape[0] > self.overlay_height:
+            scale = self.overlay_height / frame.shape[0]
+            size = (max(1, int(frame.shape[1] * scale)), self.overlay_height)
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+    def _publish(self, image, timestamp: float):
+        with self._lock:
+            self._latest = image
+            self._latest_time = timestamp
+            self.frames_prepared += 1
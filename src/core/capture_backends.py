@@ -0,0 +1,276 @@
+"""
+Friday's Capture Backends
+Interchangeable screen sources behind one interface:
+- mss: direct X11 grabs (Xorg)
+- subprocess: screenshot tools piped over stdout (Wayland: grim, gnome-screenshot)
+- replay: frames from a directory at a fixed rate (headless benchmarks, CI)
+
+Selected with CAPTURE_BACKEND (auto|mss|subprocess|replay).
+"""
+
+import glob
+import io
+import os
+import shlex
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional
+
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+
+@dataclass
+class CapturedFrame:
+    """A single grabbed screen frame (raw pixels, BGRA as returned by mss)."""
+    sequence: int
+    timestamp: float
+    width: int
+    height: int
+    raw: Any
+    left: int = 0
+    top: int = 0
+    grab_ms: float = 0.0
+    channel_order: str = 'BGRA'
+    _image: Any = field(default=None, repr=False)
+
+    @property
+    def age(self) -> float:
+        """Seconds since this frame was grabbed."""
+        return time.time() - self.timestamp
+
+    def view(self):
+        """Zero-copy NumPy view of the raw buffer as (height, width, channels)."""
+        from src.core.frame_processing import frame_view
+        return frame_view(self.raw, self.width, self.height, len(self.channel_order))
+
+    def to_image(self):
+        """Build (once) a full-resolution PIL RGB image from the raw buffer."""
+        if self._image is None:
+            from PIL import Image
+            if self.channel_order == 'BGRA':
+                self._image = Image.frombytes('RGB', (self.width, self.height), bytes(self.raw), 'raw', 'BGRX')
+            else:
+                self._image = Image.frombytes(self.channel_order, (self.width, self.height), bytes(self.raw)).convert('RGB')
+        return self._image
+
+
+class CaptureBackend:
+    """
+    Base class for screen sources.
+    grab() returns one CapturedFrame; backends that are cheap enough to poll
+    continuously set streaming = True so the background service can use them.
+    """
+
+    name = "base"
+    streaming = True
+
+    def available(self) -> bool:
+        """Whether this backend can run on this machine."""
+        return True
+
+    def grab(self) -> CapturedFrame:
+        raise NotImplementedError
+
+    def close(self):
+        """Release resources held by the calling thread."""
+
+
+class MssBackend(CaptureBackend):
+    """Direct X11 grabs through mss (one session per thread)."""
+
+    name = "mss"
+
+    def __init__(self, monitor_index: int = 1):
+        self.monitor_index = monitor_index
+        self._local = threading.local()
+
+    def available(self) -> bool:
+        return MSS_AVAILABLE
+
+    def grab(self) -> CapturedFrame:
+        # mss keeps per-thread display handles, so each thread opens its own session
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+        monitor = sct.monitors[self.monitor_index]
+        started = time.time()
+        sct_img = sct.grab(monitor)
+        return self.frame_from_shot(sct_img, monitor, started, (time.time() - started) * 1000)
+
+    def close(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+    @staticmethod
+    def frame_from_shot(sct_img, monitor: Dict, timestamp: float, grab_ms: float) -> CapturedFrame:
+        """Wrap an mss ScreenShot without copying its pixels."""
+        return CapturedFrame(
+            sequence=0,
+            timestamp=timestamp,
+            width=sct_img.size[0],
+            height=sct_img.size[1],
+            raw=sct_img.raw,
+            left=monitor.get("left", 0),
+            top=monitor.get("top", 0),
+            grab_ms=grab_ms,
+        )
+
+
+# Screenshot tools that can write an image to stdout, in order of preference
+SCREENSHOT_COMMANDS = [
+    ["grim", "-t", "ppm", "-"],                  # wlroots compositors (Sway, Hyprland)
+    ["gnome-screenshot", "-f", "/dev/stdout"],   # GNOME
+    ["spectacle", "-b", "-n", "-o", "/dev/stdout"],  # KDE
+]
+
+
+class SubprocessBackend(CaptureBackend):
+    """Screenshot tool piped over stdout and decoded in memory (no temp files)."""
+
+    name = "subprocess"
+    streaming = False
+
+    def __init__(self, command: Optional[List[str]] = None, timeout: float = 3.0):
+        """
+        Args:
+            command: Tool and arguments writing an image to stdout (CAPTURE_COMMAND, default auto-detect)
+            timeout: Seconds before the tool is abandoned
+        """
+        env_command = os.getenv('CAPTURE_COMMAND')
+        self.command = command or (shlex.split(env_command) if env_command else self._detect_command())
+        self.timeout = timeout
+
+    @staticmethod
+    def _detect_command() -> Optional[List[str]]:
+        for command in SCREENSHOT_COMMANDS:
+            if shutil.which(command[0]):
+                return command
+        return None
+
+    def available(self) -> bool:
+        return bool(self.command)
+
+    def grab(self) -> CapturedFrame:
+        from PIL import Image
+
+        if not self.command:
+            raise RuntimeError("No screenshot tool found (install grim or gnome-screenshot, or set CAPTURE_COMMAND)")
+        started = time.time()
+        result = subprocess.run(self.command, capture_output=True, timeout=self.timeout, check=True)
+        if not result.stdout:
+            raise RuntimeError(f"{self.command[0]} wrote no image data")
+        img = Image.open(io.BytesIO(result.stdout)).convert('RGB')
+        return CapturedFrame(
+            sequence=0,
+            timestamp=started,
+            width=img.width,
+            height=img.height,
+            raw=img.tobytes(),
+            grab_ms=(time.time() - started) * 1000,
+            channel_order='RGB',
+        )
+
+
+class ReplayBackend(CaptureBackend):
+    """Frames from a directory at a fixed rate (loops at the end)."""
+
+    name = "replay"
+
+    def __init__(self, directory: Optional[str] = None, fps: Optional[float] = None,
+                 pattern: str = "*.jpg", realtime: bool = True, loop: bool = True):
+        """
+        Args:
+            directory: Folder of images (CAPTURE_REPLAY_DIR, default training_data/gold_dataset)
+            fps: Replay rate (CAPTURE_REPLAY_FPS, default 2)
+            pattern: Glob for frame files
+            realtime: Pick the frame by wall-clock time; False returns the next frame on every grab
+            loop: Start over after the last frame (otherwise EOFError)
+        """
+        default_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                   "training_data", "gold_dataset")
+        self.directory = directory or os.getenv('CAPTURE_REPLAY_DIR') or default_dir
+        self.fps = float(fps or os.getenv('CAPTURE_REPLAY_FPS', '2') or 2)
+        self.realtime = realtime
+        self.loop = loop
+        self.paths = sorted(glob.glob(os.path.join(self.directory, pattern)))
+
+        self._started: Optional[float] = None
+        self._next_index = 0
+        self._cached_index = -1
+        self._cached_frame: Optional[CapturedFrame] = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return bool(self.paths)
+
+    def grab(self) -> CapturedFrame:
+        if not self.paths:
+            raise RuntimeError(f"No replay frames in {self.directory}")
+
+        with self._lock:
+            now = time.time()
+            if self.realtime:
+                if self._started is None:
+                    self._started = now
+                index = int((now - self._started) * self.fps)
+            else:
+                index = self._next_index
+                self._next_index += 1
+
+            if index >= len(self.paths) and not self.loop:
+                raise EOFError("Replay finished")
+            index %= len(self.paths)
+
+            # Same slot as last time: hand back the decoded frame
+            if index == self._cached_index and self._cached_frame is not None:
+                return replace(self._cached_frame, timestamp=now, grab_ms=0.0)
+
+            frame = self._load(index, now)
+            self._cached_index, self._cached_frame = index, frame
+            return frame
+
+    def _load(self, index: int, timestamp: float) -> CapturedFrame:
+        from PIL import Image
+
+        started = time.time()
+        img = Image.open(self.paths[index]).convert('RGB')
+        return CapturedFrame(
+            sequence=0,
+            timestamp=timestamp,
+            width=img.width,
+            height=img.height,
+            raw=img.tobytes(),
+            grab_ms=(time.time() - started) * 1000,
+            channel_order='RGB',
+        )
+
+
+BACKENDS = {
+    "mss": MssBackend,
+    "subprocess": SubprocessBackend,
+    "replay": ReplayBackend,
+}
+
+
+def create_backend(name: Optional[str] = None) -> CaptureBackend:
+    """
+    Build the capture backend named by CAPTURE_BACKEND.
+
+    'auto' (default) picks the subprocess backend on Wayland and mss elsewhere.
+    """
+    name = (name or os.getenv('CAPTURE_BACKEND', 'auto') or 'auto').lower()
+    if name == 'auto':
+        name = 'subprocess' if os.environ.get('XDG_SESSION_TYPE') == 'wayland' else 'mss'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown capture backend '{name}' (choose from auto, {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
@@ -0,0 +1,244 @@
+"""
+Friday's Tile Change Detector
+Vectorized perceptual change detection on a grid of screen tiles.
+Each tile carries a 64-bit difference hash; dirty tiles are tracked against
+the last frame that was acted on, and constantly-changing tiles (game HUDs,
+video, clocks) are learned as volatile and ignored.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.core.frame_processing import gray_thumbnail
+
+
+# Hash geometry: a tile is sampled at 9x8 and hashed by comparing neighbours
+HASH_W = 9
+HASH_H = 8
+HASH_BITS = (HASH_W - 1) * HASH_H
+# Neighbour differences within this many grey levels hash as 0, so flat
+# UI tiles do not flip bits on compression/antialiasing noise
+HASH_MARGIN = 2
+
+# Popcount lookup for uint8 values
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+@dataclass
+class ChangeRegion:
+    """A connected group of dirty tiles (coordinates normalized to 0-1)."""
+    x: float
+    y: float
+    width: float
+    height: float
+    tiles: int
+    score: float
+
+    def to_pixels(self, frame_width: int, frame_height: int) -> Tuple[int, int, int, int]:
+        """Region as (left, top, width, height) in frame pixels."""
+        left = int(self.x * frame_width)
+        top = int(self.y * frame_height)
+        return left, top, max(1, int(self.width * frame_width)), max(1, int(self.height * frame_height))
+
+
+@dataclass
+class ChangeReport:
+    """Result of comparing one frame against the detector's reference."""
+    changed: bool
+    reason: str
+    changed_fraction: float = 0.0
+    max_score: float = 0.0
+    dirty_tiles: List[Tuple[int, int]] = field(default_factory=list)
+    regions: List[ChangeRegion] = field(default_factory=list)
+    volatile_tiles: int = 0
+    tile_hashes: Optional[np.ndarray] = field(default=None, repr=False)
+
+    def summary(self) -> str:
+        """One-line description for logs."""
+        return (f"{self.reason}: {len(self.dirty_tiles)} dirty tiles in {len(self.regions)} regions, "
+                f"fraction={self.changed_fraction:.2f}, max={self.max_score:.2f}, volatile={self.volatile_tiles}")
+
+
+class TileChangeDetector:
+    """
+    Friday's perceptual change detector.
+    Splits the screen into a grid, hashes every tile and reports which
+    regions changed and by how much.
+    """
+
+    def __init__(self, rows: Optional[int] = None, cols: Optional[int] = None,
+                 hash_threshold: Optional[int] = None, luma_threshold: Optional[float] = None,
+                 volatile_threshold: float = 0.6, volatile_alpha: float = 0.3,
+                 global_fraction: float = 0.5, warmup_frames: int = 4):
+        """
+        Initialize TileChangeDetector.
+
+        Args:
+            rows: Grid rows (CHANGE_GRID, default 8x8)
+            cols: Grid columns
+            hash_threshold: Hamming distance (of 64 bits) that marks a tile dirty (CHANGE_HASH_THRESHOLD)
+            luma_threshold: Mean luminance change (0-1) that marks a tile dirty (PROACTIVE_CHANGE_THRESHOLD)
+            volatile_threshold: Change frequency above which a tile is treated as volatile
+            volatile_alpha: Smoothing factor of the per-tile change frequency
+            global_fraction: Fraction of stable tiles that counts as a whole-screen change
+            warmup_frames: Frames observed before volatility is trusted
+        """
+        grid_env = (os.getenv('CHANGE_GRID', '8x8') or '8x8').lower().split('x')
+        self.rows = int(rows or grid_env[0])
+        self.cols = int(cols or grid_env[-1])
+        self.hash_threshold = int(hash_threshold or os.getenv('CHANGE_HASH_THRESHOLD', '10') or 10)
+        self.luma_threshold = float(luma_threshold or os.getenv('PROACTIVE_CHANGE_THRESHOLD', '0.12') or 0.12)
+        self.volatile_threshold = volatile_threshold
+        self.volatile_alpha = volatile_alpha
+        self.global_fraction = global_fraction
+        self.warmup_frames = warmup_frames
+
+        self.reset()
+
+    @property
+    def thumb_size(self) -> Tuple[int, int]:
+        """(width, height) of the grayscale thumbnail the detector hashes."""
+        return self.cols * HASH_W, self.rows * HASH_H
+
+    def reset(self):
+        """Forget the reference frame and learned volatility."""
+        self.frames_seen = 0
+        self._ref_hashes: Optional[np.ndarray] = None
+        self._ref_means: Optional[np.ndarray] = None
+        self._prev_hashes: Optional[np.ndarray] = None
+        self._prev_means: Optional[np.ndarray] = None
+        self.activity = np.zeros((self.rows, self.cols), dtype=np.float32)
+
+    def analyze_frame(self, view: np.ndarray, channel_order: str = 'BGRA') -> ChangeReport:
+        """Analyze a raw frame view (see CapturedFrame.view)."""
+        return self.analyze(gray_thumbnail(view, self.thumb_size, channel_order))
+
+    def analyze_image(self, img) -> ChangeReport:
+        """Analyze a PIL image."""
+        rgb = np.asarray(img.convert('RGB'))
+        return self.analyze(gray_thumbnail(rgb, self.thumb_size, 'RGB'))
+
+    def analyze(self, gray: np.ndarray) -> ChangeReport:
+        """
+        Compare a grayscale thumbnail (see thumb_size) with the reference.
+
+        Returns:
+            ChangeReport; when it reports a change the frame becomes the new reference
+        """
+        hashes, means = self._hash_tiles(gray)
+        self.frames_seen += 1
+
+        # Frame-to-frame churn feeds the volatility estimate
+        if self._prev_hashes is not None:
+            churn = self._dirty_mask(hashes, means, self._prev_hashes, self._prev_means)[0]
+            self.activity += self.volatile_alpha * (churn.astype(np.float32) - self.activity)
+        self._prev_hashes, self._prev_means = hashes, means
+
+        if self._ref_hashes is None:
+            self._ref_hashes, self._ref_means = hashes, means
+            return ChangeReport(changed=True, reason="first frame", changed_fraction=1.0,
+                                max_score=1.0, tile_hashes=hashes)
+
+        dirty, scores = self._dirty_mask(hashes, means, self._ref_hashes, self._ref_means)
+        volatile = self.activity > self.volatile_threshold
+        if self.frames_seen <= self.warmup_frames:
+            volatile[:] = False
+        stable_dirty = dirty & ~volatile
+
+        stable_count = max(1, int((~volatile).sum()))
+        fraction = float(stable_dirty.sum()) / stable_count
+        max_score = float(scores[stable_dirty].max()) if stable_dirty.any() else 0.0
+        regions = self._find_regions(stable_dirty, scores)
+
+        if not stable_dirty.any():
+            reason = "volatile only" if dirty.any() else "no change"
+            changed = False
+        elif fraction >= self.global_fraction:
+            reason = "screen change"
+            changed = True
+        else:
+            reason = "localized change"
+            changed = True
+
+        if changed:
+            self._ref_hashes, self._ref_means = hashes, means
+
+        return ChangeReport(
+            changed=changed,
+            reason=reason,
+            changed_fraction=fraction,
+            max_score=max_score,
+            dirty_tiles=[(int(r), int(c)) for r, c in zip(*np.nonzero(stable_dirty))],
+            regions=regions,
+            volatile_tiles=int(volatile.sum()),
+            tile_hashes=hashes,
+        )
+
+    def get_stats(self) -> Dict:
+        """Get detector statistics."""
+        return {
+            "grid": f"{self.rows}x{self.cols}",
+            "frames_seen": self.frames_seen,
+            "volatile_tiles": int((self.activity > self.volatile_threshold).sum()),
+            "hash_threshold": self.hash_threshold,
+            "luma_threshold": self.luma_threshold,
+        }
+
+    def _hash_tiles(self, gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-tile 64-bit difference hashes and mean luminance."""
+        width, height = self.thumb_size
+        if gray.shape != (height, width):
+            gray = np.asarray(Image.fromarray(gray).resize((width, height), Image.Resampling.BILINEAR))
+
+        tiles = gray.reshape(self.rows, HASH_H, self.cols, HASH_W).transpose(0, 2, 1, 3).astype(np.int16)
+        bits = (tiles[..., 1:] - tiles[..., :-1]) > HASH_MARGIN
+        packed = np.packbits(bits.reshape(self.rows, self.cols, HASH_BITS), axis=-1)
+        hashes = packed.view('>u8').reshape(self.rows, self.cols)
+        means = tiles.mean(axis=(2, 3), dtype=np.float32) / 255.0
+        return hashes, means
+
+    def _dirty_mask(self, hashes, means, ref_hashes, ref_means) -> Tuple[np.ndarray, np.ndarray]:
+        """Dirty tiles and their change scores (0-1) relative to a reference."""
+        xor = np.ascontiguousarray(np.bitwise_xor(hashes, ref_hashes))
+        distance = _POPCOUNT[xor.view(np.uint8)].reshape(self.rows, self.cols, 8).sum(axis=-1)
+        luma = np.abs(means - ref_means)
+
+        dirty = (distance >= self.hash_threshold) | (luma >= self.luma_threshold)
+        scores = np.maximum(distance / HASH_BITS, luma).clip(0, 1)
+        return dirty, scores
+
+    def _find_regions(self, mask: np.ndarray, scores: np.ndarray) -> List[ChangeRegion]:
+        """Group dirty tiles into 4-connected regions with bounding boxes."""
+        regions = []
+        seen = np.zeros_like(mask)
+        for r, c in zip(*np.nonzero(mask)):
+            if seen[r, c]:
+                continue
+            stack = [(r, c)]
+            seen[r, c] = True
+            cells = []
+            while stack:
+                y, x = stack.pop()
+                cells.append((y, x))
+                for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+                    if 0 <= ny < self.rows and 0 <= nx < self.cols and mask[ny, nx] and not seen[ny, nx]:
+                        seen[ny, nx] = True
+                        stack.append((ny, nx))
+
+            ys = [y for y, _ in cells]
+            xs = [x for _, x in cells]
+            regions.append(ChangeRegion(
+                x=float(min(xs)) / self.cols,
+                y=float(min(ys)) / self.rows,
+                width=float(max(xs) - min(xs) + 1) / self.cols,
+                height=float(max(ys) - min(ys) + 1) / self.rows,
+                tiles=len(cells),
+                score=float(np.mean([scores[y, x] for y, x in cells])),
+            ))
+
+        regions.sort(key=lambda region: region.score * region.tiles, reverse=True)
+        return regions
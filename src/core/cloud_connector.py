@@ -1,9 +1,23 @@
 import os
+import re
+import asyncio
 import requests
 import json
 import time
+from collections import deque
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 
+from requests.adapters import HTTPAdapter
+
+from src.core.tracing import get_tracer
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -12,26 +26,134 @@ try:
 except ImportError:
     print("⚠️  python-dotenv not installed. Using hardcoded defaults.")
 
+MARKER_PREFIXES = ("ACTION:", "WORKFLOW:")
+
+
+def parse_marker(body):
+    """
+    Parse the inside of one marker ("ACTION:intent|param=value" or
+    "WORKFLOW:template_id|context_var=value") into an action request.
+    """
+    kind, _, rest = body.partition(":")
+    match = re.match(r'(\w+)\|?(.*)', rest, re.S)
+    if kind not in ("ACTION", "WORKFLOW") or not match:
+        return None
+
+    params = {}
+    for param in match.group(2).split('|'):
+        if '=' in param:
+            key, value = param.split('=', 1)
+            params[key.strip()] = value.strip()
+
+    if kind == "WORKFLOW":
+        return {
+            "intent": "execute_workflow",
+            "params": {
+                "template_id": match.group(1),
+                "context": params
+            },
+            "raw": f"[{body}]"
+        }
+    return {
+        "intent": match.group(1),
+        "params": params,
+        "raw": f"[{body}]"
+    }
+
+
+class MarkerParser:
+    """
+    Incremental tokenizer for [ACTION:...] / [WORKFLOW:...] markers.
+    feed() takes streamed chunks and returns every marker completed by that
+    chunk, so actions can start while the rest of the reply is generated.
+    """
+
+    def __init__(self, max_marker_chars=300):
+        self.max_marker_chars = max_marker_chars
+        self._marker = None  # text after "[" while it can still be a marker
+        self.actions = []
+
+    def feed(self, chunk):
+        """Consume a chunk; returns the action requests it completed (in order)."""
+        found = []
+        for char in chunk:
+            if char == "[":
+                self._marker = ""
+            elif self._marker is None:
+                continue
+            elif char == "]":
+                action = parse_marker(self._marker)
+                self._marker = None
+                if action:
+                    found.append(action)
+            else:
+                self._marker += char
+                if len(self._marker) > self.max_marker_chars or not any(
+                        prefix.startswith(self._marker) or self._marker.startswith(prefix)
+                        for prefix in MARKER_PREFIXES):
+                    self._marker = None
+        self.actions.extend(found)
+        return found
+
+
 class CloudMindConnector:
     """Connects the local app to the Live Cloud Backend - Friday's Intelligence Core"""
     
     def __init__(self, api_key=None, provider="groq"):
-        # Priority: parameter > .env file > error
-        self.api_key = api_key or os.getenv('GROQ_API_KEY')
-        
-        if not self.api_key:
-            raise ValueError(
-                "❌ GROQ_API_KEY not found!\n"
-                "   Create a .env file with: GROQ_API_KEY=your_key_here\n"
-                "   Or get one from: https://console.groq.com/keys"
-            )
-        
-        self.endpoint = "https://api.groq.com/openai/v1/chat/completions"
-        self.model = os.getenv('GROQ_MODEL', 'meta-llama/llama-4-scout-17b-16e-instruct')
+        """
+        provider: "groq" (cloud, needs GROQ_API_KEY) or "ollama" (local server's
+        OpenAI-compatible endpoint at OLLAMA_BASE_URL, model OLLAMA_MODEL, no key).
+        """
+        self.provider = provider
+        if provider == "ollama":
+            self.provider_name = "Ollama"
+            self.api_key = api_key or "ollama"  # ignored by the local server
+            base_url = (os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434') or 'http://localhost:11434').rstrip('/')
+            self.endpoint = f"{base_url}/v1/chat/completions"
+            self.model = os.getenv('OLLAMA_MODEL', 'llava-phi3')
+            timeout_prefix, default_timeouts = 'OLLAMA', ('2', '30', '45')
+        else:
+            self.provider_name = "Groq"
+            # Priority: parameter > .env file > error
+            self.api_key = api_key or os.getenv('GROQ_API_KEY')
+
+            if not self.api_key:
+                raise ValueError(
+                    "❌ GROQ_API_KEY not found!\n"
+                    "   Create a .env file with: GROQ_API_KEY=your_key_here\n"
+                    "   Or get one from: https://console.groq.com/keys"
+                )
+
+            # GROQ_BASE_URL points the connector at any OpenAI-compatible server (e.g. benchmarks/mock_llm_server.py)
+            base_url = (os.getenv('GROQ_BASE_URL', 'https://api.groq.com/openai/v1') or 'https://api.groq.com/openai/v1').rstrip('/')
+            self.endpoint = f"{base_url}/chat/completions"
+            self.model = os.getenv('GROQ_MODEL', 'meta-llama/llama-4-scout-17b-16e-instruct')
+            timeout_prefix, default_timeouts = 'CLOUD', ('3', '10', '15')
         self.max_tokens = int(os.getenv('GROQ_MAX_TOKENS', '90') or 90)
         self.temperature = float(os.getenv('GROQ_TEMPERATURE', '0.5') or 0.5)
         self.tone_mode = (os.getenv('TONE_MODE', 'friday') or 'friday').lower()
         
+        # Round-trip latency vs. image payload of recent calls (feeds the payload controller)
+        self.request_history = deque(maxlen=50)
+
+        # Explicit timeouts: TCP/TLS connect, gap between response bytes, whole call
+        # (local inference on a CPU is slower than Groq, so Ollama gets its own OLLAMA_* values)
+        connect, read, total = default_timeouts
+        self.connect_timeout = float(os.getenv(f'{timeout_prefix}_CONNECT_TIMEOUT', connect) or connect)
+        self.read_timeout = float(os.getenv(f'{timeout_prefix}_READ_TIMEOUT', read) or read)
+        self.total_timeout = float(os.getenv(f'{timeout_prefix}_TOTAL_TIMEOUT', total) or total)
+        self.pool_size = int(os.getenv('CLOUD_POOL_SIZE', '4') or 4)
+
+        # Keep-alive connection pools (TLS handshake once, not per call)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._async_session = None
+        self._async_loop = None
+        # Set from Retry-After when the API answers 429 (time.time() based)
+        self.rate_limited_until = 0.0
+        
         # Friday's available action capabilities for intent detection
         self.action_capabilities = [
             "open_application", "close_application", "open_url", "search_web",
@@ -41,11 +163,143 @@ class CloudMindConnector:
             "type_text", "click_screen"
         ]
         
-    def think(self, visual_facts, user_speech, history=[], image_b64=None, active_window=None, available_actions=None, memory_context=None):
-        """Send data to Cloud Mind and get response (supports Vision) - Friday's Analysis Engine"""
+    def think(self, visual_facts, user_speech, history=[], image_b64=None, active_window=None, available_actions=None, memory_context=None, image_mime="image/jpeg"):
+        """Send data to Cloud Mind and get response (supports Vision) - Friday's Analysis Engine
+
+        Blocking call on the pooled requests session; async code should use think_async.
+        image_b64 may be a str or the ASCII bytes produced by FrameEncoder.
+        """
         if not self.api_key:
             return "Sir, the API Key appears to be missing. Please add it to the configuration.", "ERROR", None
 
+        headers, payload, payload_bytes = self._build_request(
+            visual_facts, user_speech, history, image_b64, active_window, available_actions, memory_context, image_mime
+        )
+
+        try:
+            start = time.time()
+            print(f"☁️  Sarthika analyzing via {self.provider_name} ({self.model})...")
+            response = self.session.post(self.endpoint, headers=headers, json=payload,
+                                         timeout=(self.connect_timeout, self.read_timeout))
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            return self._handle_response(response.status_code, body, response.text, start, payload_bytes,
+                                         headers=response.headers)
+        except requests.exceptions.Timeout:
+            return self._timeout_reply()
+        except requests.exceptions.ConnectionError as e:
+            return self._connection_error_reply(e)
+        except Exception as e:
+            return self._unexpected_error_reply(e)
+
+    async def think_async(self, visual_facts, user_speech, history=[], image_b64=None, active_window=None, available_actions=None, memory_context=None, image_mime="image/jpeg", on_delta=None):
+        """
+        Non-blocking think() on a shared keep-alive aiohttp session.
+        Falls back to the pooled sync session on a worker thread when aiohttp is not installed.
+
+        on_delta: optional callback receiving text chunks as the completion streams in (SSE);
+        the full reply is still returned at the end.
+        """
+        with get_tracer().span("llm_request", provider=self.provider_name, stream=on_delta is not None) as span:
+            if not AIOHTTP_AVAILABLE:
+                result = await asyncio.to_thread(
+                    self.think, visual_facts, user_speech, history, image_b64, active_window,
+                    available_actions, memory_context, image_mime
+                )
+                if on_delta is not None and result[1] == "success":
+                    on_delta(result[0])
+            elif not self.api_key:
+                result = "Sir, the API Key appears to be missing. Please add it to the configuration.", "ERROR", None
+            else:
+                headers, payload, payload_bytes = self._build_request(
+                    visual_facts, user_speech, history, image_b64, active_window, available_actions,
+                    memory_context, image_mime
+                )
+                if on_delta is not None:
+                    payload["stream"] = True
+                result = await self._post_async(headers, payload, payload_bytes, on_delta)
+            span.set(status=result[1])
+        return result
+
+    async def _post_async(self, headers, payload, payload_bytes, on_delta):
+        """POST on the shared aiohttp session (streamed when on_delta is given)."""
+        try:
+            start = time.time()
+            print(f"☁️  Sarthika analyzing via {self.provider_name} ({self.model})...")
+            session = self._get_async_session()
+            async with session.post(self.endpoint, headers=headers, json=payload) as response:
+                if on_delta is not None and response.status == 200:
+                    return await self._read_stream(response, on_delta, start, payload_bytes)
+                text = await response.text()
+                try:
+                    body = json.loads(text)
+                except ValueError:
+                    body = None
+                return self._handle_response(response.status, body, text, start, payload_bytes,
+                                             headers=response.headers)
+        except asyncio.TimeoutError:
+            return self._timeout_reply()
+        except aiohttp.ClientConnectionError as e:
+            return self._connection_error_reply(e)
+        except Exception as e:
+            return self._unexpected_error_reply(e)
+
+    async def _read_stream(self, response, on_delta, start, payload_bytes):
+        """Read an SSE chat completion, passing each text delta to on_delta."""
+        parts = []
+        first_token = None
+        async for raw_line in response.content:
+            line = raw_line.decode('utf-8', 'replace').strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            try:
+                delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+            except (ValueError, KeyError, IndexError):
+                continue
+            if delta:
+                if first_token is None:
+                    first_token = time.time() - start
+                    get_tracer().observe("llm_first_token", first_token)
+                    print(f"   ⚡ First token in {first_token:.2f}s")
+                parts.append(delta)
+                on_delta(delta)
+
+        body = {"choices": [{"message": {"content": "".join(parts)}}]}
+        return self._handle_response(200, body, None, start, payload_bytes, first_token)
+
+    def _get_async_session(self):
+        """Shared aiohttp session for the running event loop (created on first use)."""
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session.closed or self._async_loop is not loop:
+            timeout = aiohttp.ClientTimeout(
+                total=self.total_timeout,
+                connect=self.connect_timeout,
+                sock_read=self.read_timeout
+            )
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60, ttl_dns_cache=300)
+            self._async_session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+            self._async_loop = loop
+        return self._async_session
+
+    async def aclose(self):
+        """Close the async and sync connection pools."""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+        self.session.close()
+
+    def close(self):
+        """Close the sync connection pool (use aclose() from async code)."""
+        self.session.close()
+
+    def _build_request(self, visual_facts, user_speech, history, image_b64, active_window,
+                       available_actions, memory_context, image_mime):
+        """Build headers and chat payload; returns (headers, payload, image payload bytes)."""
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
@@ -55,6 +309,7 @@ class CloudMindConnector:
         system_prompt = self._get_sarthika_system_prompt(available_actions)
 
         user_content = []
+        payload_bytes = 0
 
         context_lines = []
         if user_speech:
@@ -77,9 +332,12 @@ class CloudMindConnector:
         user_content.append({"type": "text", "text": "\n".join(context_lines)})
 
         if image_b64:
+            if isinstance(image_b64, (bytes, bytearray)):
+                image_b64 = image_b64.decode('ascii')
+            payload_bytes = len(image_b64)
             user_content.append({
                 "type": "image_url",
-                "image_url": {"url": f"data:image/jpeg;base64,{image_b64}"}
+                "image_url": {"url": f"data:{image_mime};base64,{image_b64}"}
             })
         else:
             user_content.append({"type": "text", "text": f"SCENE: {visual_facts or 'Offline interaction'}"})
@@ -94,42 +352,68 @@ class CloudMindConnector:
             "temperature": self.temperature,
             "max_tokens": self.max_tokens
         }
+        return headers, payload, payload_bytes
 
-        try:
-            start = time.time()
-            print(f"☁️  Sarthika analyzing via Groq ({self.model})...")
-            response = requests.post(self.endpoint, headers=headers, json=payload, timeout=15)
+    def _handle_response(self, status_code, body, raw_text, start, payload_bytes, first_token=None, headers=None):
+        """Turn an HTTP response into (reply, status, action_request)."""
+        if status_code == 200 and body is not None:
+            result = body['choices'][0]['message']['content'].strip()
+            latency = time.time() - start
+            print(f"✅ Sarthika's analysis complete in {latency:.2f}s")
+            self.request_history.append({
+                "timestamp": start,
+                "latency": latency,
+                "first_token": first_token if first_token is not None else latency,
+                "payload_bytes": payload_bytes
+            })
             
-            if response.status_code == 200:
-                result = response.json()['choices'][0]['message']['content'].strip()
-                latency = time.time() - start
-                print(f"✅ Sarthika's analysis complete in {latency:.2f}s")
-                
-                # Parse any action commands from the response
-                action_request = self._extract_action(result)
-                
-                return result, "success", action_request
-            else:
-                error_msg = f"HTTP {response.status_code}"
-                try:
-                    error_detail = response.json()
-                    print(f"❌ Groq Error: {error_msg}")
-                    print(f"   Details: {error_detail}")
-                except:
-                    print(f"❌ Groq Error: {error_msg}")
-                    print(f"   Raw Response: {response.text[:200]}")
-                return f"Sir, I'm experiencing a cloud connection error {response.status_code}", "ERROR", None
-        except requests.exceptions.Timeout:
-            print(f"❌ Request Timeout: Groq API not responding (>15s)")
-            return "Sir, the cloud connection has timed out. Please check the internet connection.", "ERROR", None
-        except requests.exceptions.ConnectionError as e:
-            print(f"❌ Connection Error: {str(e)[:100]}")
-            return "Sir, I cannot reach the Groq servers. Please verify your internet connection.", "ERROR", None
-        except Exception as e:
-            print(f"❌ Unexpected Error: {type(e).__name__}: {str(e)[:100]}")
-            import traceback
-            traceback.print_exc()
-            return f"Sir, I've encountered an error: {str(e)}", "ERROR", None
+            # Parse any action commands from the response
+            action_request = self._extract_action(result)
+            
+            return result, "success", action_request
+
+        if status_code == 429:
+            retry_after = self._retry_after(headers)
+            self.rate_limited_until = time.time() + retry_after
+            print(f"⏳ {self.provider_name} rate limit hit, retry after {retry_after:g}s")
+            return "Sir, I'm being rate limited by the cloud. Give me a moment.", "RATE_LIMITED", None
+
+        print(f"❌ {self.provider_name} Error: HTTP {status_code}")
+        if body is not None:
+            print(f"   Details: {body}")
+        else:
+            print(f"   Raw Response: {(raw_text or '')[:200]}")
+        return f"Sir, I'm experiencing a cloud connection error {status_code}", "ERROR", None
+
+    @staticmethod
+    def _retry_after(headers, default=10.0):
+        """Seconds from a Retry-After header (delta-seconds or HTTP date)."""
+        value = (headers or {}).get("Retry-After") or (headers or {}).get("retry-after")
+        if not value:
+            return default
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return default
+
+    def _timeout_reply(self):
+        print(f"❌ Request Timeout: {self.provider_name} API not responding "
+              f"(connect {self.connect_timeout:g}s / read {self.read_timeout:g}s / total {self.total_timeout:g}s)")
+        return "Sir, the cloud connection has timed out. Please check the internet connection.", "ERROR", None
+
+    def _connection_error_reply(self, e):
+        print(f"❌ Connection Error: {str(e)[:100]}")
+        return f"Sir, I cannot reach the {self.provider_name} servers. Please verify your internet connection.", "ERROR", None
+
+    def _unexpected_error_reply(self, e):
+        print(f"❌ Unexpected Error: {type(e).__name__}: {str(e)[:100]}")
+        import traceback
+        traceback.print_exc()
+        return f"Sir, I've encountered an error: {str(e)}", "ERROR", None
     
     def _get_sarthika_system_prompt(self, available_actions=None):
         """Generate Sarthika's system prompt - professional, efficient, slightly witty."""
@@ -199,54 +483,13 @@ class CloudMindConnector:
         )
     
     def _extract_action(self, response: str):
-        """Extract action or workflow command from response if present."""
-        import re
-        
-        # First check for WORKFLOW pattern: [WORKFLOW:template_id|context_var=value]
-        workflow_pattern = r'\[WORKFLOW:(\w+)\|?([^\]]*)\]'
-        workflow_match = re.search(workflow_pattern, response)
-        
-        if workflow_match:
-            template_id = workflow_match.group(1)
-            params_str = workflow_match.group(2) or ""
-            
-            # Parse context parameters
-            context = {}
-            if params_str:
-                for param in params_str.split('|'):
-                    if '=' in param:
-                        key, value = param.split('=', 1)
-                        context[key.strip()] = value.strip()
-            
-            return {
-                "intent": "execute_workflow",
-                "params": {
-                    "template_id": template_id,
-                    "context": context
-                },
-                "raw": workflow_match.group(0)
-            }
-        
-        # Check for ACTION pattern: [ACTION:intent|param=value]
-        action_pattern = r'\[ACTION:(\w+)\|?([^\]]*)\]'
-        action_match = re.search(action_pattern, response)
-        
-        if action_match:
-            intent = action_match.group(1)
-            params_str = action_match.group(2) or ""
-            
-            # Parse parameters
-            params = {}
-            if params_str:
-                for param in params_str.split('|'):
-                    if '=' in param:
-                        key, value = param.split('=', 1)
-                        params[key.strip()] = value.strip()
-            
-            return {
-                "intent": intent,
-                "params": params,
-                "raw": action_match.group(0)
-            }
-        
-        return None
+        """Extract action or workflow command from response if present (workflows take precedence)."""
+        actions = self._extract_actions(response)
+        workflows = [action for action in actions if action["intent"] == "execute_workflow"]
+        if workflows:
+            return workflows[0]
+        return actions[0] if actions else None
+
+    def _extract_actions(self, response: str):
+        """Extract every action and workflow command, in the order they appear."""
+        return MarkerParser().feed(response)
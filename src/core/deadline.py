@@ -0,0 +1,106 @@
+"""
+Friday's Turn Deadlines
+One time budget per turn, shared by every stage from capture to the first
+word spoken:
+- stages run under the deadline (run()) or check it between steps (check())
+- when the budget runs out the turn is abandoned with DeadlineExceeded,
+  naming the stage that ran over, instead of speaking a stale answer
+- once the answer has started reaching the user, meet() lifts the deadline
+  for the rest of the turn
+"""
+
+import asyncio
+import os
+import time
+from typing import Awaitable, Optional
+
+
+class DeadlineExceeded(Exception):
+    """The turn ran out of time in `stage`; its answer would be stale."""
+
+    def __init__(self, stage: str, overrun: float = 0.0):
+        super().__init__(f"turn deadline exceeded in {stage} (+{overrun * 1000:.0f}ms)")
+        self.stage = stage
+        self.overrun = overrun
+
+
+class Deadline:
+    """
+    A turn's time budget (monotonic clock). Budget None or <= 0 means no limit.
+    """
+
+    def __init__(self, budget: Optional[float]):
+        self.budget = budget if budget and budget > 0 else None
+        self.started = time.monotonic()
+        self.expires = self.started + self.budget if self.budget else float('inf')
+        self.met = False
+        self.missed: Optional[str] = None   # stage that ran over
+
+    @classmethod
+    def for_turn(cls, user_speech: Optional[str] = None) -> "Deadline":
+        """
+        Budget for a user turn (TURN_DEADLINE_USER, default 10s) or a proactive
+        observation (TURN_DEADLINE_PROACTIVE, default 6s: the screen moves on).
+        """
+        if user_speech:
+            return cls(float(os.getenv('TURN_DEADLINE_USER', '10') or 0))
+        return cls(float(os.getenv('TURN_DEADLINE_PROACTIVE', '6') or 0))
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        """Seconds left (inf without a budget, negative once overrun)."""
+        return self.expires - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def meet(self):
+        """The answer is reaching the user: nothing after this point is stale."""
+        self.met = True
+        self.expires = float('inf')
+
+    def check(self, stage: str):
+        """Raise DeadlineExceeded if the budget is spent (call before starting `stage`)."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            self.missed = self.missed or stage
+            raise DeadlineExceeded(stage, -remaining)
+
+    def timeout(self, cap: Optional[float] = None) -> Optional[float]:
+        """A timeout for a blocking call: the time left, at most `cap` (None = wait forever)."""
+        remaining = self.remaining()
+        if remaining == float('inf'):
+            return cap
+        remaining = max(0.0, remaining)
+        return remaining if cap is None else min(cap, remaining)
+
+    async def run(self, stage: str, awaitable: Awaitable, cap: Optional[float] = None):
+        """
+        Await `awaitable` as stage `stage`; it is cancelled when the deadline
+        passes (DeadlineExceeded) or after `cap` seconds (asyncio.TimeoutError).
+        meet() while waiting lifts the limit.
+        """
+        try:
+            self.check(stage)
+        except DeadlineExceeded:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise
+        task = asyncio.ensure_future(awaitable)
+        capped = time.monotonic() + cap if cap is not None else float('inf')
+        try:
+            while True:
+                wait = min(self.remaining(), capped - time.monotonic())
+                done, _ = await asyncio.wait({task}, timeout=None if wait == float('inf') else max(0.0, wait))
+                if done:
+                    return task.result()
+                self.check(stage)
+                if time.monotonic() >= capped:
+                    raise asyncio.TimeoutError(f"{stage} took longer than {cap:g}s")
+        finally:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,185 @@
+"""
+Friday's Frame Encoder
+JPEG/base64 encoding on a worker pool so the event loop (voice queue, TTS)
+keeps running while a frame is compressed. Each worker thread reuses its own
+output buffer, and every encode reports its time and payload size.
+"""
+
+import asyncio
+import base64
+import io
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+
+MIME_TYPES = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "WEBP": "image/webp",
+}
+
+_local = threading.local()
+
+
+@dataclass
+class EncodedFrame:
+    """A compressed frame ready for the vision request body."""
+    b64: bytes
+    mime: str
+    format: str
+    width: int
+    height: int
+    quality: int
+    compressed_bytes: int
+    encode_ms: float
+
+    @property
+    def payload_bytes(self) -> int:
+        """Size of the base64 payload that goes over the wire."""
+        return len(self.b64)
+
+    @property
+    def data_url(self) -> str:
+        """data: URL for OpenAI-style image_url content."""
+        return f"data:{self.mime};base64,{self.b64.decode('ascii')}"
+
+
+def _output_buffer() -> io.BytesIO:
+    """Per-thread reusable output buffer."""
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None:
+        buffer = io.BytesIO()
+        _local.buffer = buffer
+    buffer.seek(0)
+    return buffer
+
+
+def encode_image(img, fmt: str = "JPEG", quality: int = 70, optimize: bool = True) -> EncodedFrame:
+    """
+    Compress a PIL image and base64 it (runs in the calling thread).
+
+    Args:
+        img: PIL image
+        fmt: JPEG, PNG or WEBP
+        quality: Encoder quality (JPEG/WEBP)
+        optimize: Extra entropy-coding pass (smaller, slightly slower)
+
+    Returns:
+        EncodedFrame
+    """
+    started = time.perf_counter()
+    fmt = fmt.upper()
+    if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    buffer = _output_buffer()
+    save_kwargs = {"optimize": optimize}
+    if fmt in ("JPEG", "WEBP"):
+        save_kwargs["quality"] = int(quality)
+    img.save(buffer, format=fmt, **save_kwargs)
+
+    # Only the bytes written this time are valid; the buffer keeps its capacity
+    size = buffer.tell()
+    with buffer.getbuffer() as view:
+        b64 = base64.b64encode(view[:size])
+
+    return EncodedFrame(
+        b64=b64,
+        mime=MIME_TYPES.get(fmt, "image/jpeg"),
+        format=fmt,
+        width=img.width,
+        height=img.height,
+        quality=int(quality),
+        compressed_bytes=size,
+        encode_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+class FrameEncoder:
+    """
+    Friday's pooled frame encoder.
+    Encodes frames on a small thread pool (Pillow releases the GIL while
+    compressing) and keeps per-quality encode statistics.
+    """
+
+    def __init__(self, quality: Optional[int] = None, optimize: Optional[bool] = None,
+                 max_workers: Optional[int] = None, history_size: int = 200):
+        """
+        Initialize FrameEncoder.
+
+        Args:
+            quality: Default JPEG quality (CAPTURE_QUALITY, default 70)
+            optimize: Optimized Huffman tables (CAPTURE_JPEG_OPTIMIZE, default on)
+            max_workers: Encoder threads (ENCODER_WORKERS, default 2)
+            history_size: Number of recent encodes kept for statistics
+        """
+        self.quality = int(quality or os.getenv('CAPTURE_QUALITY', '70') or 70)
+        if optimize is None:
+            optimize = str(os.getenv('CAPTURE_JPEG_OPTIMIZE', '1')).lower() in ('1', 'true', 'yes', 'on')
+        self.optimize = optimize
+        self.max_workers = int(max_workers or os.getenv('ENCODER_WORKERS', '2') or 2)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="frame-encoder")
+        self.history: Deque[Dict] = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    def encode(self, img, fmt: str = "JPEG", quality: Optional[int] = None) -> EncodedFrame:
+        """Encode in the calling thread and record statistics."""
+        encoded = encode_image(img, fmt, quality or self.quality, self.optimize)
+        self._record(encoded)
+        return encoded
+
+    async def encode_async(self, img, fmt: str = "JPEG", quality: Optional[int] = None) -> EncodedFrame:
+        """Encode on the worker pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.encode, img, fmt, quality)
+
+    async def submit(self, fn, *args):
+        """Run an encoding routine (e.g. the payload controller) on the worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def get_stats(self) -> Dict:
+        """Average encode time and payload size, grouped by format and quality."""
+        with self._lock:
+            history = list(self.history)
+
+        groups: Dict[str, Dict] = {}
+        for entry in history:
+            key = f"{entry['format']}@q{entry['quality']}"
+            group = groups.setdefault(key, {"frames": 0, "encode_ms": 0.0, "payload_bytes": 0})
+            group["frames"] += 1
+            group["encode_ms"] += entry["encode_ms"]
+            group["payload_bytes"] += entry["payload_bytes"]
+
+        for group in groups.values():
+            group["avg_encode_ms"] = round(group.pop("encode_ms") / group["frames"], 2)
+            group["avg_payload_bytes"] = int(group.pop("payload_bytes") / group["frames"])
+
+        return {
+            "frames_encoded": len(history),
+            "workers": self.max_workers,
+            "by_setting": groups,
+            "last": history[-1] if history else None,
+        }
+
+    def shutdown(self):
+        """Stop the worker pool."""
+        self._executor.shutdown(wait=False)
+
+    def _record(self, encoded: EncodedFrame):
+        with self._lock:
+            self.history.append({
+                "timestamp": time.time(),
+                "format": encoded.format,
+                "quality": encoded.quality,
+                "size": f"{encoded.width}x{encoded.height}",
+                "encode_ms": encoded.encode_ms,
+                "compressed_bytes": encoded.compressed_bytes,
+                "payload_bytes": encoded.payload_bytes,
+            })
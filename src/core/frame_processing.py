@@ -0,0 +1,178 @@
+"""
+Friday's Frame Processing
+Zero-copy helpers that work directly on raw capture buffers.
+Downsampling and change thumbnails are computed on a NumPy view of the
+mss buffer, so a full-resolution image is never built.
+"""
+
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+
+# Largest block (per axis) that is averaged for one output pixel;
+# bigger reduction factors are covered by strided sampling inside the block.
+MAX_AREA_BLOCK = 3
+
+# ITU-R BT.601 luma weights for (R, G, B)
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def frame_view(raw, width: int, height: int, channels: int = 4) -> np.ndarray:
+    """Wrap a raw pixel buffer in an (height, width, channels) array without copying."""
+    return np.frombuffer(raw, dtype=np.uint8, count=width * height * channels).reshape(height, width, channels)
+
+
+def rgb_channels(channel_order: str) -> Tuple[int, int, int]:
+    """Indices of the R, G and B channels for a buffer layout ('BGRA', 'RGB', ...)."""
+    order = channel_order.upper()
+    return order.index('R'), order.index('G'), order.index('B')
+
+
+def fit_size(width: int, height: int, max_w: int, max_h: int) -> Tuple[int, int]:
+    """Size that fits inside max_w x max_h keeping aspect ratio (never upscales)."""
+    scale = min(max(1, max_w) / width, max(1, max_h) / height, 1.0)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def block_average(view: np.ndarray, factor_y: int, factor_x: int,
+                  max_block: int = MAX_AREA_BLOCK) -> np.ndarray:
+    """
+    Area-average a view by integer factors using strided sampling.
+
+    Each output pixel averages up to max_block x max_block samples spread
+    evenly across its factor_y x factor_x source block. Only the small
+    output (plus a same-sized accumulator) is allocated.
+
+    Args:
+        view: (H, W, C) uint8 array, may be a non-contiguous view
+        factor_y: Vertical reduction factor
+        factor_x: Horizontal reduction factor
+        max_block: Samples per axis inside each block
+
+    Returns:
+        (H // factor_y, W // factor_x, C) uint8 array
+    """
+    factor_y = max(1, int(factor_y))
+    factor_x = max(1, int(factor_x))
+    if factor_y == 1 and factor_x == 1:
+        return np.ascontiguousarray(view)
+
+    out_h = view.shape[0] // factor_y
+    out_w = view.shape[1] // factor_x
+    block_y = min(factor_y, max_block)
+    block_x = min(factor_x, max_block)
+    offsets_y = [int((k + 0.5) * factor_y / block_y) for k in range(block_y)]
+    offsets_x = [int((k + 0.5) * factor_x / block_x) for k in range(block_x)]
+
+    acc = np.zeros((out_h, out_w) + view.shape[2:], dtype=np.uint32)
+    for oy in offsets_y:
+        rows = view[oy:oy + out_h * factor_y:factor_y]
+        for ox in offsets_x:
+            acc += rows[:, ox:ox + out_w * factor_x:factor_x]
+
+    acc //= (block_y * block_x)
+    return acc.astype(np.uint8)
+
+
+def downscale_to_rgb(view: np.ndarray, max_w: int, max_h: int, channel_order: str = 'BGRA') -> Image.Image:
+    """
+    Downscale a raw frame view to fit max_w x max_h and return a small RGB image.
+
+    Args:
+        view: (H, W, C) uint8 frame view
+        max_w: Target maximum width
+        max_h: Target maximum height
+        channel_order: Channel layout of the view
+
+    Returns:
+        PIL RGB image at the target size
+    """
+    height, width = view.shape[:2]
+    out_w, out_h = fit_size(width, height, max_w, max_h)
+    factor = max(1, min(width // out_w, height // out_h))
+
+    small = block_average(view, factor, factor)
+    r, g, b = rgb_channels(channel_order)
+    rgb = np.ascontiguousarray(small[..., [r, g, b]])
+
+    img = Image.fromarray(rgb, 'RGB')
+    if img.size != (out_w, out_h):
+        img = img.resize((out_w, out_h), Image.Resampling.BILINEAR)
+    return img
+
+
+def gray_thumbnail(view: np.ndarray, size: Union[int, Tuple[int, int]],
+                   channel_order: str = 'BGRA') -> np.ndarray:
+    """
+    Grayscale thumbnail for change detection, computed from a frame view.
+
+    Args:
+        view: (H, W, C) uint8 frame view
+        size: Edge length of a square thumbnail, or (width, height)
+        channel_order: Channel layout of the view
+
+    Returns:
+        (height, width) uint8 array
+    """
+    height, width = view.shape[:2]
+    thumb_w, thumb_h = (size, size) if isinstance(size, int) else size
+    thumb_w = max(1, min(int(thumb_w), width))
+    thumb_h = max(1, min(int(thumb_h), height))
+    small = block_average(view, height // thumb_h, width // thumb_w)
+
+    # Block averaging may leave a few spare rows/cols; pick exactly the requested grid
+    rows = np.linspace(0, small.shape[0] - 1, thumb_h).astype(np.intp)
+    cols = np.linspace(0, small.shape[1] - 1, thumb_w).astype(np.intp)
+    small = small[rows][:, cols]
+
+    r, g, b = rgb_channels(channel_order)
+    rgb = small[..., [r, g, b]].astype(np.float32)
+    return (rgb @ LUMA_WEIGHTS).clip(0, 255).astype(np.uint8)
+
+
+def clamp_box(left: int, top: int, width: int, height: int,
+              frame_w: int, frame_h: int) -> Optional[Tuple[int, int, int, int]]:
+    """Intersect a (left, top, width, height) box with the frame; None if nothing is left."""
+    x0, y0 = max(0, int(left)), max(0, int(top))
+    x1, y1 = min(frame_w, int(left) + int(width)), min(frame_h, int(top) + int(height))
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def box_around(cx: int, cy: int, width: int, height: int,
+               frame_w: int, frame_h: int) -> Tuple[int, int, int, int]:
+    """A width x height box centred on (cx, cy), shifted to stay inside the frame."""
+    width, height = min(width, frame_w), min(height, frame_h)
+    left = min(max(0, int(cx) - width // 2), frame_w - width)
+    top = min(max(0, int(cy) - height // 2), frame_h - height)
+    return left, top, width, height
+
+
+def add_overview_tile(main: Image.Image, overview: Image.Image,
+                      marker: Optional[Tuple[float, float, float, float]] = None) -> Image.Image:
+    """
+    Place a small full-screen overview to the right of a region crop.
+
+    Args:
+        main: Region-of-interest image
+        overview: Small full-screen image
+        marker: Region outline on the overview as normalized (x, y, width, height)
+
+    Returns:
+        New RGB image, main on the left and the overview at the top right
+    """
+    overview = overview.copy()
+    if marker:
+        x, y, w, h = marker
+        draw = ImageDraw.Draw(overview)
+        draw.rectangle([int(x * overview.width), int(y * overview.height),
+                        int((x + w) * overview.width) - 1, int((y + h) * overview.height) - 1],
+                       outline=(255, 64, 64))
+
+    canvas = Image.new('RGB', (main.width + overview.width, max(main.height, overview.height)), (0, 0, 0))
+    canvas.paste(main, (0, 0))
+    canvas.paste(overview, (main.width, 0))
+    return canvas
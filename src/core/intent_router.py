@@ -0,0 +1,314 @@
+"""
+Friday's Local Intent Router
+Resolves direct commands ("open calculator", "volume up", "gaana roko",
+"कैलकुलेटर ओपन करो") to ActionExecutor intents in a few milliseconds, so
+they do not need a vision round-trip to the cloud. Anything it is not sure
+about (questions, compound requests, unknown words) goes to the cloud as before.
+A bare "stop" ("stop talking", "bas", "chup") means Friday should stop speaking.
+
+Every decision can be appended to a JSONL log for precision/recall review
+(see benchmarks/intent_router_eval.py).
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Spoken tokens (English, Hinglish, Hindi and Devanagari transliterations of
+# English as produced by hi-IN speech recognition) -> canonical command words
+VOCABULARY = {
+    "open": ["open", "launch", "start", "kholo", "khol", "kholiye", "खोलो", "खोल", "खोलिए", "ओपन", "ओपेन",
+             "लॉन्च", "स्टार्ट"],
+    "close": ["close", "quit", "exit", "kill", "band", "bandh", "बंद", "क्लोज", "क्लोज़"],
+    "play": ["play", "resume", "chalao", "chala", "bajao", "चलाओ", "चला", "बजाओ", "प्ले", "रिज्यूम"],
+    "pause": ["pause", "roko", "ruko", "hold", "रोको", "रुको", "पॉज", "पॉज़", "पोज"],
+    "stop": ["stop", "स्टॉप"],
+    "hush": ["talking", "speaking", "shut", "quiet", "chup", "chupp", "bas", "चुप", "बस"],
+    "next": ["next", "skip", "agla", "agle", "अगला", "अगले", "नेक्स्ट", "स्किप"],
+    "previous": ["previous", "prev", "pichla", "pichhla", "पिछला", "पिछले", "प्रीवियस"],
+    "media": ["music", "song", "songs", "track", "gaana", "gana", "gaane", "गाना", "गाने", "सॉन्ग", "म्यूजिक",
+              "म्यूज़िक", "संगीत", "playback"],
+    "volume": ["volume", "sound", "awaaz", "aawaz", "awaz", "आवाज", "आवाज़", "वॉल्यूम", "वोल्यूम", "साउंड"],
+    "up": ["up", "increase", "louder", "raise", "badhao", "badha", "tez", "zyada", "बढ़ाओ", "बढ़ा", "बढ़ाइए",
+           "तेज", "तेज़", "ज्यादा", "अप"],
+    "down": ["down", "decrease", "lower", "quieter", "reduce", "kam", "ghatao", "dheere", "कम", "घटाओ", "धीरे",
+             "डाउन"],
+    "mute": ["mute", "silent", "म्यूट"],
+    "unmute": ["unmute", "अनम्यूट"],
+    "screenshot": ["screenshot", "snapshot", "स्क्रीनशॉट"],
+    "lock": ["lock", "लॉक"],
+    "screen": ["screen", "स्क्रीन", "computer", "laptop", "system"],
+    "search": ["search", "google", "dhoondo", "dhundo", "khojo", "सर्च", "गूगल", "ढूंढो", "खोजो"],
+    "and": ["and", "aur", "then", "phir", "also", "और", "फिर", "तथा"],
+    "question": ["how", "why", "what", "when", "where", "which", "kaise", "kyun", "kyon", "kab", "kahan",
+                 "कैसे", "क्यों", "कब", "कहाँ", "कहां", "कौन"],
+    "negation": ["don't", "dont", "not", "never", "mat", "nahi", "nahin", "मत", "नहीं", "ना"],
+}
+
+# Words that carry no meaning for the command itself
+FILLERS = {
+    "please", "pls", "plz", "can", "could", "would", "will", "you", "the", "a", "an", "my", "me", "for", "to",
+    "now", "right", "away", "hey", "ok", "okay", "friday", "sarthika", "saarthika", "sarthiika", "sir", "boss",
+    "just", "quickly", "take", "capture", "turn", "on", "off", "of", "it", "this", "that", "app", "application",
+    "karo", "kar", "kardo", "karna", "do", "de", "dena", "dijiye", "zara", "jaldi", "ko", "is", "isko", "yeh",
+    "ye", "woh", "wo", "pe", "par", "mein", "ke", "ki", "ka", "baare", "kya", "lo", "le", "hai",
+    "करो", "कर", "करें", "कीजिए", "दो", "दीजिए", "ज़रा", "जरा", "जल्दी", "को", "इस", "इसको", "यह", "ये", "वो",
+    "पर", "पे", "में", "के", "की", "का", "बारे", "क्या", "लो", "ले", "है", "प्लीज", "सर", "बॉस", "एप", "ऐप",
+}
+
+# "this song": a specific track (often the one on screen), not "resume playback"
+DEMONSTRATIVES = {"this", "that", "is", "isko", "yeh", "ye", "woh", "wo", "इस", "इसको", "यह", "ये", "वो"}
+
+PUNCTUATION = re.compile(r'[.,!?।;:"()\[\]{}]')
+
+MEDIA_COMMANDS = ("pause", "stop", "next", "previous", "play")
+
+# Handled by the partner itself (not ActionExecutor): a bare "stop" / "stop talking" / "chup"
+# while Friday speaks means stop speaking (barge-in), not stop the music
+STOP_SPEAKING = "stop_speaking"
+
+REPLIES = {
+    "open_application": "Opening {app}, Sir.",
+    "close_application": "Closing {app}, Sir.",
+    "search_web": "Searching for {query}, Sir.",
+    "screenshot": "Screenshot taken, Sir.",
+    "lock_screen": "Locking the screen, Sir.",
+    "mute_system": "Muted, Sir.",
+    STOP_SPEAKING: "",
+    "volume_control": {"up": "Volume up, Sir.", "down": "Volume down, Sir.", "mute": "Muted, Sir.",
+                       "unmute": "Sound is back, Sir."},
+    "media_control": {"play": "Resuming playback, Sir.", "pause": "Paused, Sir.", "stop": "Stopped, Sir.",
+                      "next": "Next track, Sir.", "previous": "Previous track, Sir."},
+}
+
+
+@dataclass
+class IntentMatch:
+    """A local routing decision for one utterance."""
+    intent: str
+    params: Dict
+    confidence: float
+    reply: str
+    rule: str
+    routed: bool = False
+    latency_ms: float = 0.0
+    unknown_tokens: List[str] = field(default_factory=list)
+
+
+class LocalIntentRouter:
+    """
+    Friday's local fast path for direct commands.
+    Uses the ActionExecutor's app map and aliases to recognise applications.
+    """
+
+    def __init__(self, executor, threshold: Optional[float] = None, log_path: Optional[str] = "",
+                 available_intents: Optional[List[str]] = None):
+        """
+        Initialize LocalIntentRouter.
+
+        Args:
+            executor: ActionExecutor (app map, aliases, available intents)
+            threshold: Minimum confidence to act without the cloud (LOCAL_INTENT_THRESHOLD, default 0.85)
+            log_path: JSONL decision log ("" = LOCAL_INTENT_LOG or training_data/intent_router_log.jsonl, None = off)
+            available_intents: Intents this router may emit (default executor.get_available_intents())
+        """
+        self.executor = executor
+        self.threshold = float(threshold or os.getenv('LOCAL_INTENT_THRESHOLD', '0.85') or 0.85)
+        if log_path == "":
+            default_log = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                       "training_data", "intent_router_log.jsonl")
+            log_path = os.getenv('LOCAL_INTENT_LOG', default_log) or None
+        self.log_path = log_path
+        self.available_intents = set(available_intents or executor.get_available_intents())
+
+        self._lookup = {word: canonical for canonical, words in VOCABULARY.items() for word in words}
+        self._log_lock = threading.Lock()
+
+        # Stats
+        self.decisions = 0
+        self.routed = 0
+
+    def route(self, text: str) -> Optional[IntentMatch]:
+        """
+        Classify an utterance.
+
+        Returns:
+            IntentMatch (routed=True when confident enough to skip the cloud), or None if no command was found
+        """
+        started = time.perf_counter()
+        match = self._classify(text or "")
+        if match is not None:
+            if match.intent not in self.available_intents and match.intent != STOP_SPEAKING:
+                match = None
+            else:
+                match.confidence = round(max(0.0, min(1.0, match.confidence)), 2)
+                match.routed = match.confidence >= self.threshold
+                match.latency_ms = (time.perf_counter() - started) * 1000
+
+        self.decisions += 1
+        if match is not None and match.routed:
+            self.routed += 1
+        self._log(text, match)
+        return match
+
+    def get_stats(self) -> Dict:
+        """Get routing statistics."""
+        return {
+            "decisions": self.decisions,
+            "routed": self.routed,
+            "route_rate": self.routed / self.decisions if self.decisions else 0.0,
+            "threshold": self.threshold,
+        }
+
+    def _classify(self, text: str) -> Optional[IntentMatch]:
+        tokens = PUNCTUATION.sub(" ", text.lower()).split()
+        if not tokens:
+            return None
+        words, apps, unknown, free = self._tag(tokens)
+        if "question" in words or "negation" in words or "?" in text:
+            return None
+
+        # Every word we could not place, a second command or conflicting verbs lower confidence
+        penalty = 0.2 * len(unknown) + (0.3 if "and" in words else 0.0)
+        media_verbs = [verb for verb in MEDIA_COMMANDS if verb in words]
+        # "agla gaana chalao" (next + play) is one command; "pause ... play" is not
+        if len([verb for verb in media_verbs if verb in ("play", "pause", "stop")]) > 1:
+            penalty += 0.3
+        app, app_exact = apps[0] if apps else (None, False)
+        app_penalty = 0.0 if app_exact else 0.15
+
+        # "stop", "stop talking", "bas", "chup": Friday should stop speaking
+        if words and words <= {"stop", "hush"} and not apps and not unknown:
+            return self._match(STOP_SPEAKING, {}, 0.95, "stop_speaking", unknown)
+
+        if "screenshot" in words:
+            return self._match("screenshot", {}, 0.95 - penalty, "screenshot", unknown)
+
+        if "lock" in words and not apps:
+            return self._match("lock_screen", {}, 0.95 - penalty, "lock", unknown)
+
+        if "volume" in words or "mute" in words or "unmute" in words:
+            if "unmute" in words:
+                action = "unmute"
+            elif "mute" in words or "close" in words:
+                action = "mute"
+            elif "up" in words:
+                action = "up"
+            elif "down" in words:
+                action = "down"
+            else:
+                return None
+            return self._match("volume_control", {"action": action}, 0.95 - penalty, f"volume_{action}", unknown)
+
+        if "search" in words:
+            # The query is the free text on one side of the search word ("search rust async",
+            # "rust async खोजो"); unknown words on the other side are noise, as anywhere else
+            at = next(i for i, token in enumerate(tokens) if self._lookup.get(token) == "search")
+            _, _, unknown_before, free_before = self._tag(tokens[:at])
+            _, _, unknown_after, free_after = self._tag(tokens[at + 1:])
+            if len(free_after) >= len(free_before):
+                query_words, noise = free_after, unknown_before
+            else:
+                query_words, noise = free_before, unknown_after
+            query = " ".join(query_words)
+            if not query:
+                return None
+            confidence = 0.9 - 0.2 * len(noise) - (0.3 if "and" in words else 0.0)
+            return self._match("search_web", {"query": query}, confidence, "search", noise, query=query)
+
+        if media_verbs and ("media" in words or not apps or media_verbs[0] != "play"):
+            command = media_verbs[0]
+            if "media" in words and "close" in words and command == "play":
+                command = "pause"
+            if command == "play" and "media" in words and DEMONSTRATIVES.intersection(tokens):
+                penalty += 0.15
+            return self._match("media_control", {"command": command}, 0.95 - penalty, f"media_{command}", unknown)
+
+        if "media" in words and "close" in words:
+            return self._match("media_control", {"command": "pause"}, 0.9 - penalty, "media_pause", unknown)
+
+        if app and ("open" in words or "play" in words):
+            # "spotify chalao" may mean "resume playback" as much as "launch"
+            verb_penalty = 0.0 if "open" in words else 0.15
+            return self._match("open_application", {"app_name": app}, 0.95 - penalty - app_penalty - verb_penalty,
+                               "open_app", unknown, app=app)
+
+        if app and "close" in words:
+            return self._match("close_application", {"app_name": app}, 0.95 - penalty - app_penalty,
+                               "close_app", unknown, app=app)
+
+        return None
+
+    def _tag(self, tokens: List[str]) -> Tuple[set, List[Tuple[str, bool]], List[str], List[str]]:
+        """
+        Split tokens into command words, app names (key, exact) and unknown words.
+        Also returns the free text (apps and unknown words as spoken, in order) for search queries.
+        """
+        words, apps, unknown, free = set(), [], [], []
+        i = 0
+        while i < len(tokens):
+            # Multi-word app names first ("google chrome", "visual studio code", "फाइल मैनेजर")
+            for size in (3, 2):
+                phrase = " ".join(tokens[i:i + size])
+                if len(tokens) - i >= size and self.executor.resolve_app_name(phrase):
+                    apps.append((self.executor.resolve_app_name(phrase), True))
+                    free.append(phrase)
+                    i += size
+                    break
+            else:
+                token = tokens[i]
+                i += 1
+                if token in self._lookup:
+                    words.add(self._lookup[token])
+                elif token in FILLERS:
+                    continue
+                elif self.executor.resolve_app_name(token):
+                    apps.append((self.executor.resolve_app_name(token), True))
+                    free.append(token)
+                elif len(token) >= 4 and self.executor.resolve_app_name(token, partial=True):
+                    apps.append((self.executor.resolve_app_name(token, partial=True), False))
+                    free.append(token)
+                else:
+                    unknown.append(token)
+                    free.append(token)
+        return words, apps, unknown, free
+
+    def _match(self, intent: str, params: Dict, confidence: float, rule: str, unknown: List[str],
+               **reply_fields) -> IntentMatch:
+        reply = REPLIES.get(intent, "Done, Sir.")
+        if isinstance(reply, dict):
+            reply = reply.get(params.get("action") or params.get("command"), "Done, Sir.")
+        return IntentMatch(
+            intent=intent,
+            params=params,
+            confidence=confidence,
+            reply=reply.format(**reply_fields),
+            rule=rule,
+            unknown_tokens=list(unknown),
+        )
+
+    def _log(self, text: str, match: Optional[IntentMatch]):
+        """Append one decision to the JSONL log."""
+        if not self.log_path:
+            return
+        entry = {
+            "timestamp": time.time(),
+            "text": text,
+            "intent": match.intent if match else None,
+            "params": match.params if match else None,
+            "confidence": match.confidence if match else 0.0,
+            "routed": bool(match and match.routed),
+            "rule": match.rule if match else None,
+            "latency_ms": round(match.latency_ms, 3) if match else None,
+        }
+        try:
+            with self._log_lock:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️ Intent log write failed: {e}")
@@ -28,16 +28,19 @@ import speech_recognition as sr
 # Import local processors
 # Import local processors
 try:
-    from src.core.cloud_connector import CloudMindConnector
+    from src.core.cloud_connector import CloudMindConnector, MarkerParser
     from src.core.action_executor import ActionExecutor
     from src.core.workflow_engine import WorkflowEngine, WorkflowStep
-    from src.core.proactivity_engine import ProactivityEngine, get_proactivity_engine
+    from src.core.proactivity_engine import ProactivityEngine, ScreenAnalyzer, get_proactivity_engine
     from src.core.autonomous_agent import AutonomousAgent, TaskPlanner
-    from src.core.emotional_intelligence import EmotionalIntelligence, Mood, PersonalityMode
+    from src.core.emotional_intelligence import EmotionalIntelligence, Mood, PersonalityMode, get_voice_settings_for_mood
     from src.integrations.tool_integrations import ToolIntegrations
+    from src.core.intent_router import LocalIntentRouter, REPLIES, STOP_SPEAKING
 except ImportError:
     class CloudMindConnector:
         def __init__(self, **kwargs): pass
+    class MarkerParser:
+        def feed(self, chunk): return []
     class ActionExecutor:
         def __init__(self): pass
         def execute(self, intent, params): return {"status": "error", "message": "ActionExecutor not available"}
@@ -50,6 +53,8 @@ except ImportError:
     class ProactivityEngine:
         def __init__(self): pass
         def analyze_context(self, *args, **kwargs): return []
+    class ScreenAnalyzer:
+        def analyze_text(self, text): return {"has_errors": False, "has_success": False}
     class AutonomousAgent:
         def __init__(self, *args, **kwargs): pass
     class TaskPlanner:
@@ -57,8 +62,47 @@ except ImportError:
     class EmotionalIntelligence:
         def __init__(self): pass
         def analyze_interaction(self, *args, **kwargs): pass
+    def get_voice_settings_for_mood(mood): return {}
+    Mood = None
     class ToolIntegrations:
         def __init__(self): pass
+    class LocalIntentRouter:
+        def __init__(self, *args, **kwargs): pass
+        def route(self, text): return None
+    REPLIES = {}
+    STOP_SPEAKING = "stop_speaking"
+
+try:
+    import pygame
+    PYGAME_AVAILABLE = True
+except ImportError:
+    PYGAME_AVAILABLE = False
+
+from src.core.frame_encoder import FrameEncoder, encode_image
+from src.core.payload_controller import PayloadController
+from src.core.speech_scheduler import SpeechScheduler
+from src.core.speech_stream import SentenceChunker
+from src.core.tts_cache import TTSCache
+from src.core.response_cache import ResponseCache, view_fingerprint, hamming
+from src.core.llm_router import LLMRouter
+from src.core.request_scheduler import (RequestScheduler, RequestPreempted, TokenBucket,
+                                        PRIORITY_USER, PRIORITY_TRIGGER, PRIORITY_PROACTIVE, PRIORITY_NAMES)
+from src.core.session_recorder import SessionRecorder
+from src.core.tracing import get_tracer
+from src.core.turn_pipeline import TurnPipeline
+from src.core.turn_context import TurnContext
+from src.core.deadline import Deadline, DeadlineExceeded
+
+try:
+    from src.core.screen_capture import ScreenCaptureService, CapturedFrame
+    from src.core.capture_backends import create_backend
+    from src.core.frame_processing import downscale_to_rgb, clamp_box, box_around, add_overview_tile
+    from src.core.change_detector import TileChangeDetector
+    from src.core.camera_reader import CameraReader
+    from src.core.screen_ocr import ScreenOCR
+    CAPTURE_SERVICE_AVAILABLE = True
+except ImportError:
+    CAPTURE_SERVICE_AVAILABLE = False
 
 # Image Processor Stub (Use this since we are lightweight now)
 class AdvancedImageProcessor:
@@ -68,6 +112,15 @@ class AdvancedImageProcessor:
         self.max_width = int(os.getenv('CAPTURE_WIDTH', str(self.target_size)) or self.target_size)
         self.max_height = int(os.getenv('CAPTURE_HEIGHT', str(self.target_size)) or self.target_size)
         self.jpeg_quality = int(os.getenv('CAPTURE_QUALITY', '70') or 70)
+        self.jpeg_optimize = str(os.getenv('CAPTURE_JPEG_OPTIMIZE', '1')).lower() in ('1', 'true', 'yes', 'on')
+        # Adaptive payload: CAPTURE_WIDTH/HEIGHT become the scene size, frames are prepared
+        # up to VISION_MAX_SIDE and the controller picks size/quality/codec per frame
+        self.adaptive = str(os.getenv('VISION_ADAPTIVE', '1')).lower() in ('1', 'true', 'yes', 'on')
+        self.payload_controller = PayloadController(self.max_width, self.max_height, kwargs.get('latency_history'))
+        self._last_plan = None   # (content, format, quality, size, budget) last printed
+        if self.adaptive:
+            self.max_width = max(self.max_width, self.payload_controller.max_side)
+            self.max_height = max(self.max_height, self.payload_controller.max_side)
 
     def preprocess_for_vision_model(self, img, **kwargs):
         if img is None:
@@ -89,27 +142,56 @@ class AdvancedImageProcessor:
             return img
         except Exception:
             return img
+
+    def preprocess_frame(self, frame, roi=None, overview=False):
+        """Downscale a raw captured frame straight to the vision model size (no full-size image)
+
+        roi crops (left, top, width, height) from the buffer view first, so the region keeps
+        more of its native resolution; overview adds a small full-screen tile beside it.
+        """
+        view = frame.view()
+        if roi is None:
+            return downscale_to_rgb(view, self.max_width, self.max_height, frame.channel_order)
+
+        left, top, width, height = roi
+        # Leave room for the overview so the combined image never needs another resize
+        tile_w = max(64, self.max_width // 5) if overview else 0
+        region = downscale_to_rgb(view[top:top + height, left:left + width],
+                                  self.max_width - tile_w, self.max_height, frame.channel_order)
+        if not overview:
+            return region
+
+        tile = downscale_to_rgb(view, tile_w, tile_w, frame.channel_order)
+        marker = (left / frame.width, top / frame.height, width / frame.width, height / frame.height)
+        return add_overview_tile(region, tile, marker)
+
+    def encode_for_budget(self, img, encode=None):
+        """Encode a processed frame, adaptively when VISION_ADAPTIVE is on (runs on the encoder pool)"""
+        if self.adaptive:
+            plan = self.payload_controller.encode(img, encode)
+            e = plan.encoded
+            shape = (plan.content.kind, e.format, e.quality, e.width, e.height, plan.budget_bytes)
+            if shape != self._last_plan:
+                # Printed when the choice changes, not for every frame
+                self._last_plan = shape
+                print(f"      - Payload plan: {plan.summary()}")
+            return plan.encoded
+        if encode:
+            return encode(img, "JPEG", self.jpeg_quality)
+        return encode_image(img, "JPEG", self.jpeg_quality, self.jpeg_optimize)
+
     def to_base64(self, img):
-        if hasattr(img, 'mode') and img.mode == 'RGBA':
-            img = img.convert('RGB')
-        buffered = io.BytesIO()
-        img.save(buffered, format="JPEG", quality=self.jpeg_quality, optimize=True)
-        return base64.b64encode(buffered.getvalue()).decode('utf-8')
+        """Synchronous JPEG/base64 encode (generate_response uses the pooled FrameEncoder)"""
+        return encode_image(img, "JPEG", self.jpeg_quality, self.jpeg_optimize).b64.decode('ascii')
 
 class GameplaySceneAnalyzer:
     def analyze_scene_type(self, img): return {}
 
-try:
-    import pygame
-    PYGAME_AVAILABLE = True
-except ImportError:
-    PYGAME_AVAILABLE = False
-
 class InteractiveGamingPartner:
     """The World's Best Life-Long Partner Backbone"""
     
     def __init__(self):
-        self.ollama_base_url = "http://localhost:11434"
+        self.ollama_base_url = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434') or 'http://localhost:11434'
         
         # 🧠 DUAL BRAIN CONFIGURATION
         self.use_cloud_mind = True  # Enabled for Groq processing
@@ -122,9 +204,27 @@ class InteractiveGamingPartner:
         # Initialize Connector (reads from .env automatically)
         self.cloud_mind = CloudMindConnector()
         
+        # Backend selection + failover: Groq first, the local Ollama server when Groq is
+        # down or slow (LLM_BACKENDS / LLM_PROACTIVE_BACKENDS set the preference orders)
+        llm_backends = {"groq": self.cloud_mind}
+        if "ollama" in (os.getenv('LLM_BACKENDS', 'groq,ollama') or '').lower():
+            llm_backends["ollama"] = CloudMindConnector(provider="ollama")
+        # Client-side Groq rate limit (free tier: 30 requests/min); 429 Retry-After pauses it
+        groq_limit = TokenBucket(float(os.getenv('CLOUD_RATE_PER_MIN', '30') or 30),
+                                 int(os.getenv('CLOUD_RATE_BURST', '5') or 5))
+        self.llm_router = LLMRouter(llm_backends, limits={"groq": groq_limit})
+        # User speech > trigger follow-ups > proactive checks; the user cancels proactive calls
+        self.request_scheduler = RequestScheduler()
+        
         # 🎯 SARTHAKA'S ACTION EXECUTOR
         self.action_executor = ActionExecutor()
         
+        # ⚡ Local fast path: direct commands skip the cloud round-trip
+        self.intent_router = None
+        if os.getenv('LOCAL_INTENT_ROUTER', '1').lower() in ('1', 'true', 'yes', 'on'):
+            self.intent_router = LocalIntentRouter(self.action_executor)
+            print("✅ Local intent router active for direct commands")
+        
         # 🔄 SARTHAKA'S WORKFLOW ENGINE
         self.workflow_engine = WorkflowEngine(self.action_executor)
         print("✅ WorkflowEngine initialized for multi-step tasks")
@@ -155,17 +255,61 @@ class InteractiveGamingPartner:
         self.hardware = None
         
         # Vision Tools (Turbo Optimized: 336px is native for llava-phi3)
-        self.image_processor = AdvancedImageProcessor(enhance_mode='speed', target_size=336)
+        self.image_processor = AdvancedImageProcessor(
+            enhance_mode='speed', target_size=336,
+            latency_history=getattr(self.cloud_mind, 'request_history', None)
+        )
         self.scene_analyzer = GameplaySceneAnalyzer()
-        self.cap = None 
+        self.camera_reader = None
         use_camera_env = os.getenv('USE_CAMERA', '0')
         self.use_camera = str(use_camera_env).lower() in ('1', 'true', 'yes', 'on')
+        self.camera_max_frame_age = float(os.getenv('CAMERA_MAX_FRAME_AGE', '1.0') or 1.0)
+        # Background screen grabber (started by start_capture)
+        self.capture_service = None
+        use_capture_service_env = os.getenv('CAPTURE_SERVICE', '1')
+        self.use_capture_service = str(use_capture_service_env).lower() in ('1', 'true', 'yes', 'on')
+        self.capture_max_frame_age = float(os.getenv('CAPTURE_MAX_FRAME_AGE', '2.0') or 2.0)
+        # Screen source: mss (Xorg), screenshot tool over a pipe (Wayland) or replay (CAPTURE_BACKEND)
+        self.capture_backend = None
+        if CAPTURE_SERVICE_AVAILABLE:
+            try:
+                self.capture_backend = create_backend()
+            except ValueError as e:
+                print(f"⚠️ {e}. Using auto-detected capture backend.")
+                self.capture_backend = create_backend('auto')
+        # Region of interest: full screen, the active window or a box around the cursor
+        self.capture_mode = (os.getenv('CAPTURE_MODE', 'full') or 'full').lower()
+        self.capture_overview = str(os.getenv('CAPTURE_OVERVIEW', '1')).lower() in ('1', 'true', 'yes', 'on')
+        cursor_box = (os.getenv('CAPTURE_CURSOR_BOX', '960x540') or '960x540').lower().split('x')
+        self.cursor_box = (int(cursor_box[0]), int(cursor_box[-1]))
+        self._last_image_note = None
         
         # Audio Configuration (Professional Voice - Friday's Tone)
         # Default to a professional English voice for Friday
         self.tts_voice = os.getenv('TTS_VOICE', 'en-IN-NeerjaNeural')  # Professional Indian English
         self.tts_rate = os.getenv('TTS_RATE', '+8%')               # Slightly faster but clear
         self.tts_pitch = os.getenv('TTS_PITCH', '+0Hz')              # Natural pitch
+        self.tts_timeout = float(os.getenv('TTS_TIMEOUT', '10') or 10)  # Per sentence
+        # Tone rate and pitch by the user's mood (get_voice_settings_for_mood) instead of TTS_RATE/TTS_PITCH
+        self.tts_mood_voice = os.getenv('TTS_MOOD_VOICE', '0').lower() in ('1', 'true', 'yes', 'on')
+        # Recurring sentences are synthesized once and replayed from disk (TTS_CACHE_DIR)
+        self.tts_cache = None
+        if os.getenv('TTS_CACHE', '1').lower() in ('1', 'true', 'yes', 'on'):
+            try:
+                self.tts_cache = TTSCache()
+            except OSError as e:
+                print(f"⚠️ TTS cache disabled: {e}")
+        self.tts_prewarm = os.getenv('TTS_PREWARM', '1').lower() in ('1', 'true', 'yes', 'on')
+        self._prewarm_task = None
+        # Stream replies to the user into TTS sentence by sentence while they are generated
+        self.stream_speech = os.getenv('CLOUD_STREAMING', '1').lower() in ('1', 'true', 'yes', 'on')
+        self._speech_task = None
+        self._streamed_reply = None
+        # Every line goes through one scheduler: priority order, dedup, stale lines dropped
+        self.speech_scheduler = SpeechScheduler(self._synthesize_speech, self._play_audio, stop=self._stop_playback)
+        self._player = None
+        # Recognize speech heard while Friday talks; unless it is her own echo, stop talking (barge-in)
+        self.barge_in = os.getenv('BARGE_IN', '1').lower() in ('1', 'true', 'yes', 'on')
         self.recognizer = sr.Recognizer()
         self.recognizer.energy_threshold = 4000
         self.recognizer.dynamic_energy_threshold = True
@@ -186,20 +330,62 @@ class InteractiveGamingPartner:
         # Memory & State
         self.conversation_history = []
         self.speech_queue = queue.Queue()
+        # Event bridge (bind_event_loop): STT results and screen changes wake the asyncio loop
+        self._loop = None
+        self.speech_events = None
+        self.screen_changed = None
+        self.proactive_on_change = os.getenv('PROACTIVE_ON_CHANGE', '1').lower() in ('1', 'true', 'yes', 'on')
+        self.change_wake_bits = int(os.getenv('PROACTIVE_CHANGE_BITS', '10') or 10)
+        self.proactive_min_gap = float(os.getenv('PROACTIVE_MIN_GAP', '10') or 10)
+        self._watch_fingerprint = None
         self.is_running = False
         self.is_speaking = False
+        self._last_user_turn = 0.0
+        self.last_reply_priority = PRIORITY_PROACTIVE
         self.last_observation_time = time.time()
         self.observation_interval = 45  # Increased for CPU efficiency
         self.last_visual_context = ""
         # Capture cache for CPU optimization
-        self._last_img_b64 = None
+        self._last_encoded = None
         self._last_img_time = 0
         self._last_processed_image = None
+        self._last_source_frame = None
         self.capture_min_interval = float(os.getenv('CAPTURE_MIN_INTERVAL', '1.5') or 1.5)
-        # Proactive change detection (skip cloud if little has changed)
-        self._last_thumb = None
-        self.thumb_size = int(os.getenv('THUMB_SIZE', '64') or 64)
-        self.proactive_change_threshold = float(os.getenv('PROACTIVE_CHANGE_THRESHOLD', '0.12') or 0.12)
+        # Proactive change detection (skip cloud unless a real, localized change happened)
+        self.change_detector = TileChangeDetector() if CAPTURE_SERVICE_AVAILABLE else None
+        self.last_change_report = None
+        # Local OCR of changed tiles (optional, needs pytesseract): feeds the trigger engine
+        self.screen_ocr = None
+        if CAPTURE_SERVICE_AVAILABLE and os.getenv('OCR_ENABLED', '1').lower() in ('1', 'true', 'yes', 'on'):
+            ocr = ScreenOCR(rows=self.change_detector.rows, cols=self.change_detector.cols)
+            if ocr.available():
+                self.screen_ocr = ocr
+                print("✅ Screen OCR enabled (changed tiles only)")
+            else:
+                ocr.shutdown()
+        # Skip the cloud when OCR read the change and no local pattern found anything worth saying
+        self.ocr_gate = os.getenv('OCR_GATE', '1').lower() in ('1', 'true', 'yes', 'on')
+        self.screen_analyzer = ScreenAnalyzer()
+        self.last_ocr_result = None
+        self.last_triggers = []
+        # Recent side-effect free cloud replies by (frame hash, window, speech)
+        self.response_cache = None
+        if os.getenv('RESPONSE_CACHE', '1').lower() in ('1', 'true', 'yes', 'on'):
+            self.response_cache = ResponseCache()
+        # Per-stage latency spans and histograms (TRACE_FILE / TRACE_PROM_FILE / TRACE_HTTP_PORT export them)
+        self.tracer = get_tracer()
+        self.tracer.serve()
+        # Timestamped inputs of this session for replay (SESSION_RECORD=1 or main.py --record)
+        self.recorder = None
+        if os.getenv('SESSION_RECORD', '0').lower() in ('1', 'true', 'yes', 'on'):
+            self.recorder = SessionRecorder()
+        # Capture, think and speak stages joined by bounded queues (run() and main.py submit turns to it)
+        self.pipeline = TurnPipeline(self)
+        # JPEG/base64 encoding on a worker pool (keeps the voice queue and TTS responsive)
+        self.frame_encoder = FrameEncoder(
+            quality=self.image_processor.jpeg_quality,
+            optimize=self.image_processor.jpeg_optimize
+        )
         
         # Storage Paths
         self.base_dir = Path(__file__).resolve().parent.parent.parent
@@ -229,6 +415,8 @@ class InteractiveGamingPartner:
                 print(f"⚠️ Audio init warning: {e}")
         print(f"✨ {self.name} is online...")
         print(f"🧠 Universal Brain: {self.thinking_model} (Groq)")
+        print(f"🔀 LLM backends: user {' → '.join(self.llm_router.order)}, "
+              f"proactive {' → '.join(self.llm_router.proactive_order)}")
         print(f"👨‍💻 Creator: {self.creator}")
         print(f"⚡ Action Layer: Enabled ({len(self.action_executor.get_available_intents())} capabilities)")
         print(f"🔄 Workflow Engine: Ready for multi-step tasks")
@@ -287,10 +475,39 @@ class InteractiveGamingPartner:
 
     def _get_active_window_title(self):
         """Get the currently active window title for context."""
-        result = self.action_executor.execute("get_active_window", {})
-        if result.get("status") == "success":
-            return result.get("message")
-        return None
+        with self.tracer.span("window"):
+            result = self.action_executor.execute("get_active_window", {})
+        title = result.get("message") if result.get("status") == "success" else None
+        if self.recorder is not None:
+            self.recorder.record_window(title)
+        return title
+
+    def _context_lookups(self, user_speech):
+        """Start this turn's context lookups together (memoized, so calling again just returns them)"""
+        context = TurnContext.current()
+        lookups = {
+            "window": context.prefetch("window", self._get_active_window_title),
+            "workflows": context.prefetch("workflows", self._workflow_template_ids, thread=False),
+        }
+        if self.smart_memory:
+            lookups["project"] = context.prefetch("project", self._current_project)
+            if user_speech:
+                lookups["memory"] = context.prefetch("memory", self._memory_context, user_speech)
+        return lookups
+
+    def _current_project(self):
+        with self.tracer.span("project"):
+            return self.smart_memory.get_current_project()
+
+    def _memory_context(self, user_speech):
+        # The project is looked up on its own (in parallel), so it is left out here
+        with self.tracer.span("memory"):
+            return self.smart_memory.format_context_for_prompt(
+                user_speech, recent_n=3, relevant_k=2, include_project=False
+            )
+
+    def _workflow_template_ids(self):
+        return list(self.workflow_engine.get_workflow_templates().keys())
 
     def _handle_workflow_request(self, params):
         """Handle workflow execution request."""
@@ -332,7 +549,7 @@ class InteractiveGamingPartner:
     def _analyze_for_triggers(self, screen_text: str, active_window: str):
         """Analyze context and trigger proactive events."""
         if not hasattr(self, 'proactivity_engine') or not self.proactivity_engine:
-            return
+            return []
         
         # Determine if user is active
         user_active = (time.time() - self.last_observation_time) < 60
@@ -349,15 +566,74 @@ class InteractiveGamingPartner:
             if event["priority"] >= 3:
                 # High priority - speak immediately
                 print(f"\n🔔 High priority alert: {event['message']}")
-                # In full implementation: asyncio.create_task(self.speak(event['message']))
+        return triggered
 
     def listen_to_user(self, timeout=None):
-        """Blocking listen for user speech (safe for main loop)"""
+        """Blocking listen for user speech (threads only; async code uses next_event)"""
         try:
             return self.speech_queue.get(timeout=timeout)
         except queue.Empty:
             return None
 
+    def bind_event_loop(self):
+        """Deliver speech and screen-change events to the running asyncio loop (see next_event)."""
+        self._loop = asyncio.get_running_loop()
+        self.speech_events = asyncio.Queue()
+        self.screen_changed = asyncio.Event()
+        # Speech recognized before the bridge existed
+        while True:
+            try:
+                self.speech_events.put_nowait(self.speech_queue.get_nowait())
+            except queue.Empty:
+                break
+
+    async def next_event(self, timeout=None):
+        """
+        Wait for whichever comes first: user speech, a screen change or the timeout.
+
+        Returns:
+            ("speech", text), ("screen", None) or ("timer", None)
+        """
+        if self.speech_events is None:
+            self.bind_event_loop()
+        if self.speech_events.empty():
+            speech = asyncio.ensure_future(self.speech_events.get())
+            changed = asyncio.ensure_future(self.screen_changed.wait())
+            done, pending = await asyncio.wait({speech, changed}, timeout=timeout,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            if speech not in done:
+                if changed in done:
+                    self.screen_changed.clear()
+                    return "screen", None
+                return "timer", None
+            text = speech.result()
+        else:
+            text = self.speech_events.get_nowait()
+        self._last_user_turn = time.time()
+        return "speech", text
+
+    def _deliver_speech(self, text):
+        """Hand an STT result (from the recognizer thread) to the event loop, or the sync queue before it is bound."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.speech_events.put_nowait, text)
+        else:
+            self.speech_queue.put(text)
+
+    def _on_captured_frame(self, frame):
+        """Capture-thread listener: signal the loop when the screen moved away from what it last reported."""
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self.proactive_on_change:
+            return
+        fingerprint = view_fingerprint(frame.view(), frame.channel_order)
+        if self._watch_fingerprint is None:
+            self._watch_fingerprint = fingerprint
+        elif hamming(fingerprint, self._watch_fingerprint) >= self.change_wake_bits:
+            self._watch_fingerprint = fingerprint
+            loop.call_soon_threadsafe(self.screen_changed.set)
+
     def start_listening(self):
         """Start the background listening thread"""
         if self.mic_available and self.mic:
@@ -375,6 +651,30 @@ class InteractiveGamingPartner:
             except Exception as e:
                 print(f"❌ Mic error: {e}")
 
+    def start_capture(self):
+        """Start the background screen capture service (streaming backends only)"""
+        if not (self.use_capture_service and self.capture_backend):
+            return
+        if not self.capture_backend.streaming:
+            # Screenshot tools are too slow to poll; they stay on-demand
+            return
+        if self.capture_service is None:
+            self.capture_service = ScreenCaptureService(backend=self.capture_backend)
+            self.capture_service.add_listener(self._on_captured_frame)
+        if not self.capture_service.start() and not self.capture_service.is_stopping:
+            self.capture_service = None
+
+    def stop_capture(self):
+        """Stop the background screen capture service and camera reader"""
+        if self.capture_service:
+            self.capture_service.stop()
+            # A worker still stuck in a grab keeps its service, so no second one is started beside it
+            if not self.capture_service.is_stopping:
+                self.capture_service = None
+        if self.camera_reader:
+            self.camera_reader.stop()
+            self.camera_reader = None
+
     async def capture_vision_safe(self):
         """Safely capture vision data"""
         try:
@@ -391,15 +691,15 @@ class InteractiveGamingPartner:
     def _init_camera(self):
         """Initialize webcam if available"""
         try:
-            self.cap = cv2.VideoCapture(0)
-            if not self.cap.isOpened():
+            # Reader thread drains the device; frames arrive pre-sized for the overlay
+            overlay_height = max(1, self.image_processor.max_height // 3)
+            self.camera_reader = CameraReader(0, 640, 480, 30, overlay_height=overlay_height)
+            if not self.camera_reader.start():
                 print("⚠️ Camera not found. Screen Only mode.")
+                self.camera_reader = None
                 self.use_camera = False
             else:
-                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                self.cap.set(cv2.CAP_PROP_FPS, 30)
-                print("✅ Camera initialized (640x480)")
+                print(f"✅ Camera initialized (640x480, background reader, overlay {overlay_height}px)")
         except Exception as e:
             print(f"⚠️ Camera initialization failed: {e}")
             self.use_camera = False
@@ -429,34 +729,72 @@ class InteractiveGamingPartner:
         except Exception as e:
             print(f"⚠️ Memory save error: {e}")
 
-    def _compute_thumb(self, pil_img):
+    def _detect_changes(self, source):
+        """Run the tile change detector on a raw frame or a PIL image"""
+        if self.change_detector is None or source is None:
+            return None
         try:
-            if hasattr(pil_img, 'mode') and pil_img.mode != 'L':
-                gray = pil_img.convert('L')
-            else:
-                gray = pil_img
-            ts = max(8, int(self.thumb_size))
-            thumb = gray.resize((ts, ts), Image.Resampling.BILINEAR)
-            return np.asarray(thumb, dtype=np.uint8)
-        except Exception:
+            if hasattr(source, 'channel_order'):
+                # Raw captured frame: hash tiles straight from the buffer view
+                return self.change_detector.analyze_frame(source.view(), source.channel_order)
+            return self.change_detector.analyze_image(source)
+        except Exception as e:
+            print(f"      ⚠️ Change detection failed: {e}")
             return None
 
-    def _should_skip_proactive(self, pil_img):
-        thumb = self._compute_thumb(pil_img)
-        if thumb is None:
-            return False
-        if self._last_thumb is None:
-            self._last_thumb = thumb
+    def _should_skip_proactive(self, source):
+        report = self._detect_changes(source)
+        # Set even when detection failed: the report always belongs to this turn's frame
+        self.last_change_report = report
+        if report is None:
             return False
+        if not report.changed:
+            print(f"      - {report.summary()} → skipping cloud call")
+            return True
+        print(f"      - {report.summary()}")
+        return False
+
+    async def _screen_text_gate(self, source):
+        """
+        OCR the changed tiles and run the local trigger patterns on that text.
+        Returns (reply, thought) when the decision was made locally, else (None, None).
+        """
+        self.last_ocr_result = None
+        self.last_triggers = []
+        if self.screen_ocr is None or source is None:
+            return None, None
         try:
-            diff = np.mean(np.abs(thumb.astype(np.int16) - self._last_thumb.astype(np.int16))) / 255.0
-            self._last_thumb = thumb
-            if diff < self.proactive_change_threshold:
-                print(f"      - Screen change small (diff={diff:.3f}) → skipping cloud call")
-                return True
-            return False
-        except Exception:
-            return False
+            if hasattr(source, 'channel_order'):
+                view, channel_order = source.view(), source.channel_order
+            else:
+                view, channel_order = np.asarray(source.convert('RGB')), 'RGB'
+            ocr = await self.screen_ocr.process_async(view, channel_order, self.last_change_report)
+        except Exception as e:
+            print(f"      ⚠️ OCR stage failed: {e}")
+            return None, None
+        self.last_ocr_result = ocr
+        print(f"      - {ocr.summary()}")
+        if not ocr.changed_text:
+            # Nothing readable changed (game scene, video): the vision model has to look
+            return None, None
+
+        active_window = await TurnContext.current().get("window", self._get_active_window_title) or ""
+        events = self._analyze_for_triggers(ocr.changed_text, active_window)
+        # Low-priority events still go to the cloud, but ahead of plain observations
+        self.last_triggers = [event for event in events if event["priority"] < 2]
+        triggered = [event for event in events if event["priority"] >= 2]
+        if triggered:
+            event = max(triggered, key=lambda e: e["priority"])
+            print(f"      - Local trigger '{event['trigger_id']}' → answering without the cloud")
+            return event["message"], f"Local trigger: {event['trigger_id']}"
+
+        report = self.last_change_report
+        if self.ocr_gate and report is not None and report.reason != "first frame":
+            analysis = self.screen_analyzer.analyze_text(ocr.changed_text)
+            if not analysis["has_errors"] and not analysis["has_success"]:
+                print("      - Changed text matched no local pattern → skipping cloud call")
+                return "[SILENCE]", "Skipped by local text gate"
+        return None, None
 
     def _log_interaction(self, final_image, user_input, ai_response, visual_facts):
         """Log interaction into a unified JSON dataset for Reinforcement Learning"""
@@ -524,50 +862,95 @@ class InteractiveGamingPartner:
         # 1. Capture Screen
         try:
             print("      - Grabbing screen...")
-            # CHECK FOR WAYLAND
-            if os.environ.get('XDG_SESSION_TYPE') == 'wayland':
-                # Wayland Fallback: gnome-screenshot
-                try:
-                    import subprocess
-                    temp_shot = "/tmp/saarthika_vision.png"
-                    # Quietly take screenshot
-                    subprocess.run(["gnome-screenshot", "-f", temp_shot], check=True, timeout=2, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    vision_data['screen'] = Image.open(temp_shot)
-                    print("      ✓ Screen captured (Wayland/Gnome)")
-                except Exception as w_err:
-                    print(f"      ✗ Wayland Capture Failed: {w_err}")
-                    print("        (Try: sudo apt install gnome-screenshot)")
-                    vision_data['screen_blocked'] = True
+            frame = None
+            if self.capture_service and self.capture_service.is_running:
+                frame = self.capture_service.get_latest_frame(max_age=self.capture_max_frame_age)
+
+            if frame is not None:
+                # Newest buffered frame - no grab on the event loop
+                vision_data['frame'] = frame
+                print(f"      ✓ Screen captured ({self.capture_backend.name}, buffered {frame.age * 1000:.0f}ms ago)")
             else:
-                # Xorg (Standard)
-                with mss.mss() as sct:
-                    monitor = sct.monitors[1]
-                    sct_img = sct.grab(monitor)
-                    screen_img = Image.frombytes('RGB', sct_img.size, sct_img.bgra, 'raw', 'BGRX')
-                    vision_data['screen'] = screen_img
-                    print("      ✓ Screen captured (Xorg)")
+                # One-shot grab when no fresh frame is buffered (always for screenshot tools)
+                vision_data['frame'] = await asyncio.to_thread(self._grab_screen_once)
+                print(f"      ✓ Screen captured ({self.capture_backend.name})")
+            if self.recorder is not None:
+                self.recorder.record_frame(vision_data['frame'])
+
+            if self.capture_mode != 'full':
+                vision_data['roi'] = await asyncio.to_thread(self._region_of_interest, vision_data['frame'])
         except Exception as e:
             print(f"      ✗ Screen capture failed: {e}")
+            if os.environ.get('XDG_SESSION_TYPE') == 'wayland':
+                print("        (Try: sudo apt install gnome-screenshot, or grim on wlroots)")
             vision_data['screen_blocked'] = True
             
         # 2. Capture Camera (if enabled)
-        if self.use_camera and self.cap:
+        if self.use_camera and self.camera_reader:
             try:
-                print("      - Grabbing camera...")
-                ret, frame = self.cap.read()
-                if ret:
-                    cam_img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    vision_data['camera'] = Image.fromarray(cam_img)
+                # Newest frame from the reader thread - never waits on the device
+                cam_img = self.camera_reader.get_latest(max_age=self.camera_max_frame_age)
+                if cam_img is not None:
+                    vision_data['camera'] = cam_img
                     print("      ✓ Camera captured")
+                else:
+                    print("      - No fresh camera frame")
             except Exception as e:
                 print(f"      ✗ Camera capture failed: {e}")
                 vision_data['camera_error'] = True
                 
         return vision_data
 
+    def _region_of_interest(self, frame):
+        """Crop box (left, top, width, height) in frame pixels for CAPTURE_MODE, or None for full screen"""
+        box = None
+        if self.capture_mode == 'window' and hasattr(self.action_executor, 'get_active_window_geometry'):
+            geometry = self.action_executor.get_active_window_geometry()
+            if geometry:
+                box = clamp_box(geometry['x'] - frame.left, geometry['y'] - frame.top,
+                                geometry['width'], geometry['height'], frame.width, frame.height)
+        elif self.capture_mode == 'cursor' and hasattr(self.action_executor, 'get_cursor_position'):
+            position = self.action_executor.get_cursor_position()
+            if position:
+                box = box_around(position[0] - frame.left, position[1] - frame.top,
+                                 self.cursor_box[0], self.cursor_box[1], frame.width, frame.height)
+
+        if box is None:
+            return None
+        # Tiny windows (tooltips, docks) and maximized windows are better sent whole
+        _, _, width, height = box
+        if width < 200 or height < 150 or width * height > 0.9 * frame.width * frame.height:
+            return None
+        return box
+
+    def _grab_screen_once(self):
+        """One-shot grab from the configured capture backend as a raw frame"""
+        if self.capture_backend is None:
+            raise RuntimeError("No capture backend available")
+        return self.capture_backend.grab()
+
     def prepare_multimodal_input(self, vision_data):
         """Combine available vision sources"""
         print("   [2] Preparing image...")
+        if vision_data.get('frame') is not None:
+            # Raw frame: downscale from the buffer view, then overlay at target size
+            roi = vision_data.get('roi')
+            screen = self.image_processor.preprocess_frame(vision_data['frame'], roi, self.capture_overview)
+            if roi:
+                print(f"      ✓ Region of interest ({self.capture_mode}): {roi[2]}x{roi[3]} at ({roi[0]}, {roi[1]})")
+
+            if vision_data.get('camera'):
+                cam = vision_data['camera']
+                h = max(1, screen.height // 3)
+                w = max(1, int(cam.width * (h / cam.height)))
+                cam_resized = cam.resize((w, h), Image.Resampling.BILINEAR)
+                margin = max(2, screen.width // 96)
+                screen.paste(cam_resized, (max(0, screen.width - w - margin), max(0, screen.height - h - margin)))
+                print("      ✓ Combined screen + camera")
+                return screen
+            print("      ✓ Using screen only")
+            return screen
+
         if 'screen' in vision_data:
             screen = vision_data['screen']
             
@@ -591,35 +974,49 @@ class InteractiveGamingPartner:
         print("      ✓ Using black fallback")
         return Image.new('RGB', (1024, 768), color=(30, 30, 30))
 
-    async def _get_visual_description(self, img_b64):
+    def _describe_image_layout(self, vision_data):
+        """Tell the model what the image shows when it is a region crop"""
+        if not vision_data.get('roi'):
+            return None
+        region = "the active window" if self.capture_mode == 'window' else "the area around the mouse cursor"
+        note = f"IMAGE: {region} at higher resolution"
+        if self.capture_overview:
+            note += "; the small tile on the right is the full screen (red box = that region)"
+        return note
+
+    def _process_vision_data(self, vision_data):
+        """Combine and downscale captured vision data (runs off the event loop)"""
+        combined_img = self.prepare_multimodal_input(vision_data)
+        return self.image_processor.preprocess_for_vision_model(combined_img)
+
+    async def _get_visual_description(self, img_b64, deadline=None):
         """Step 1: Vision Model Analysis"""
         print("   [3] Calling VISION model...")
         
         prompt = "Describe what you see in 1-2 sentences. Mention any UI, actions, or environment."
         
         try:
-            start_time = time.time()
             print(f"      - Sending request to {self.vision_model}...")
             
-            response = requests.post(
-                f"{self.ollama_base_url}/api/generate", 
-                json={
-                    "model": self.vision_model,
-                    "prompt": prompt,
-                    "images": [img_b64],
-                    "stream": False,
-                    "options": {
-                        "num_predict": 30,  # Ultra-fast punchy description
-                        "temperature": 0.1,
-                        "num_thread": 8     # Assuming 8 threads, Ollama will optimize
-                    },
-                    "keep_alive": "10m" 
-                }, 
-                timeout=60
-            )
+            with self.tracer.span("vision_local", model=self.vision_model) as span:
+                response = requests.post(
+                    f"{self.ollama_base_url}/api/generate", 
+                    json={
+                        "model": self.vision_model,
+                        "prompt": prompt,
+                        "images": [img_b64],
+                        "stream": False,
+                        "options": {
+                            "num_predict": 30,  # Ultra-fast punchy description
+                            "temperature": 0.1,
+                            "num_thread": 8     # Assuming 8 threads, Ollama will optimize
+                        },
+                        "keep_alive": "10m" 
+                    }, 
+                    timeout=deadline.timeout(60) if deadline else 60
+                )
             
-            elapsed = time.time() - start_time
-            print(f"      - Response received in {elapsed:.1f}s")
+            print(f"      - Response received in {span.elapsed:.1f}s")
             
             if response.status_code == 200:
                 result = response.json().get('response', '').strip()
@@ -635,10 +1032,10 @@ class InteractiveGamingPartner:
             print(f"      ✗ Vision Error: {e}")
             return "Visual error"
 
-    async def _get_strategic_response(self, visual_context, user_speech):
+    async def _get_strategic_response(self, visual_context, user_speech, deadline=None):
         """Step 2: Thinking Model Response"""
         if self.use_cloud_mind:
-            return await self._get_cloud_strategic_response(visual_context, user_speech)
+            return await self._get_cloud_strategic_response(visual_context, user_speech, deadline=deadline)
         
         print(f"   [4] Calling LOCAL MIND ({self.thinking_model})...")
         user_name = self.personal_memory.get('user_name', 'Dipesh')
@@ -650,23 +1047,23 @@ class InteractiveGamingPartner:
             prompt = f"Game scene: {visual_context}\nStrategy: 1 short Hinglish comment for {user_name}."
 
         try:
-            start_time = time.time()
-            response = requests.post(
-                f"{self.ollama_base_url}/api/generate", 
-                json={
-                    "model": self.thinking_model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.8,
-                        "num_predict": 25,
-                        "num_ctx": 1024,
-                        "num_thread": 8
-                    },
-                    "keep_alive": "10m"
-                }, 
-                timeout=60
-            )
+            with self.tracer.span("llm_local", model=self.thinking_model):
+                response = requests.post(
+                    f"{self.ollama_base_url}/api/generate", 
+                    json={
+                        "model": self.thinking_model,
+                        "prompt": prompt,
+                        "stream": False,
+                        "options": {
+                            "temperature": 0.8,
+                            "num_predict": 25,
+                            "num_ctx": 1024,
+                            "num_thread": 8
+                        },
+                        "keep_alive": "10m"
+                    }, 
+                    timeout=deadline.timeout(60) if deadline else 60
+                )
             if response.status_code == 200:
                 result = response.json().get('response', '').strip()
                 
@@ -693,12 +1090,16 @@ class InteractiveGamingPartner:
             print(f"      ✗ Thinking Error: {e}")
             return None, None
 
-    async def _get_cloud_strategic_response(self, visual_facts, user_speech, image_b64=None):
-        """Step 2: Cloud Mind Response with Action Support"""
+    async def _get_cloud_strategic_response(self, visual_facts, user_speech, encoded=None, speaker=None,
+                                            cache_key=None, deadline=None):
+        """Step 2: Cloud Mind Response with Action Support (streamed into `speaker` when given)"""
         print(f"   [4] Sarthika analyzing via CLOUD MIND ({self.thinking_model})...")
+        deadline = deadline or Deadline(None)
         
-        # Get active window for context
-        active_window = self._get_active_window_title()
+        # Active window, project, memory and workflow templates: started together at the
+        # top of the turn (alongside the capture), so this waits only for the slowest one
+        context = await deadline.run("memory", TurnContext.current().gather(self._context_lookups(user_speech)))
+        active_window = context["window"]
         if active_window:
             print(f"      - Active window: {active_window[:50]}...")
         
@@ -706,76 +1107,266 @@ class InteractiveGamingPartner:
         available_actions = self.action_executor.get_available_intents()
         
         # Get SmartMemory context
-        memory_context = ""
-        if self.smart_memory:
-            context_parts = []
-            
-            # Get current project
-            current_project = self.smart_memory.get_current_project()
-            if current_project:
-                context_parts.append(f"PROJECT: {current_project}")
-            
-            # Get relevant context from user speech
-            if user_speech:
-                memory_context = self.smart_memory.format_context_for_prompt(
-                    user_speech, recent_n=3, relevant_k=2
-                )
-                if memory_context:
-                    context_parts.append(f"MEMORY_CONTEXT:\n{memory_context}")
+        context_parts = []
+        if context.get("project"):
+            context_parts.append(f"PROJECT: {context['project']}")
+        if context.get("memory"):
+            context_parts.append(f"MEMORY_CONTEXT:\n{context['memory']}")
             
         # Update memory with workflow capability info
-        workflow_templates = self.workflow_engine.get_workflow_templates()
-        context_parts.append(f"WORKFLOW_TEMPLATES: {', '.join(workflow_templates.keys())}")
-        context_parts.append("For multi-step tasks, include [WORKFLOW:template_id|context_var=value]")
+        if context["workflows"]:
+            context_parts.append(f"WORKFLOW_TEMPLATES: {', '.join(context['workflows'])}")
+            context_parts.append("For multi-step tasks, include [WORKFLOW:template_id|context_var=value]")
+        memory_context = "\n".join(context_parts)
         
+        # Actions start as soon as their marker is complete (while the reply is still
+        # streaming) and run one after another in the order the model wrote them
+        parser = MarkerParser()
+        action_tasks = []
+        streamed = []   # deltas already handed to the speaker
+
+        def on_delta(delta):
+            if speaker is not None:
+                streamed.append(delta)
+                if "first_token_ms" not in cloud_span.attrs:
+                    cloud_span.set(first_token_ms=round(cloud_span.elapsed * 1000, 1))
+                    self.tracer.observe("cloud_first_token", cloud_span.elapsed)
+                    # The reply starts playing within a sentence: it is no longer stale
+                    deadline.meet()
+                speaker.feed(delta)
+            for action_request in parser.feed(delta):
+                previous = action_tasks[-1] if action_tasks else None
+                action_tasks.append(asyncio.create_task(self._run_action_after(previous, action_request)))
+
         # Use our new dedicated connector with image support and action extraction
-        reply, status, action_request = self.cloud_mind.think(
-            visual_facts=visual_facts, 
-            user_speech=user_speech,
-            history=self.conversation_history,
-            image_b64=image_b64,
-            active_window=active_window,
-            available_actions=available_actions,
-            memory_context=memory_context
-        )
-        
-        # Execute action if requested
-        if action_request and action_request.get("intent"):
-            intent = action_request.get("intent")
-            params = action_request.get("params", {})
-            
-            # Check if it's a workflow request
-            if intent == "execute_workflow":
-                print(f"      ⚡ Starting workflow: {params.get('workflow_name', 'custom')}")
-                workflow = self._handle_workflow_request(params)
-                if workflow:
-                    await self.workflow_engine.execute_workflow(workflow)
-                    reply = f"{reply}\n[Workflow completed: {workflow.name}]"
-                else:
-                    reply = f"{reply}\n[Workflow creation failed]"
-            else:
-                print(f"      ⚡ Executing action: {intent}")
-                action_result = self.action_executor.execute(intent, params)
-                
-                # Guard against None result
-                if action_result is None:
-                    action_result = {"status": "error", "message": "Action returned no result"}
-                
-                print(f"      ✓ Action result: {action_result.get('message', 'Done')}")
-                
-                # Don't append action results to the spoken reply - only log them
-                # The AI's response should stand on its own without technical error messages
-                if action_result.get("status") != "success":
-                    print(f"      ⚠️ Action failed (logged but not spoken): {action_result.get('message')}")
+        # (admitted by priority: a proactive call never holds up the user's turn)
+        if user_speech:
+            priority = PRIORITY_USER
+        else:
+            priority = PRIORITY_TRIGGER if self.last_triggers else PRIORITY_PROACTIVE
+        with self.tracer.span("cloud", priority=PRIORITY_NAMES[priority]) as cloud_span:
+            try:
+                reply, status, _ = await deadline.run("cloud", self.request_scheduler.run(priority, lambda: self.llm_router.think(
+                    priority="user" if user_speech else "proactive",
+                    visual_facts=visual_facts, 
+                    user_speech=user_speech,
+                    history=self.conversation_history,
+                    image_b64=encoded.b64 if encoded else None,
+                    image_mime=encoded.mime if encoded else "image/jpeg",
+                    active_window=active_window,
+                    available_actions=available_actions,
+                    memory_context=memory_context,
+                    on_delta=on_delta if speaker is not None else None
+                )))
+            except DeadlineExceeded:
+                cloud_span.set(status="DEADLINE")
+                if self.recorder is not None:
+                    self.recorder.record_cloud(user_speech, None, "DEADLINE", cloud_span.elapsed,
+                                               "user" if user_speech else "proactive")
+                for task in action_tasks:
+                    task.cancel()
+                raise
+            except RequestPreempted:
+                cloud_span.set(status="PREEMPTED")
+                print("      - Proactive request cancelled: the user is speaking")
+                if self.recorder is not None:
+                    self.recorder.record_cloud(user_speech, None, "PREEMPTED", cloud_span.elapsed, "proactive")
+                return "[SILENCE]", "Preempted by user speech"
+            cloud_span.set(status=status, backend=self.llm_router.last_backend)
+        if self.recorder is not None:
+            self.recorder.record_cloud(user_speech, reply, status, cloud_span.elapsed,
+                                       "user" if user_speech else "proactive")
+        if speaker is None and status == "success":
+            on_delta(reply)
+
+        # Wait for the actions (workflow results are noted in the reply)
+        try:
+            for task in action_tasks:
+                note = await deadline.run("action", task)
+                if note:
+                    reply = f"{reply}\n{note}"
+        except DeadlineExceeded:
+            for task in action_tasks:
+                task.cancel()
+            raise
         
         if status == "success":
+            if cache_key is not None and not action_tasks:
+                self.response_cache.put(cache_key, reply)
             return reply, "Sarthika's analysis complete."
+        elif status == "RATE_LIMITED":
+            print(f"      ⏳ Rate limited: {reply}")
+            return (reply if user_speech else "[SILENCE]"), "Rate limited"
         else:
             print(f"      ✗ Cloud Mind Error: {reply}")
+            partial = "".join(streamed).strip()
+            if speaker is not None and partial:
+                # Part of the answer has been spoken (and its actions run): end it there
+                # instead of following it with a contradictory error line
+                speaker.cancel()
+                return f"{partial} (connection dropped)", "Error after partial stream"
             return "Sir, I'm experiencing a connection issue. Please check the network.", "Error"
 
-    async def generate_response(self, user_speech=None, proactive=False):
+    def _response_cache_key(self, processed_img, active_window, user_speech, change_report=None):
+        """
+        Response cache key for this frame, the active window and the speech (None if the frame is unusable).
+        A localized change (popup, new error line) moves the whole-frame fingerprint by only a few
+        bits, so those frames neither read nor fill the cache.
+        """
+        if change_report is not None and change_report.reason == "localized change":
+            print(f"      - Localized change ({len(change_report.dirty_tiles)} tiles): response cache bypassed")
+            return None
+        try:
+            return ResponseCache.make_key(processed_img, active_window, user_speech)
+        except Exception as e:
+            print(f"      ⚠️ Response cache key failed: {e}")
+            return None
+
+    async def _try_local_intent(self, user_speech, deadline=None):
+        """Execute a high-confidence direct command locally; returns the reply ("" = say nothing), or None to use the cloud."""
+        match = self.intent_router.route(user_speech)
+        if match is None or not match.routed:
+            if match is not None:
+                print(f"   - Local intent '{match.intent}' not confident ({match.confidence:.2f}) → cloud")
+            return None
+
+        print(f"   ⚡ Local intent: {match.intent} {match.params} "
+              f"(confidence {match.confidence:.2f}, {match.latency_ms:.1f}ms) → skipping cloud")
+        if match.intent == STOP_SPEAKING:
+            # Usually cut already by the barge-in in _listen_callback; nothing to say back
+            self.speech_scheduler.barge_in()
+            return match.reply
+        with self.tracer.span("action", intent=match.intent, local=True):
+            result = await (deadline or Deadline(None)).run(
+                "action", asyncio.to_thread(self.action_executor.execute, match.intent, match.params))
+        if result is None or result.get("status") != "success":
+            print(f"      ⚠️ Local action failed: {(result or {}).get('message')}")
+            return "Sir, I couldn't do that on this system."
+        print(f"      ✓ Action result: {result.get('message', 'Done')}")
+        return match.reply
+
+    async def _run_action_after(self, previous, action_request):
+        """Run an action once the one before it has finished."""
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        return await self._run_action(action_request)
+
+    async def _run_action(self, action_request):
+        """Execute one action or workflow request; returns a note for the reply (workflows) or None."""
+        with self.tracer.span("action", intent=action_request.get("intent")):
+            return await self._perform_action(action_request)
+
+    async def _perform_action(self, action_request):
+        intent = action_request.get("intent")
+        params = action_request.get("params", {})
+        if not intent:
+            return None
+
+        # Check if it's a workflow request
+        if intent == "execute_workflow":
+            print(f"      ⚡ Starting workflow: {params.get('workflow_name', 'custom')}")
+            workflow = self._handle_workflow_request(params)
+            if workflow:
+                await self.workflow_engine.execute_workflow(workflow)
+                return f"[Workflow completed: {workflow.name}]"
+            return "[Workflow creation failed]"
+
+        print(f"      ⚡ Executing action: {intent}")
+        action_result = await asyncio.to_thread(self.action_executor.execute, intent, params)
+        
+        # Guard against None result
+        if action_result is None:
+            action_result = {"status": "error", "message": "Action returned no result"}
+        
+        print(f"      ✓ Action result: {action_result.get('message', 'Done')}")
+        
+        # Don't append action results to the spoken reply - only log them
+        # The AI's response should stand on its own without technical error messages
+        if action_result.get("status") != "success":
+            print(f"      ⚠️ Action failed (logged but not spoken): {action_result.get('message')}")
+        return None
+
+    def start_turn(self, user_speech=None, proactive=False):
+        """Open a recorded turn in the current task (None when not recording)"""
+        if self.recorder is not None:
+            return self.recorder.start_turn(user_speech, proactive)
+        return None
+
+    async def generate_response(self, user_speech=None, proactive=False, frame=None, turn=None, deadline=None):
+        """
+        Execute the Dual-Brain Pipeline as one traced (and, when recording, recorded) turn.
+
+        Args:
+            frame: A prepare_frame() result captured ahead of time (TurnPipeline); None captures now
+            turn: The recorded turn that frame belongs to (from start_turn)
+            deadline: The turn's Deadline (default: Deadline.for_turn); a turn that runs over returns None
+        """
+        deadline = deadline or Deadline.for_turn(user_speech)
+        context = TurnContext.begin()
+        with self.tracer.span("turn", mode="user" if user_speech else "proactive") as span:
+            if turn is None:
+                self.start_turn(user_speech, proactive)
+            else:
+                self.recorder.resume_turn(turn)
+            try:
+                reply = await self._generate_response(user_speech, proactive, frame, deadline)
+            except DeadlineExceeded as e:
+                self._deadline_missed(e, user_speech)
+                span.set(deadline=e.stage)
+                reply = None
+            finally:
+                context.close()
+            span.set(replied=bool(reply))
+        if self.recorder is not None:
+            self.recorder.record_reply(reply, span.elapsed)
+        print(f"⏱️ Turn took {span.elapsed * 1000:.0f}ms")
+        return reply
+
+    def _deadline_missed(self, error, user_speech=None):
+        """Report a turn abandoned because its answer would have been stale"""
+        print(f"⌛ Turn abandoned ({'user' if user_speech else 'proactive'}): {error}")
+        self.tracer.deadline_missed(error.stage, error.overrun)
+
+    async def prepare_frame(self, deadline=None):
+        """
+        Capture and preprocess the screen, or reuse the last frame if it is recent enough.
+        Raises DeadlineExceeded if `deadline` runs out meanwhile.
+
+        Returns:
+            Dict with 'processed' (PIL image), 'source' (full-screen CapturedFrame for change
+            detection, also when the processed image is reused; None if the grab failed),
+            'note' (layout hint for the prompt) and 'encoded' (cached EncodedFrame or None)
+        """
+        now_ts = time.time()
+        if (self._last_encoded is not None 
+            and self._last_processed_image is not None 
+            and (now_ts - self._last_img_time) < self.capture_min_interval):
+            print("      - Using cached image")
+            print(f"      ✓ Image ready ({self._last_encoded.payload_bytes} bytes)")
+            return {'processed': self._last_processed_image, 'source': self._last_source_frame,
+                    'note': self._last_image_note, 'encoded': self._last_encoded}
+
+        deadline = deadline or Deadline(None)
+        with self.tracer.span("capture"):
+            vision_data = await deadline.run("capture", self.capture_vision_safe())
+        
+        print("      - Processing image...")
+        with self.tracer.span("preprocess"):
+            processed_img = await deadline.run("preprocess",
+                                               asyncio.to_thread(self._process_vision_data, vision_data))
+        self._last_image_note = self._describe_image_layout(vision_data)
+        self._last_processed_image = processed_img
+        self._last_source_frame = vision_data.get('frame')
+        self._last_encoded = None
+        self._last_img_time = now_ts
+        return {'processed': processed_img, 'source': self._last_source_frame,
+                'note': self._last_image_note, 'encoded': None}
+
+    async def _generate_response(self, user_speech=None, proactive=False, frame=None, deadline=None):
         """Execute the Dual-Brain Pipeline with extensive logging"""
+        speaker = None
+        # Speech priority of this turn's reply (raised to PRIORITY_TRIGGER by a screen trigger)
+        self.last_reply_priority = PRIORITY_USER if user_speech else PRIORITY_PROACTIVE
         try:
             print(f"\n{'='*60}")
             print(f"🎯 STARTING RESPONSE GENERATION")
@@ -785,35 +1376,72 @@ class InteractiveGamingPartner:
                 print(f"   Mode: Proactive observation")
             print(f"{'='*60}")
             
-            # 1. Capture or reuse recent image (CPU-optimized)
-            now_ts = time.time()
-            if (self._last_img_b64 is not None 
-                and self._last_processed_image is not None 
-                and (now_ts - self._last_img_time) < self.capture_min_interval):
-                processed_img = self._last_processed_image
-                img_b64 = self._last_img_b64
-                print("      - Using cached image")
-                print(f"      ✓ Image ready ({len(img_b64)} bytes)")
-            else:
-                vision_data = await self.capture_vision_safe()
-                combined_img = self.prepare_multimodal_input(vision_data)
-                
-                print("      - Processing image...")
-                processed_img = self.image_processor.preprocess_for_vision_model(combined_img)
-                img_b64 = self.image_processor.to_base64(processed_img)
-                self._last_processed_image = processed_img
-                self._last_img_b64 = img_b64
-                self._last_img_time = now_ts
-                print(f"      ✓ Image ready ({len(img_b64)} bytes)")
+            # 0. Direct commands ("open calculator", "volume up") are handled locally
+            if user_speech and self.intent_router is not None:
+                local_reply = await self._try_local_intent(user_speech, deadline)
+                if local_reply is not None:
+                    print(f"\n✅ SUCCESS: Handled locally")
+                    print(f"{'='*60}\n")
+                    if local_reply:
+                        self.conversation_history.append({"role": "user", "content": user_speech})
+                        self.conversation_history.append({"role": "assistant", "content": local_reply})
+                        self.conversation_history = self.conversation_history[-10:]
+                    return local_reply
+
+            # Context lookups run on worker threads while the screen is captured and checked
+            self._context_lookups(user_speech)
+
+            # 1. Capture or reuse recent image (CPU-optimized; the pipeline captures ahead of time)
+            if frame is None:
+                frame = await self.prepare_frame(deadline)
+            processed_img = frame['processed']
+            change_source = frame['source']
+            encoded = frame['encoded']
             
             # 2. Get Response (Directly via Groq Vision if enabled)
             reply, thought = None, None
             visual_facts = "[Full Multimodal Analysis]"
 
-            # Proactive skip if no meaningful screen change
+            # Proactive skip if no meaningful screen change (checked before encoding),
+            # then let local OCR + trigger patterns answer or silence it without the cloud
+            local_trigger = False
+            change_report = None
             if (self.use_cloud_mind and not user_speech):
-                if self._should_skip_proactive(processed_img):
+                # Always the full captured frame: the processed image is resized (or an ROI
+                # crop), and tile references from different sizes report spurious changes
+                screen_source = change_source
+                if self._should_skip_proactive(screen_source):
                     reply, thought = "[SILENCE]", "Skipped due to low change"
+                else:
+                    change_report = self.last_change_report
+                    with self.tracer.span("ocr"):
+                        reply, thought = await deadline.run("ocr", self._screen_text_gate(screen_source))
+                    local_trigger = reply is not None and reply != "[SILENCE]"
+                    if local_trigger or self.last_triggers:
+                        self.last_reply_priority = PRIORITY_TRIGGER
+
+            # Same screen, window and question as a recent cloud call: reuse its reply
+            cache_key = None
+            if reply is None and self.use_cloud_mind and self.response_cache is not None:
+                active_window = await TurnContext.current().get("window", self._get_active_window_title)
+                cache_key = await asyncio.to_thread(self._response_cache_key, processed_img, active_window,
+                                                    user_speech, change_report)
+                if cache_key is not None:
+                    cached = self.response_cache.get(cache_key)
+                    if cached is not None:
+                        reply, thought = cached, "Response cache hit"
+
+            if reply is None and encoded is None:
+                with self.tracer.span("encode") as span:
+                    encoded = await deadline.run("encode", self.frame_encoder.submit(
+                        self.image_processor.encode_for_budget, processed_img, self.frame_encoder.encode
+                    ))
+                    span.set(bytes=encoded.payload_bytes, format=encoded.format)
+                if self._last_processed_image is processed_img:
+                    # A newer frame may have been captured meanwhile; only cache the pair that matches
+                    self._last_encoded = encoded
+                print(f"      ✓ Image ready ({encoded.payload_bytes} bytes, {encoded.format} q{encoded.quality}, "
+                      f"{encoded.width}x{encoded.height}, encoded in {encoded.encode_ms:.1f}ms)")
 
             if reply is None:
                 if self.use_cloud_mind:
@@ -825,19 +1453,32 @@ class InteractiveGamingPartner:
                             "USER_STATE: silent\n"
                             "RULE: Output [SILENCE] unless there is something clearly valuable or urgent."
                         )
-                    reply, thought = await self._get_cloud_strategic_response(mode_context, user_speech, img_b64)
+                    if frame['note']:
+                        mode_context = f"{mode_context}\n{frame['note']}"
+                    if not user_speech and self.last_ocr_result is not None and self.last_ocr_result.changed_text:
+                        mode_context = f"{mode_context}\nSCREEN_TEXT (changed, OCR): {self.last_ocr_result.changed_text[:300]}"
+                    if not user_speech and self.last_triggers:
+                        mode_context = f"{mode_context}\nTRIGGER: {self.last_triggers[0]['message']}"
+                    # Replies to the user start playing at the first sentence; proactive
+                    # replies still pass the speak/silence filter on the full text first
+                    if user_speech and self.stream_speech:
+                        speaker = self.speech_scheduler.stream(PRIORITY_USER)
+                    reply, thought = await self._get_cloud_strategic_response(mode_context, user_speech, encoded, speaker,
+                                                                             cache_key, deadline)
                     visual_facts = "[Full Multimodal Analysis]"
                 else:
                     # Fallback to local vision + local mind (if configured)
-                    visual_facts = await self._get_visual_description(img_b64)
-                    reply, thought = await self._get_strategic_response(visual_facts, user_speech)
+                    visual_facts = await self._get_visual_description(encoded.b64.decode('ascii'), deadline)
+                    deadline.check("vision_local")
+                    reply, thought = await self._get_strategic_response(visual_facts, user_speech, deadline)
+                    deadline.check("llm_local")
 
             normalized_reply = reply.strip() if isinstance(reply, str) else reply
 
             if isinstance(normalized_reply, str) and "[SILENCE]" in normalized_reply and normalized_reply != "[SILENCE]":
                 normalized_reply = normalized_reply.replace("[SILENCE]", "").strip()
 
-            if proactive and not user_speech and isinstance(normalized_reply, str):
+            if proactive and not user_speech and not local_trigger and isinstance(normalized_reply, str):
                 if not self._should_speak_proactively(normalized_reply):
                     normalized_reply = "[SILENCE]"
 
@@ -851,6 +1492,14 @@ class InteractiveGamingPartner:
                 else:
                     print(f"\n✅ SUCCESS: Response generated!")
 
+                if speaker is not None:
+                    # Already playing; speak() waits for this instead of synthesizing again.
+                    # A call that failed before its first token streamed nothing: speak() says the reply
+                    speaker.close()
+                    self._speech_task = asyncio.create_task(speaker.finish())
+                    self._streamed_reply = cleaned_reply if speaker.chunker.text else None
+                    speaker = None
+
                 print(f"{'='*60}\n")
 
                 self.personal_memory['interactions_count'] = self.personal_memory.get('interactions_count', 0) + 1
@@ -870,8 +1519,8 @@ class InteractiveGamingPartner:
 
                 # Store in SmartMemory before returning
                 if self.smart_memory and user_speech and cleaned_reply:
-                    # Get active window for memory context
-                    active_window = self._get_active_window_title()
+                    # Active window for memory context (looked up once per turn)
+                    active_window = await TurnContext.current().get("window", self._get_active_window_title)
                     self.smart_memory.store_interaction(
                         user_input=user_speech,
                         ai_response=cleaned_reply,
@@ -885,77 +1534,232 @@ class InteractiveGamingPartner:
                 print(f"{'='*60}\n")
                 return None
                 
+        except DeadlineExceeded:
+            if speaker is not None:
+                speaker.cancel()
+                speaker = None
+            raise
         except Exception as e:
             print(f"\n❌ PIPELINE ERROR: {e}")
             import traceback
             traceback.print_exc()
             print(f"{'='*60}\n")
             return None
+        finally:
+            if speaker is not None:
+                self._speech_task = asyncio.create_task(speaker.finish())
+                self._streamed_reply = None
+
+    def take_streamed_speech(self):
+        """Hand over the playback of a reply streamed by the last turn: (task, text) or (None, None)"""
+        streamed = (self._speech_task, self._streamed_reply)
+        self._speech_task, self._streamed_reply = None, None
+        return streamed
 
-    async def speak(self, text):
-        """Convert text to speech and play"""
-        if not text: 
+    async def speak(self, text, streamed=None, deadline=None, priority=PRIORITY_USER):
+        """
+        Convert text to speech and play it through the speech scheduler, after
+        lines of higher `priority` (next sentence is synthesized while one plays).
+        Raises DeadlineExceeded if `deadline` runs out before the first sentence plays.
+        """
+        stream_task, streamed_reply = streamed or self.take_streamed_speech()
+        if stream_task is not None:
+            # The reply was streamed into TTS while it was generated: wait for that playback
+            await stream_task
+            if text == streamed_reply:
+                return
+        if not text:
             return
-            
+
+        if deadline is not None:
+            deadline.check("tts")
+
         print(f"\n💬 SPEAKING: \"{text}\"\n")
-        
-        self.is_speaking = True
-        try:
-            temp_dir = self.base_dir / "src" / "core" / "tmp"
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            temp_file = temp_dir / f"partha_{int(time.time() * 1000)}.mp3"
-            
-            print("   - Generating speech...")
-            print("   - Generating speech...")
-            # Sweet Tone Tuning
-            communicate = edge_tts.Communicate(
-                text, 
-                self.tts_voice, 
-                rate=self.tts_rate,
-                pitch=self.tts_pitch
-            )
-            await communicate.save(str(temp_file))
-            print("   ✓ Speech generated")
-            
-            # Play audio
-            print("   - Playing audio...")
-            if PYGAME_AVAILABLE:
+        utterance = self.speech_scheduler.say(text, priority, deadline)
+        if deadline is not None:
+            try:
+                await deadline.run("tts", utterance.started.wait())
+            except DeadlineExceeded:
+                self.speech_scheduler.cancel(utterance)
+                await utterance.wait()
+                raise
+            if utterance.status == "expired":
+                deadline.check("tts")
+            deadline.meet()
+        status = await utterance.wait()
+        if status in ("spoken", "interrupted"):
+            print(f"   ✓ Spoke {len(utterance.speaker.spoken)} sentence(s)" + (" (interrupted)" if status == "interrupted" else ""))
+        else:
+            print(f"   - Not spoken ({status})")
+
+    async def _synthesize_speech(self, text):
+        """
+        edge-tts synthesis straight into memory (MP3 bytes, no temp file), at most
+        TTS_TIMEOUT seconds. Sentences in the TTS cache skip the round-trip.
+        """
+        voice, rate, pitch = self._voice_settings()
+        key = None
+        if self.tts_cache is not None and self.tts_cache.cacheable(text):
+            key = self.tts_cache.key(text, voice, rate, pitch)
+            with self.tracer.span("tts_cache", chars=len(text)) as span:
+                audio = self.tts_cache.get_hot(key)
+                if audio is None and key in self.tts_cache:
+                    audio = await asyncio.to_thread(self.tts_cache.get, key)
+                span.set(hit=audio is not None)
+            if audio:
+                return audio
+        with self.tracer.span("tts_synth", chars=len(text)):
+            audio = await asyncio.wait_for(self._edge_tts(text, voice, rate, pitch), self.tts_timeout)
+        if key is not None and audio:
+            await asyncio.to_thread(self.tts_cache.put, key, audio)
+        return audio
+
+    def _voice_settings(self, mood=None):
+        """(voice, rate, pitch) for speech: TTS_RATE/TTS_PITCH, or the mood's tone when TTS_MOOD_VOICE is on"""
+        if self.tts_mood_voice:
+            if mood is None:
+                mood = getattr(getattr(self, 'emotional_intel', None), 'state', None)
+                mood = getattr(mood, 'mood', None)
+            tone = get_voice_settings_for_mood(mood) if mood is not None else {}
+            return self.tts_voice, tone.get("rate", self.tts_rate), tone.get("pitch", self.tts_pitch)
+        return self.tts_voice, self.tts_rate, self.tts_pitch
+
+    def _canned_phrases(self):
+        """Sentences Friday says word for word: intent confirmations and trigger alerts"""
+        phrases = ["Done, Sir."]
+        for reply in REPLIES.values():
+            phrases.extend(reply.values() if isinstance(reply, dict) else [reply])
+        triggers = getattr(getattr(self, 'proactivity_engine', None), 'triggers', {}) or {}
+        phrases.extend(trigger.message_template for trigger in triggers.values())
+        sentences = []
+        for phrase in phrases:
+            if "{" in phrase:
+                continue   # filled in per request ("Opening {app}, Sir.")
+            # Split the way the speaker will, so the cached sentences are the ones requested
+            chunker = SentenceChunker()
+            for sentence in chunker.feed(phrase) + chunker.flush():
+                if sentence not in sentences:
+                    sentences.append(sentence)
+        return sentences
+
+    def prewarm_tts(self):
+        """Synthesize the canned phrases into the TTS cache in the background (call from the event loop)"""
+        if self.tts_cache is None or not self.tts_prewarm or self._prewarm_task is not None:
+            return None
+        self._prewarm_task = asyncio.ensure_future(self._prewarm_tts())
+        return self._prewarm_task
+
+    async def _prewarm_tts(self):
+        if self.tts_mood_voice and Mood is not None:
+            voices = list(dict.fromkeys(self._voice_settings(mood) for mood in Mood))
+        else:
+            voices = [self._voice_settings()]
+        started = time.perf_counter()
+        warmed, failed = 0, 0
+        for voice, rate, pitch in voices:
+            for sentence in self._canned_phrases():
+                if not self.tts_cache.cacheable(sentence):
+                    continue
+                key = self.tts_cache.key(sentence, voice, rate, pitch)
                 try:
-                    pygame.mixer.music.load(str(temp_file))
-                    pygame.mixer.music.play()
-                    while pygame.mixer.music.get_busy():
-                        await asyncio.sleep(0.1)
-                    print("   ✓ Audio played")
+                    # One at a time: pre-warming must not compete with a live reply for edge-tts
+                    if key in self.tts_cache:
+                        audio = await asyncio.to_thread(self.tts_cache.get, key)
+                    else:
+                        audio = await asyncio.wait_for(self._edge_tts(sentence, voice, rate, pitch), self.tts_timeout)
+                        await asyncio.to_thread(self.tts_cache.put, key, audio, True)
+                    warmed += 1
+                except asyncio.CancelledError:
+                    raise
                 except Exception as e:
-                    print(f"   ✗ Pygame failed: {e}, using system player")
-                    os.system(f"mpg123 -q '{temp_file}' 2>/dev/null &")
-                    await asyncio.sleep(3)
-            else:
-                os.system(f"mpg123 -q '{temp_file}' 2>/dev/null &")
-                await asyncio.sleep(3)
-                
-            # Cleanup
-            await asyncio.sleep(0.5)
-            if temp_file.exists():
-                try:
-                    temp_file.unlink()
-                except:
-                    pass
-                    
-        except Exception as e:
-            print(f"❌ TTS Error: {e}")
+                    failed += 1
+                    if failed == 1:
+                        print(f"   ⚠️ TTS pre-warm failed: {e}")
+        print(f"🔊 TTS cache warm: {warmed} phrase(s) in {time.perf_counter() - started:.1f}s"
+              + (f", {failed} failed" if failed else ""))
+
+    async def _edge_tts(self, text, voice=None, rate=None, pitch=None):
+        # Sweet Tone Tuning
+        communicate = edge_tts.Communicate(
+            text,
+            voice or self.tts_voice,
+            rate=rate or self.tts_rate,
+            pitch=pitch or self.tts_pitch
+        )
+        audio = bytearray()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio.extend(chunk["data"])
+        return bytes(audio)
+
+    async def _play_audio(self, audio):
+        """Play MP3 bytes and return when playback has finished"""
+        self.is_speaking = True
+        try:
+            with self.tracer.span("tts_play", bytes=len(audio)):
+                await self._play_mp3(audio)
         finally:
             self.is_speaking = False
 
+    def _stop_playback(self):
+        """Cut the sentence being played (barge-in)"""
+        if PYGAME_AVAILABLE:
+            try:
+                pygame.mixer.music.stop()
+            except Exception:
+                pass
+        player, self._player = self._player, None
+        if player is not None and player.returncode is None:
+            try:
+                player.kill()
+            except ProcessLookupError:
+                pass
+
+    async def _play_mp3(self, audio):
+        """pygame when available, otherwise mpg123 reading from stdin"""
+        if PYGAME_AVAILABLE:
+            try:
+                pygame.mixer.music.load(io.BytesIO(audio), "mp3")
+                pygame.mixer.music.play()
+                while pygame.mixer.music.get_busy():
+                    await asyncio.sleep(0.05)
+                return
+            except Exception as e:
+                print(f"   ✗ Pygame failed: {e}, using system player")
+        try:
+            player = await asyncio.create_subprocess_exec(
+                "mpg123", "-q", "-",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            self._player = player
+            try:
+                await player.communicate(audio)
+            finally:
+                if self._player is player:
+                    self._player = None
+        except FileNotFoundError:
+            print("   ✗ No audio player available (install pygame or mpg123)")
+
     def _listen_callback(self, recognizer, audio):
         """Callback for background listener"""
         try:
-            if getattr(self, 'is_speaking', False):
+            speaking = getattr(self, 'is_speaking', False) or self.speech_scheduler.busy
+            if speaking and not self.barge_in:
                 return
             print("\n👂 Heard audio, recognizing...")
             speech_text = recognizer.recognize_google(audio, language="hi-IN")
+            if self.speech_scheduler.is_echo(speech_text):
+                print(f"   - Ignoring my own voice: \"{speech_text[:40]}\"")
+                return
             print(f"🗣️  USER: {speech_text}")
-            self.speech_queue.put(speech_text)
+            if speaking and self._loop is not None:
+                # The user is talking over Friday: stop her right away
+                self._loop.call_soon_threadsafe(self.speech_scheduler.barge_in)
+            if self.recorder is not None:
+                self.recorder.record_speech(speech_text)
+            self._deliver_speech(speech_text)
         except sr.UnknownValueError:
             pass
         except sr.RequestError as e:
@@ -963,6 +1767,11 @@ class InteractiveGamingPartner:
         except Exception as e:
             print(f"⚠️  STT Error: {e}")
 
+    def proactive_due(self, kind, last_check, interval):
+        """Whether a proactive check should start: its timer ran out, or the screen changed after the minimum gap."""
+        elapsed = time.time() - last_check
+        return elapsed >= interval or (kind == "screen" and elapsed >= self.proactive_min_gap)
+
     async def run(self):
         """Main loop with debug output"""
         print("\n" + "="*60)
@@ -977,6 +1786,8 @@ class InteractiveGamingPartner:
         
         self.is_running = True
         stop_listening = None
+        self.bind_event_loop()
+        self.start_capture()
         
         # Start voice listener
         if self.mic_available and self.mic:
@@ -997,65 +1808,55 @@ class InteractiveGamingPartner:
         else:
             stop_listening = lambda wait_for_stop=False: None
 
+        self.pipeline.start()
+        self.prewarm_tts()
         try:
-            # TEST: Generate one response immediately
+            # TEST: Generate one response immediately (through the pipeline, like every proactive check)
             print("🧪 TESTING: Generating initial greeting...\n")
-            greeting = await self.generate_response(proactive=True)
-            if greeting:
-                await self.speak(greeting)
-            else:
-                print("⚠️ Initial greeting failed - check logs above!\n")
+            await self.pipeline.submit(proactive=True, greeting=True)
             
-            iteration = 0
             while self.is_running:
-                iteration += 1
-                
-                # Debug: Show we're alive
-                if iteration % 50 == 0:
-                    print(f"💓 Heartbeat {iteration} - waiting for speech or proactive trigger...")
+                # 1. Sleep until speech, a screen change or the next proactive check is due
+                next_check = self.last_observation_time + self.observation_interval
+                kind, user_speech = await self.next_event(timeout=max(0.0, next_check - time.time()))
                 
-                # 1. Check for user speech
-                try:
-                    user_speech = self.speech_queue.get(timeout=0.5)
-                    print(f"\n🎤 Got speech from queue: '{user_speech}'")
-                    
-                    response_text = await self.generate_response(user_speech=user_speech)
-                    
-                    if response_text:
-                        await self.speak(response_text)
-                    else:
-                        print("⚠️ No response generated for user speech")
-                    
+                if kind == "speech":
+                    print(f"\n🎤 Got speech: '{user_speech}'")
+                    await self.pipeline.submit(user_speech=user_speech)
                     self.last_observation_time = time.time()
-                    
-                except queue.Empty:
-                    pass
-                
-                # 2. Proactive observation
-                current_time = time.time()
-                if current_time - self.last_observation_time > self.observation_interval:
-                    print(f"\n⏰ Proactive trigger ({self.observation_interval}s elapsed)")
-                    proactive_text = await self.generate_response(proactive=True)
-                    
-                    if proactive_text:
-                        await self.speak(proactive_text)
-                    
-                    self.last_observation_time = current_time
                 
-                await asyncio.sleep(0.1)
+                # 2. Proactive observation (a busy pipeline keeps only the newest one waiting)
+                elif self.proactive_due(kind, self.last_observation_time, self.observation_interval):
+                    reason = "screen changed" if kind == "screen" else f"{self.observation_interval}s elapsed"
+                    print(f"\n⏰ Proactive trigger ({reason})")
+                    await self.pipeline.submit(proactive=True)
+                    self.last_observation_time = time.time()
                 
         except KeyboardInterrupt:
             print("\n\n⏸️  Shutdown requested")
         finally:
             self.is_running = False
+            await self.pipeline.stop()
+            await self.speech_scheduler.stop()
             
             if stop_listening:
                 stop_listening(wait_for_stop=False)
-            if self.cap and self.cap.isOpened():
-                self.cap.release()
+            self.stop_capture()
+            await self.llm_router.aclose()
+            if self.recorder is not None:
+                self.recorder.close()
             
             print("\n👋 Debug session ended")
             print(f"📊 Total interactions: {self.personal_memory.get('interactions_count', 0)}")
+            if self.response_cache is not None:
+                stats = self.response_cache.get_stats()
+                print(f"📊 Response cache: {stats['hits']} hits / {stats['hits'] + stats['misses']} lookups")
+            for name, backend in self.llm_router.get_stats()["backends"].items():
+                if backend["calls"]:
+                    print(f"📊 {name}: {backend['calls']} calls, p50 {backend['p50'] or 0:.2f}s, "
+                          f"p95 {backend['p95'] or 0:.2f}s, errors {backend['error_rate']:.0%}, circuit {backend['state']}")
+            self.tracer.report()
+            self.tracer.close()
 
 def main():
     """Entry point"""
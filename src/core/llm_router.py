@@ -0,0 +1,245 @@
+"""
+Friday's LLM Router
+Sends every think call to the best available backend (Groq in the cloud,
+Ollama on this machine) instead of a hard-coded one:
+- per-backend rolling latency (p50/p95) and error rate
+- a circuit breaker per backend: after repeated failures or timeouts the
+  backend is skipped for a cool-down, then one probe call decides whether
+  it is healthy again
+- automatic failover to the next backend in the preference order
+- separate preference orders for user and proactive traffic, so low
+  priority observations can go to the cheaper backend
+- optional per-backend token buckets: a backend without a free token (or
+  paused by a 429 Retry-After) is passed over instead of waited for; only
+  user requests wait, and only when no other backend is left
+
+Backends are CloudMindConnector-like objects (think_async returning
+(reply, status, action_request)).
+"""
+
+import os
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from src.core.request_scheduler import TokenBucket
+
+
+@dataclass
+class CallRecord:
+    timestamp: float
+    latency: float
+    ok: bool
+
+
+class CircuitBreaker:
+    """
+    Per-backend health: rolling latency/error window plus an
+    open/half-open/closed circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 30.0, window: int = 50):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds an open circuit waits before letting one probe through
+            window: Calls kept for latency percentiles and error rate
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.calls: deque = deque(maxlen=window)
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now (an open circuit becomes half-open after the cool-down)."""
+        if self.state == self.OPEN and time.time() - self.opened_at >= self.cooldown:
+            self.state = self.HALF_OPEN
+        return self.state != self.OPEN
+
+    def record(self, latency: float, ok: bool):
+        self.calls.append(CallRecord(time.time(), latency, ok))
+        if ok:
+            self.consecutive_failures = 0
+            self.state = self.CLOSED
+            return
+        self.consecutive_failures += 1
+        # A failed probe re-opens immediately; otherwise wait for repeated failures
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.time()
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile (0-100) of successful calls in the window."""
+        latencies = sorted(call.latency for call in self.calls if call.ok)
+        if not latencies:
+            return None
+        if len(latencies) == 1:
+            return latencies[0]
+        return statistics.quantiles(latencies, n=100, method='inclusive')[min(98, max(0, int(q) - 1))]
+
+    @property
+    def error_rate(self) -> float:
+        if not self.calls:
+            return 0.0
+        return sum(1 for call in self.calls if not call.ok) / len(self.calls)
+
+
+class LLMRouter:
+    """
+    Friday's backend selection and failover for think calls.
+    """
+
+    def __init__(self, backends: Dict[str, object], order: Optional[List[str]] = None,
+                 proactive_order: Optional[List[str]] = None, slow_p95: Optional[float] = None,
+                 failure_threshold: Optional[int] = None, cooldown: Optional[float] = None,
+                 limits: Optional[Dict[str, TokenBucket]] = None, max_rate_wait: Optional[float] = None):
+        """
+        Initialize LLMRouter.
+
+        Args:
+            backends: name -> connector with think_async()
+            order: Preference for user requests (LLM_BACKENDS, default: order of `backends`)
+            proactive_order: Preference for proactive observations (LLM_PROACTIVE_BACKENDS, default: `order`)
+            slow_p95: Seconds; a backend whose p95 is above this is tried after healthy faster ones (LLM_SLOW_P95, default 6)
+            failure_threshold: Consecutive failures/timeouts that open a circuit (LLM_CIRCUIT_FAILURES, default 3)
+            cooldown: Seconds before an open circuit is probed again (LLM_CIRCUIT_COOLDOWN, default 30)
+            limits: name -> TokenBucket for rate-limited backends
+            max_rate_wait: Seconds a user request may wait for a token on the last backend (LLM_MAX_RATE_WAIT, default 5)
+        """
+        self.backends = dict(backends)
+        self.order = self._known(order or _env_list('LLM_BACKENDS') or list(self.backends))
+        self.proactive_order = self._known(proactive_order or _env_list('LLM_PROACTIVE_BACKENDS') or self.order)
+        self.slow_p95 = float(slow_p95 or os.getenv('LLM_SLOW_P95', '6') or 6)
+        failure_threshold = int(failure_threshold or os.getenv('LLM_CIRCUIT_FAILURES', '3') or 3)
+        cooldown = float(cooldown or os.getenv('LLM_CIRCUIT_COOLDOWN', '30') or 30)
+        self.breakers = {name: CircuitBreaker(failure_threshold, cooldown) for name in self.backends}
+        self.limits = dict(limits or {})
+        self.max_rate_wait = float(max_rate_wait or os.getenv('LLM_MAX_RATE_WAIT', '5') or 5)
+        self.last_backend: Optional[str] = None
+
+        # Stats
+        self.failovers = 0
+        self.all_failed = 0
+        self.rate_limited = 0
+
+    def candidates(self, priority: str = "user") -> List[str]:
+        """Backends to try, in order: allowed circuits first, slow ones after fast ones."""
+        order = self.proactive_order if priority == "proactive" else self.order
+        allowed = [name for name in order if self.breakers[name].allow()]
+
+        def slow(name):
+            p95 = self.breakers[name].percentile(95)
+            return p95 is not None and p95 > self.slow_p95
+
+        return sorted(allowed, key=lambda name: (slow(name), order.index(name)))
+
+    async def think(self, priority: str = "user", on_delta: Optional[Callable[[str], None]] = None, **kwargs):
+        """
+        think_async() on the best backend, failing over to the next one on errors.
+
+        Args:
+            priority: "user" or "proactive" (picks the preference order)
+            on_delta: Streaming callback; once a backend has streamed text there is no failover
+            **kwargs: Passed to the backend's think_async
+
+        Returns:
+            (reply, status, action_request) from the backend that answered, or the last error
+        """
+        result = ("Sir, no language model backend is available right now.", "ERROR", None)
+        streamed = False
+
+        def forward(delta):
+            nonlocal streamed
+            streamed = True
+            on_delta(delta)
+
+        candidates = self.candidates(priority)
+        if not candidates:
+            print("   ⚠️ All LLM backends are cooling down after failures")
+        for attempt, name in enumerate(candidates):
+            if attempt:
+                self.failovers += 1
+                print(f"   ↪️ Failing over to {name}")
+            bucket = self.limits.get(name)
+            if bucket is not None:
+                last_option = attempt == len(candidates) - 1
+                max_wait = self.max_rate_wait if (last_option and priority == "user") else 0.0
+                if not await bucket.take(max_wait):
+                    print(f"   ⏳ {name} rate limit: next request allowed in {bucket.wait_time():.1f}s")
+                    self.rate_limited += 1
+                    result = ("Sir, I'm being rate limited by the cloud. Give me a moment.", "RATE_LIMITED", None)
+                    continue
+            started = time.time()
+            try:
+                result = await self.backends[name].think_async(
+                    on_delta=forward if on_delta is not None else None, **kwargs
+                )
+            except Exception as e:
+                result = (f"Sir, I've encountered an error: {e}", "ERROR", None)
+            if result[1] == "RATE_LIMITED":
+                # The backend is fine, just busy: obey Retry-After, don't count a failure
+                self.rate_limited += 1
+                if bucket is not None:
+                    bucket.pause(getattr(self.backends[name], 'rate_limited_until', 0.0) - time.time())
+                continue
+            ok = result[1] == "success"
+            breaker = self.breakers[name]
+            was_open = breaker.state
+            breaker.record(time.time() - started, ok)
+            if breaker.state == CircuitBreaker.OPEN and was_open != CircuitBreaker.OPEN:
+                print(f"   🔌 Circuit opened for {name} ({breaker.consecutive_failures} failures, "
+                      f"retry in {breaker.cooldown:g}s)")
+            if ok:
+                self.last_backend = name
+                return result
+            if streamed:
+                break
+        self.all_failed += 1
+        return result
+
+    async def aclose(self):
+        """Close every backend's connection pools."""
+        for backend in self.backends.values():
+            if hasattr(backend, 'aclose'):
+                await backend.aclose()
+
+    def get_stats(self) -> Dict:
+        """Per-backend latency, error rate and circuit state."""
+        return {
+            "backends": {
+                name: {
+                    "state": breaker.state,
+                    "calls": len(breaker.calls),
+                    "p50": breaker.percentile(50),
+                    "p95": breaker.percentile(95),
+                    "error_rate": breaker.error_rate,
+                    "times_opened": breaker.times_opened,
+                }
+                for name, breaker in self.breakers.items()
+            },
+            "last_backend": self.last_backend,
+            "failovers": self.failovers,
+            "all_failed": self.all_failed,
+            "rate_limited": self.rate_limited,
+        }
+
+    def _known(self, names: List[str]) -> List[str]:
+        unknown = [name for name in names if name not in self.backends]
+        if unknown:
+            print(f"⚠️ Unknown LLM backend(s) ignored: {', '.join(unknown)}")
+        return [name for name in names if name in self.backends]
+
+
+def _env_list(name: str) -> List[str]:
+    return [item.strip().lower() for item in (os.getenv(name, '') or '').split(',') if item.strip()]
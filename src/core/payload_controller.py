@@ -0,0 +1,230 @@
+"""
+Friday's Payload Controller
+Picks resolution, quality and codec for every vision frame so the request
+stays inside a byte budget. The budget follows the measured round-trip
+latency of recent cloud calls: on a slow uplink the upload dominates, so
+the controller fits latency against payload size and sizes frames to
+reach VISION_TARGET_LATENCY.
+"""
+
+import os
+import statistics
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+from PIL import Image
+
+from src.core.frame_encoder import EncodedFrame, encode_image
+
+
+# Encoding profile per content class: starting quality, longest side and
+# which knob gives way first when the frame is over budget
+CONTENT_PROFILES = {
+    "text":    {"quality": 75, "max_side": None, "shrink_first": "quality"},
+    "flat_ui": {"quality": 70, "max_side": 640,  "shrink_first": "quality"},
+    "dark":    {"quality": 60, "max_side": 0,    "shrink_first": "resolution"},
+    "scene":   {"quality": 70, "max_side": 0,    "shrink_first": "resolution"},
+}
+
+MIN_SIDE = 224
+QUALITY_STEP = 10
+RESIZE_STEP = 0.8
+MAX_ATTEMPTS = 6
+
+
+@dataclass
+class ContentStats:
+    """Cheap statistics used to classify a frame."""
+    kind: str
+    mean_luma: float
+    edge_density: float
+    palette_coverage: float
+
+
+@dataclass
+class PayloadPlan:
+    """What the controller chose for one frame."""
+    content: ContentStats
+    budget_bytes: int
+    encoded: EncodedFrame
+    attempts: int
+
+    def summary(self) -> str:
+        """One-line description for logs."""
+        e = self.encoded
+        return (f"{self.content.kind} -> {e.format} q{e.quality} {e.width}x{e.height}, "
+                f"{e.payload_bytes}/{self.budget_bytes} bytes in {self.attempts} tries")
+
+
+def classify_content(img, text_edges: float = 0.02, ui_coverage: float = 0.6,
+                     flat_coverage: float = 0.9, dark_luma: float = 0.22) -> ContentStats:
+    """
+    Classify a frame as text, flat_ui, dark or scene.
+
+    UI is recognised by its limited palette (the 64 most common colours
+    cover most pixels); UI with many sharp edges is treated as text.
+
+    Args:
+        img: PIL RGB image at processing size (edges are measured at this size)
+        text_edges: Fraction of strong horizontal edges that marks text-heavy UI
+        ui_coverage: Palette coverage above which a frame counts as UI
+        flat_coverage: Palette coverage above which edge-poor UI counts as flat
+        dark_luma: Mean luminance (0-1) below which a non-UI frame counts as dark
+
+    Returns:
+        ContentStats
+    """
+    gray = np.asarray(img.convert('L'), dtype=np.int16)
+    mean_luma = float(gray.mean()) / 255.0
+    edge_density = float((np.abs(np.diff(gray, axis=1)) > 24).mean()) if gray.shape[1] > 1 else 0.0
+
+    # Colour statistics on a nearest-neighbour sample keep getcolors cheap
+    sample = img if img.width <= 384 else img.resize((384, max(1, int(img.height * 384 / img.width))),
+                                                     Image.Resampling.NEAREST)
+    pixels = sample.width * sample.height
+    colors = sample.getcolors(maxcolors=pixels) or []
+    counts = sorted((count for count, _ in colors), reverse=True)
+    palette_coverage = sum(counts[:64]) / max(1, pixels)
+
+    if palette_coverage >= ui_coverage and edge_density >= text_edges:
+        kind = "text"
+    elif palette_coverage >= flat_coverage:
+        kind = "flat_ui"
+    elif mean_luma <= dark_luma:
+        kind = "dark"
+    else:
+        kind = "scene"
+    return ContentStats(kind, mean_luma, edge_density, palette_coverage)
+
+
+class PayloadController:
+    """
+    Friday's adaptive payload controller.
+    Classifies the frame, then encodes it with the best settings that fit
+    the current byte budget.
+    """
+
+    def __init__(self, base_width: int = 336, base_height: int = 336,
+                 latency_history: Optional[Iterable[Dict]] = None):
+        """
+        Initialize PayloadController.
+
+        Args:
+            base_width: Frame width for ordinary scenes (CAPTURE_WIDTH)
+            base_height: Frame height for ordinary scenes (CAPTURE_HEIGHT)
+            latency_history: Shared history of cloud calls ({'latency', 'payload_bytes'} dicts)
+        """
+        self.base_width = base_width
+        self.base_height = base_height
+        self.latency_history = latency_history if latency_history is not None else []
+
+        self.target_bytes = int(os.getenv('VISION_TARGET_BYTES', '40000') or 40000)
+        self.target_latency = float(os.getenv('VISION_TARGET_LATENCY', '1.5') or 1.5)
+        self.max_side = int(os.getenv('VISION_MAX_SIDE', '768') or 768)
+        self.min_quality = int(os.getenv('VISION_MIN_QUALITY', '35') or 35)
+        self.allow_webp = str(os.getenv('VISION_WEBP', '0')).lower() in ('1', 'true', 'yes', 'on')
+        self.allow_png = str(os.getenv('VISION_PNG_PALETTE', '1')).lower() in ('1', 'true', 'yes', 'on')
+        self.optimize = str(os.getenv('CAPTURE_JPEG_OPTIMIZE', '1')).lower() in ('1', 'true', 'yes', 'on')
+
+        self.last_plan: Optional[PayloadPlan] = None
+
+    def current_budget(self) -> int:
+        """
+        Byte budget for the next frame.
+
+        With enough samples, latency is fitted as intercept + bytes * slope
+        and the budget is the payload that lands on the target latency.
+        Otherwise the base budget is scaled by target / median latency.
+        """
+        samples = [s for s in list(self.latency_history)[-20:] if s.get('payload_bytes')]
+        if not samples:
+            return self.target_bytes
+
+        low, high = self.target_bytes // 4, self.target_bytes * 2
+        sizes = np.array([s['payload_bytes'] for s in samples], dtype=np.float64)
+        latencies = np.array([s['latency'] for s in samples], dtype=np.float64)
+
+        if len(samples) >= 4 and sizes.max() - sizes.min() > 0.2 * sizes.mean():
+            slope, intercept = np.polyfit(sizes, latencies, 1)
+            if slope > 0:
+                return int(np.clip((self.target_latency - intercept) / slope, low, high))
+
+        median = statistics.median(latencies)
+        if median <= 0:
+            return self.target_bytes
+        return int(np.clip(self.target_bytes * self.target_latency / median, low, self.target_bytes))
+
+    def encode(self, img, encode: Optional[Callable[..., EncodedFrame]] = None) -> PayloadPlan:
+        """
+        Encode a frame within the current budget.
+
+        Args:
+            img: Processed PIL image (up to VISION_MAX_SIDE)
+            encode: Encoding callable (FrameEncoder.encode to record stats), defaults to encode_image
+
+        Returns:
+            PayloadPlan with the chosen EncodedFrame
+        """
+        encode = encode or (lambda frame, fmt, quality: encode_image(frame, fmt, quality, self.optimize))
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        content = classify_content(img)
+        profile = CONTENT_PROFILES[content.kind]
+        budget = self.current_budget()
+
+        frame = self._resize_for(img, profile["max_side"])
+        fmt = "WEBP" if self.allow_webp else "JPEG"
+        quality = profile["quality"]
+
+        # Limited-palette UI often compresses far better as a palette PNG
+        best = None
+        attempts = 0
+        if self.allow_png and content.palette_coverage >= 0.9:
+            best = encode(frame.quantize(colors=64, method=Image.Quantize.MEDIANCUT), "PNG", 100)
+            attempts += 1
+
+        while attempts < MAX_ATTEMPTS:
+            candidate = encode(frame, fmt, quality)
+            attempts += 1
+            if best is None or candidate.payload_bytes < best.payload_bytes:
+                best = candidate
+            if best.payload_bytes <= budget:
+                break
+
+            can_drop_quality = quality - QUALITY_STEP >= self.min_quality
+            can_shrink = max(frame.size) * RESIZE_STEP >= MIN_SIDE
+            if not (can_drop_quality or can_shrink):
+                break
+            if can_drop_quality and (profile["shrink_first"] == "quality" or not can_shrink):
+                quality -= QUALITY_STEP
+            else:
+                frame = frame.resize((max(1, int(frame.width * RESIZE_STEP)), max(1, int(frame.height * RESIZE_STEP))),
+                                     Image.Resampling.BILINEAR)
+
+        self.last_plan = PayloadPlan(content=content, budget_bytes=budget, encoded=best, attempts=attempts)
+        return self.last_plan
+
+    def get_stats(self) -> Dict:
+        """Get controller statistics."""
+        return {
+            "budget_bytes": self.current_budget(),
+            "target_latency": self.target_latency,
+            "samples": len(self.latency_history),
+            "last_plan": self.last_plan.summary() if self.last_plan else None,
+        }
+
+    def _resize_for(self, img, max_side: Optional[int]):
+        """Fit the image to the profile's size (None = VISION_MAX_SIDE, 0 = base capture size)."""
+        if max_side is None:
+            limit_w = limit_h = self.max_side
+        elif max_side == 0:
+            limit_w, limit_h = self.base_width, self.base_height
+        else:
+            limit_w = limit_h = min(max_side, self.max_side)
+
+        scale = min(limit_w / img.width, limit_h / img.height, 1.0)
+        if scale >= 1.0:
+            return img
+        return img.resize((max(1, int(img.width * scale)), max(1, int(img.height * scale))), Image.Resampling.BILINEAR)
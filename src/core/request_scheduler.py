@@ -0,0 +1,200 @@
+"""
+Friday's Request Scheduler
+Orders cloud requests by priority so the user's turn never waits behind a
+background screen check:
+- priority classes: user speech > trigger follow-ups > proactive observations
+- a concurrency limit; waiting requests are admitted highest priority first
+- when the user speaks, queued and in-flight proactive requests are cancelled
+- TokenBucket: client-side requests-per-minute limit that also honours the
+  API's Retry-After (used per backend by the LLM router)
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+PRIORITY_USER = 0
+PRIORITY_TRIGGER = 1
+PRIORITY_PROACTIVE = 2
+
+PRIORITY_NAMES = {PRIORITY_USER: "user", PRIORITY_TRIGGER: "trigger", PRIORITY_PROACTIVE: "proactive"}
+
+
+class RequestPreempted(Exception):
+    """A lower-priority request was cancelled to make room for the user."""
+
+
+class TokenBucket:
+    """
+    Client-side rate limit: `rate_per_min` requests per minute with bursts of
+    up to `burst`. pause() blocks it completely (server Retry-After).
+    """
+
+    def __init__(self, rate_per_min: float, burst: int):
+        self.rate = rate_per_min / 60.0
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+        # Stats
+        self.taken = 0
+        self.pauses = 0
+
+    def wait_time(self) -> float:
+        """Seconds until a request may be sent (0 = now)."""
+        now = time.monotonic()
+        self._refill(now)
+        pause = max(0.0, self.paused_until - now)
+        if self.tokens >= 1:
+            return pause
+        return max(pause, (1 - self.tokens) / self.rate if self.rate > 0 else float('inf'))
+
+    def try_take(self) -> bool:
+        """Take a token if one is available right now."""
+        if self.wait_time() > 0:
+            return False
+        self.tokens -= 1
+        self.taken += 1
+        return True
+
+    async def take(self, max_wait: float) -> bool:
+        """Wait up to `max_wait` seconds for a token."""
+        wait = self.wait_time()
+        if wait > max_wait:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return self.try_take()
+
+    def pause(self, seconds: float):
+        """Send nothing for `seconds` (e.g. HTTP 429 Retry-After)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + max(0.0, seconds))
+        self.tokens = min(self.tokens, 0.0)
+        self.pauses += 1
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class RequestScheduler:
+    """
+    Friday's priority admission for cloud requests.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None):
+        """
+        Initialize RequestScheduler.
+
+        Args:
+            max_concurrent: Requests in flight at once (LLM_MAX_CONCURRENT, default 2)
+        """
+        self.max_concurrent = int(max_concurrent or os.getenv('LLM_MAX_CONCURRENT', '2') or 2)
+        self._waiting: List[list] = []          # heap of [priority, seq, future]
+        self._running: Dict[asyncio.Task, int] = {}
+        self._preempted = set()
+        self._active = 0
+        self._seq = itertools.count()
+
+        # Stats
+        self.submitted = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.preempted = 0
+        self.max_wait_ms = {name: 0.0 for name in PRIORITY_NAMES.values()}
+
+    async def run(self, priority: int, factory: Callable[[], Awaitable]):
+        """
+        Run `factory()` once admitted.
+
+        Args:
+            priority: PRIORITY_USER, PRIORITY_TRIGGER or PRIORITY_PROACTIVE
+            factory: Creates the request coroutine
+
+        Raises:
+            RequestPreempted: a proactive request was cancelled for a user turn
+        """
+        name = PRIORITY_NAMES.get(priority, "proactive")
+        self.submitted[name] += 1
+        if priority == PRIORITY_USER:
+            self.preempt()
+
+        started = time.perf_counter()
+        await self._admit(priority)
+        self.max_wait_ms[name] = max(self.max_wait_ms[name], (time.perf_counter() - started) * 1000)
+
+        task = asyncio.ensure_future(factory())
+        self._running[task] = priority
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if task in self._preempted:
+                raise RequestPreempted(f"{name} request cancelled for the user's turn")
+            raise
+        finally:
+            del self._running[task]
+            if task in self._preempted:
+                self._preempted.discard(task)
+            else:
+                self._active -= 1
+            self._wake()
+
+    def preempt(self) -> int:
+        """Cancel queued and in-flight proactive requests; returns how many were cancelled."""
+        cancelled = 0
+        for entry in [entry for entry in self._waiting if entry[0] >= PRIORITY_PROACTIVE]:
+            self._waiting.remove(entry)
+            if not entry[2].done():
+                entry[2].set_exception(RequestPreempted("proactive request dropped for the user's turn"))
+            cancelled += 1
+        heapq.heapify(self._waiting)
+        for task, priority in list(self._running.items()):
+            if priority >= PRIORITY_PROACTIVE and task not in self._preempted and not task.done():
+                # Its slot is free right away; the task unwinds in the background
+                self._preempted.add(task)
+                self._active -= 1
+                task.cancel()
+                cancelled += 1
+        if cancelled:
+            self.preempted += cancelled
+            print(f"   ⏹️ Cancelled {cancelled} proactive request(s) for the user's turn")
+        self._wake()
+        return cancelled
+
+    def get_stats(self) -> Dict:
+        """Get scheduler statistics."""
+        return {
+            "running": self._active,
+            "waiting": len(self._waiting),
+            "submitted": dict(self.submitted),
+            "preempted": self.preempted,
+            "max_wait_ms": dict(self.max_wait_ms),
+        }
+
+    async def _admit(self, priority: int):
+        if self._active < self.max_concurrent and not self._waiting:
+            self._active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        entry = [priority, next(self._seq), future]
+        heapq.heappush(self._waiting, entry)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if entry in self._waiting:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+            elif future.done() and not future.cancelled() and future.exception() is None:
+                # Admitted but abandoned: give the slot back
+                self._active -= 1
+                self._wake()
+            raise
+
+    def _wake(self):
+        while self._waiting and self._active < self.max_concurrent:
+            _, _, future = heapq.heappop(self._waiting)
+            if not future.done():
+                self._active += 1
+                future.set_result(None)
@@ -0,0 +1,189 @@
+"""
+Friday's Response Cache
+Remembers recent cloud replies so the same screen + window + question is
+answered without another round-trip (a paused game or a static IDE keeps
+producing the same [SILENCE]; users repeat questions).
+
+Keys combine a 64-bit perceptual hash of the processed frame (matched with a
+small Hamming tolerance, so compression noise still hits), the turn mode
+(user or proactive), the active window title and the normalized user speech. Only replies without actions are stored:
+replaying "[ACTION:...]" from a cache would run the action again.
+"""
+
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.core.frame_processing import gray_thumbnail
+from src.core.intent_router import FILLERS, PUNCTUATION
+
+# Replies carrying these markers have side effects and are never cached
+SIDE_EFFECT_MARKER = re.compile(r'\[(?:ACTION|WORKFLOW|Action )')
+
+# Fillers to the intent router, but they change what the user asked ("turn it on" / "turn it off")
+MEANINGFUL_WORDS = {"on", "off", "to", "for", "of", "now"}
+SPEECH_FILLERS = FILLERS - MEANINGFUL_WORDS
+
+# Neighbour differences within this many grey levels hash as 0 (flat UI areas)
+HASH_MARGIN = 2
+
+
+def frame_fingerprint(img) -> int:
+    """64-bit difference hash of a PIL image (9x8 luma thumbnail, neighbour comparison)."""
+    return view_fingerprint(np.asarray(img.convert('RGB')), 'RGB')
+
+
+def view_fingerprint(view: np.ndarray, channel_order: str = 'BGRA') -> int:
+    """frame_fingerprint() of a raw (H, W, C) frame view, without building an image."""
+    thumb = gray_thumbnail(view, (9, 8), channel_order).astype(np.int16)
+    bits = ((thumb[:, 1:] - thumb[:, :-1]) > HASH_MARGIN).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+def normalize_speech(text: Optional[str]) -> str:
+    """
+    Lowercase, punctuation and filler words removed ("Friday, what's this error?" == "what's this error").
+    Speech made only of fillers ("Hey Friday", "kya hai?") is kept as spoken, lowercased, rather
+    than reduced to "".
+    """
+    if not text:
+        return ""
+    tokens = PUNCTUATION.sub(" ", text.lower()).split()
+    return " ".join(token for token in tokens if token not in SPEECH_FILLERS) or " ".join(tokens)
+
+
+@dataclass
+class CacheKey:
+    """What a reply depends on: screen, turn mode, window and what the user said."""
+    fingerprint: int
+    window: str
+    speech: str
+    mode: str = "proactive"
+
+    @property
+    def context(self) -> Tuple[str, str, str]:
+        return self.mode, self.window.strip().lower(), self.speech
+
+
+@dataclass
+class CacheEntry:
+    key: CacheKey
+    reply: str
+    stored_at: float
+    hits: int = 0
+
+
+class ResponseCache:
+    """
+    Friday's cloud reply cache.
+    TTL + LRU over at most `max_entries` replies.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None,
+                 max_distance: Optional[int] = None):
+        """
+        Initialize ResponseCache.
+
+        Args:
+            ttl: Seconds a reply stays valid (RESPONSE_CACHE_TTL, default 120)
+            max_entries: Replies kept, least recently used evicted first (RESPONSE_CACHE_SIZE, default 256)
+            max_distance: Fingerprint bits (of 64) that may differ for a hit (RESPONSE_CACHE_DISTANCE, default 4)
+        """
+        self.ttl = float(ttl or os.getenv('RESPONSE_CACHE_TTL', '120') or 120)
+        self.max_entries = int(max_entries or os.getenv('RESPONSE_CACHE_SIZE', '256') or 256)
+        if max_distance is None:
+            max_distance = int(os.getenv('RESPONSE_CACHE_DISTANCE', '4') or 4)
+        self.max_distance = max_distance
+        self._entries: "OrderedDict[Tuple[str, str, str, int], CacheEntry]" = OrderedDict()
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.rejected = 0
+        self.evictions = 0
+        self.expired = 0
+
+    @staticmethod
+    def make_key(img, window: Optional[str], user_speech: Optional[str]) -> Optional[CacheKey]:
+        """
+        Build the key for a processed frame, the active window title and the user speech.
+        A user turn never shares a key with a proactive one; None if the speech has no words to key on.
+        """
+        mode = "user" if user_speech and user_speech.strip() else "proactive"
+        speech = normalize_speech(user_speech)
+        if mode == "user" and not speech:
+            return None
+        return CacheKey(frame_fingerprint(img), window or "", speech, mode)
+
+    @staticmethod
+    def cacheable(reply: Optional[str]) -> bool:
+        """Only side-effect free replies may be replayed."""
+        return bool(reply and reply.strip()) and not SIDE_EFFECT_MARKER.search(reply)
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        """Return a cached reply for this key (or a near-identical frame), or None."""
+        now = time.time()
+        best, best_distance = None, self.max_distance + 1
+        for entry_id, entry in list(self._entries.items()):
+            if now - entry.stored_at > self.ttl:
+                del self._entries[entry_id]
+                self.expired += 1
+                continue
+            if entry.key.context != key.context:
+                continue
+            distance = hamming(entry.key.fingerprint, key.fingerprint)
+            if distance < best_distance:
+                best, best_distance = (entry_id, entry), distance
+
+        if best is None:
+            self.misses += 1
+            return None
+        entry_id, entry = best
+        self._entries.move_to_end(entry_id)
+        entry.hits += 1
+        self.hits += 1
+        print(f"      - Response cache hit ({now - entry.stored_at:.0f}s old, {best_distance} bits apart)")
+        return entry.reply
+
+    def put(self, key: CacheKey, reply: str) -> bool:
+        """Store a reply; returns False if it is not cacheable."""
+        if not self.cacheable(reply):
+            self.rejected += 1
+            return False
+        entry_id = key.context + (key.fingerprint,)
+        self._entries[entry_id] = CacheEntry(key=key, reply=reply, stored_at=time.time())
+        self._entries.move_to_end(entry_id)
+        self.stores += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def clear(self):
+        """Forget every cached reply."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+            "expired": self.expired,
+        }
@@ -0,0 +1,182 @@
+"""
+Friday's Screen Capture Service
+Long-lived background capture worker with a latest-frame ring buffer.
+Keeps one capture session open (see capture_backends) so a response never
+pays for grabbing the screen.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import replace
+from typing import Callable, Deque, Dict, List, Optional
+
+from src.core.capture_backends import CaptureBackend, CapturedFrame, create_backend
+
+
+class ScreenCaptureService:
+    """
+    Friday's background screen grabber.
+    Grabs the monitor at a low FPS on a worker thread into a small ring buffer;
+    consumers take the newest frame without waiting on the grab.
+    """
+
+    def __init__(self, fps: Optional[float] = None, buffer_size: Optional[int] = None,
+                 backend: Optional[CaptureBackend] = None):
+        """
+        Initialize ScreenCaptureService.
+
+        Args:
+            fps: Grab rate in frames per second (CAPTURE_FPS, default 2)
+            buffer_size: Number of frames kept in the ring buffer (CAPTURE_BUFFER_SIZE, default 3)
+            backend: Frame source (default: create_backend() from CAPTURE_BACKEND)
+        """
+        self.fps = float(fps or os.getenv('CAPTURE_FPS', '2') or 2)
+        self.buffer_size = int(buffer_size or os.getenv('CAPTURE_BUFFER_SIZE', '3') or 3)
+        self.backend = backend or create_backend()
+
+        self.frames: Deque[CapturedFrame] = deque(maxlen=max(1, self.buffer_size))
+        self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[CapturedFrame], None]] = []
+
+        # Stats
+        self.frames_captured = 0
+        self.grab_errors = 0
+        self.last_error: Optional[str] = None
+        self._grab_ms_total = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop_event.is_set()
+
+    @property
+    def is_stopping(self) -> bool:
+        """stop() was called but the worker has not exited yet (still inside a grab)."""
+        return self._thread is not None and self._thread.is_alive() and self._stop_event.is_set()
+
+    def start(self) -> bool:
+        """Start the capture worker. Returns False if the backend cannot run here or the old worker is still stopping."""
+        if not self.backend.available():
+            print(f"⚠️ Capture backend '{self.backend.name}' unavailable. Background capture disabled.")
+            return False
+        if self.is_stopping:
+            print("⚠️ Previous capture worker is still stopping; not starting a second one")
+            return False
+        if self.is_running:
+            return True
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="screen-capture", daemon=True)
+        self._thread.start()
+        print(f"✅ Screen capture service started ({self.backend.name}, {self.fps:g} FPS, {self.buffer_size} frame buffer)")
+        return True
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the capture worker (it releases the backend session on exit)."""
+        self._stop_event.set()
+        with self._new_frame:
+            self._new_frame.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                # Still blocked in a grab: it exits (and closes the backend) when that returns
+                print("⚠️ Screen capture worker did not stop in time; it exits when its grab returns")
+                return
+            self._thread = None
+
+    def get_latest_frame(self, max_age: Optional[float] = None) -> Optional[CapturedFrame]:
+        """
+        Get the newest frame without blocking on a grab.
+
+        Args:
+            max_age: Ignore the frame if it is older than this many seconds
+
+        Returns:
+            Newest CapturedFrame, or None if nothing fresh is buffered
+        """
+        with self._lock:
+            frame = self.frames[-1] if self.frames else None
+        if frame is None:
+            return None
+        if max_age is not None and frame.age > max_age:
+            return None
+        return frame
+
+    def add_listener(self, callback: Callable[[CapturedFrame], None]):
+        """Call `callback(frame)` on the capture thread for every new frame (keep it cheap)."""
+        self._listeners.append(callback)
+
+    def wait_for_frame(self, after_sequence: int = 0, timeout: float = 1.0) -> Optional[CapturedFrame]:
+        """Block until a frame newer than after_sequence arrives (or timeout)."""
+        deadline = time.time() + timeout
+        with self._new_frame:
+            while not self._stop_event.is_set():
+                if self.frames and self.frames[-1].sequence > after_sequence:
+                    return self.frames[-1]
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._new_frame.wait(remaining)
+            return self.frames[-1] if self.frames else None
+
+    def get_stats(self) -> Dict:
+        """Get capture statistics."""
+        latest = self.get_latest_frame()
+        return {
+            "running": self.is_running,
+            "backend": self.backend.name,
+            "fps": self.fps,
+            "frames_captured": self.frames_captured,
+            "grab_errors": self.grab_errors,
+            "last_error": self.last_error,
+            "avg_grab_ms": (self._grab_ms_total / self.frames_captured) if self.frames_captured else 0.0,
+            "latest_age": latest.age if latest else None,
+        }
+
+    def _run(self):
+        """Worker loop: one backend session for the lifetime of the service."""
+        interval = 1.0 / max(0.1, self.fps)
+        backoff = interval
+
+        while not self._stop_event.is_set():
+            try:
+                while not self._stop_event.is_set():
+                    started = time.time()
+                    self._publish(self.backend.grab())
+                    backoff = interval
+
+                    elapsed = time.time() - started
+                    self._stop_event.wait(max(0.0, interval - elapsed))
+            except EOFError:
+                print("ℹ️ Capture source finished")
+                break
+            except Exception as e:
+                self.grab_errors += 1
+                if str(e) != self.last_error:
+                    print(f"⚠️ Screen capture error: {e}")
+                self.last_error = str(e)
+                # Back off so a missing display does not spin the CPU
+                backoff = min(backoff * 2, 10.0)
+                self._stop_event.wait(backoff)
+            finally:
+                # Backends keep per-thread sessions (mss display handles)
+                self.backend.close()
+
+    def _publish(self, frame: CapturedFrame):
+        """Push a grabbed frame into the ring buffer."""
+        with self._new_frame:
+            # Shallow copy: backends may hand back the same frame object (replay)
+            frame = replace(frame, sequence=self.frames_captured + 1)
+            self.frames.append(frame)
+            self.frames_captured += 1
+            self._grab_ms_total += frame.grab_ms
+            self._new_frame.notify_all()
+        for callback in self._listeners:
+            try:
+                callback(frame)
+            except Exception as e:
+                print(f"⚠️ Frame listener error: {e}")
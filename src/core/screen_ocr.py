@@ -0,0 +1,231 @@
+"""
+Friday's Screen OCR
+Optional local text recognition for proactive decisions.
+Only tiles the change detector marked dirty are recognised; text is cached
+per tile content hash and recognition runs on a small worker pool, so a
+screen that only scrolls a little costs a few tile OCRs, not a full page.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.core.frame_processing import LUMA_WEIGHTS, rgb_channels
+
+try:
+    import pytesseract
+    TESSERACT_AVAILABLE = True
+except ImportError:
+    TESSERACT_AVAILABLE = False
+
+
+@dataclass
+class OCRResult:
+    """Text recognised for one frame."""
+    text: str
+    changed_text: str
+    tiles_processed: int = 0
+    cache_hits: int = 0
+    pending_tiles: int = 0
+    ocr_ms: float = 0.0
+    tile_texts: Dict[Tuple[int, int], str] = field(default_factory=dict, repr=False)
+
+    def summary(self) -> str:
+        """One-line description for logs."""
+        return (f"OCR: {self.tiles_processed} tiles ({self.cache_hits} cached, {self.pending_tiles} pending) "
+                f"in {self.ocr_ms:.0f}ms, {len(self.changed_text.split())} new words")
+
+
+def tesseract_engine(lang: str = "eng") -> Callable[[Image.Image], str]:
+    """Recognition function backed by pytesseract (sparse text layout suits screen fragments)."""
+    def recognise(img: Image.Image) -> str:
+        return pytesseract.image_to_string(img, lang=lang, config="--psm 11")
+    return recognise
+
+
+class ScreenOCR:
+    """
+    Friday's incremental screen OCR.
+    Keeps the last known text of every grid tile and re-recognises only
+    tiles whose content changed.
+    """
+
+    def __init__(self, rows: int = 8, cols: int = 8, engine: Optional[Callable[[Image.Image], str]] = None,
+                 max_workers: Optional[int] = None, max_tiles: Optional[int] = None,
+                 cache_size: Optional[int] = None):
+        """
+        Initialize ScreenOCR.
+
+        Args:
+            rows: Grid rows (match the change detector)
+            cols: Grid columns
+            engine: Function image -> text (default: pytesseract with OCR_LANG)
+            max_workers: Recognition threads (OCR_WORKERS, default 2)
+            max_tiles: Tiles recognised per frame; the rest wait for the next frame (OCR_MAX_TILES, default 16)
+            cache_size: Tile texts kept by content hash (OCR_CACHE_SIZE, default 512)
+        """
+        self.rows = rows
+        self.cols = cols
+        self.engine_name = "custom" if engine is not None else None
+        if engine is None and TESSERACT_AVAILABLE:
+            engine = tesseract_engine(os.getenv('OCR_LANG', 'eng') or 'eng')
+            self.engine_name = "tesseract"
+        self.engine = engine
+        self.max_workers = int(max_workers or os.getenv('OCR_WORKERS', '2') or 2)
+        self.max_tiles = int(max_tiles or os.getenv('OCR_MAX_TILES', '16') or 16)
+        self.cache_size = int(cache_size or os.getenv('OCR_CACHE_SIZE', '512') or 512)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="screen-ocr")
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self.tile_text: Dict[Tuple[int, int], str] = {}
+        self._pending: Set[Tuple[int, int]] = set()
+
+        # Stats
+        self.tiles_recognised = 0
+        self.cache_hits = 0
+        self.errors = 0
+
+    def available(self) -> bool:
+        """Whether a recognition engine is installed."""
+        return self.engine is not None
+
+    def process(self, view: np.ndarray, channel_order: str = 'BGRA', report=None) -> OCRResult:
+        """
+        Recognise the tiles that changed (blocking).
+
+        Args:
+            view: (H, W, C) frame view
+            channel_order: Channel layout of the view
+            report: ChangeReport from the tile detector (None = treat every tile as changed)
+
+        Returns:
+            OCRResult with the full known screen text and the text of changed tiles
+        """
+        started = time.perf_counter()
+        tiles = self._select_tiles(report)
+
+        jobs, hits, changed = {}, 0, {}
+        for tile in tiles:
+            crop = self._crop(view, tile)
+            key = hashlib.blake2b(np.ascontiguousarray(crop[::2, ::2]).tobytes(), digest_size=16).digest()
+            cached = self._cache_get(key)
+            if cached is not None:
+                hits += 1
+                changed[tile] = cached
+            else:
+                jobs[tile] = (key, self._executor.submit(self._recognise, crop, channel_order))
+
+        for tile, (key, future) in jobs.items():
+            text = future.result()
+            self._cache_put(key, text)
+            changed[tile] = text
+
+        for tile, text in changed.items():
+            self.tile_text[tile] = text
+            self._pending.discard(tile)
+        self.tiles_recognised += len(jobs)
+        self.cache_hits += hits
+
+        return OCRResult(
+            text=self._join(self.tile_text),
+            changed_text=self._join(changed),
+            tiles_processed=len(tiles),
+            cache_hits=hits,
+            pending_tiles=len(self._pending),
+            ocr_ms=(time.perf_counter() - started) * 1000,
+            tile_texts=changed,
+        )
+
+    async def process_async(self, view: np.ndarray, channel_order: str = 'BGRA', report=None) -> OCRResult:
+        """Recognise changed tiles without blocking the event loop."""
+        return await asyncio.to_thread(self.process, view, channel_order, report)
+
+    def reset(self):
+        """Forget known tile texts (the content cache is kept)."""
+        self.tile_text.clear()
+        self._pending.clear()
+
+    def get_stats(self) -> Dict:
+        """Get OCR statistics."""
+        return {
+            "engine": self.engine_name,
+            "tiles_recognised": self.tiles_recognised,
+            "cache_hits": self.cache_hits,
+            "cache_entries": len(self._cache),
+            "pending_tiles": len(self._pending),
+            "errors": self.errors,
+        }
+
+    def shutdown(self):
+        """Stop the worker pool."""
+        self._executor.shutdown(wait=False)
+
+    def _select_tiles(self, report) -> List[Tuple[int, int]]:
+        """Dirty tiles first, then leftovers from earlier frames, capped at max_tiles."""
+        if report is None or report.reason == "first frame":
+            dirty = [(r, c) for r in range(self.rows) for c in range(self.cols)]
+        else:
+            dirty = list(report.dirty_tiles)
+        self._pending.update(dirty)
+
+        fresh = set(dirty)
+        ordered = sorted(self._pending, key=lambda tile: (tile not in fresh, tile))
+        return ordered[:self.max_tiles]
+
+    def _recognise(self, crop: np.ndarray, channel_order: str) -> str:
+        """OCR one tile: dark themes are inverted and small text is upscaled for the engine."""
+        try:
+            crop = self._gray(crop, channel_order)
+            if crop.mean() < 110:
+                crop = 255 - crop
+            img = Image.fromarray(crop, 'L')
+            if img.height < 200:
+                img = img.resize((img.width * 2, img.height * 2), Image.Resampling.BICUBIC)
+            return " ".join(self.engine(img).split())
+        except Exception as e:
+            self.errors += 1
+            if self.errors == 1:
+                print(f"⚠️ OCR failed: {e}")
+            return ""
+
+    def _crop(self, view: np.ndarray, tile: Tuple[int, int]) -> np.ndarray:
+        """Tile pixels with a small overlap so words on a border are not cut in half."""
+        height, width = view.shape[:2]
+        r, c = tile
+        pad_y, pad_x = height // (self.rows * 12), width // (self.cols * 12)
+        top = max(0, r * height // self.rows - pad_y)
+        bottom = min(height, (r + 1) * height // self.rows + pad_y)
+        left = max(0, c * width // self.cols - pad_x)
+        right = min(width, (c + 1) * width // self.cols + pad_x)
+        return view[top:bottom, left:right]
+
+    @staticmethod
+    def _gray(view: np.ndarray, channel_order: str) -> np.ndarray:
+        """Full-resolution luma of a tile (OCR needs every pixel of small screen text)."""
+        r, g, b = rgb_channels(channel_order)
+        gray = view[..., r] * LUMA_WEIGHTS[0] + view[..., g] * LUMA_WEIGHTS[1] + view[..., b] * LUMA_WEIGHTS[2]
+        return gray.clip(0, 255).astype(np.uint8)
+
+    def _join(self, tile_texts: Dict[Tuple[int, int], str]) -> str:
+        """Tile texts in reading order (row by row)."""
+        return "\n".join(text for _, text in sorted(tile_texts.items()) if text)
+
+    def _cache_get(self, key: bytes) -> Optional[str]:
+        text = self._cache.get(key)
+        if text is not None:
+            self._cache.move_to_end(key)
+        return text
+
+    def _cache_put(self, key: bytes, text: str):
+        self._cache[key] = text
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
@@ -0,0 +1,484 @@
+"""
+Friday's Session Recorder
+Records every input of a live session so it can be replayed later through
+the full pipeline:
+- turns (user speech / proactive checks) with their start time
+- captured screen frames (JPEG, identical frames stored once)
+- active window titles, STT results, cloud replies and final replies
+
+A session is a directory: events.jsonl (one JSON event per line, times in
+seconds since the session started) plus frames/. SessionReplayer feeds a
+recorded session back through generate_response() with recorded (or live)
+cloud replies and reports per-stage latency and call counts, so pipeline
+changes can be compared on identical input.
+
+Enabled with SESSION_RECORD=1 (or `main.py --record`); replayed with
+`main.py --replay <dir>`.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.core.capture_backends import CaptureBackend, CapturedFrame
+
+EVENTS_FILE = "events.jsonl"
+FRAMES_DIR = "frames"
+FORMAT_VERSION = 1
+
+# Turn that the running task belongs to (frames, windows and cloud calls are tagged with it)
+CURRENT_TURN: contextvars.ContextVar = contextvars.ContextVar("session_turn", default=None)
+
+# Pipeline stages timed during replay: stage name -> method (on the partner unless noted)
+REPLAY_STAGES = [
+    ("local_intent", "_try_local_intent"),
+    ("capture", "capture_vision_safe"),
+    ("process", "_process_vision_data"),
+    ("change_gate", "_should_skip_proactive"),
+    ("ocr_gate", "_screen_text_gate"),
+    ("cache_key", "_response_cache_key"),
+    ("encode", "frame_encoder.submit"),
+    ("cloud", "_get_cloud_strategic_response"),
+    ("actions", "_run_action"),
+]
+
+
+def default_session_dir() -> Path:
+    base_dir = Path(__file__).resolve().parent.parent.parent
+    return base_dir / "training_data" / "sessions" / datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+class SessionRecorder:
+    """
+    Friday's session log writer. Safe to call from the STT thread; files are
+    written on a background thread so recording never blocks the event loop.
+    """
+
+    def __init__(self, directory: Optional[str] = None, frame_quality: Optional[int] = None):
+        """
+        Initialize SessionRecorder.
+
+        Args:
+            directory: Session directory (SESSION_DIR, default training_data/sessions/<timestamp>)
+            frame_quality: JPEG quality of stored frames (SESSION_FRAME_QUALITY, default 85)
+        """
+        self.directory = Path(directory or os.getenv('SESSION_DIR') or default_session_dir())
+        (self.directory / FRAMES_DIR).mkdir(parents=True, exist_ok=True)
+        self.frame_quality = int(frame_quality or os.getenv('SESSION_FRAME_QUALITY', '85') or 85)
+        self.started = time.time()
+
+        self._turns = itertools.count(1)
+        self._frame_numbers = itertools.count(1)
+        self._frame_files: Dict[str, str] = {}   # pixel digest -> stored file
+        self._last_window = None
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._file = open(self.directory / EVENTS_FILE, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._writer, name="session-recorder", daemon=True)
+        self._thread.start()
+        self.closed = False
+
+        # Stats
+        self.events = 0
+        self.frames_written = 0
+        self.frames_reused = 0
+
+        self._emit("session", version=FORMAT_VERSION, started=datetime.now().isoformat())
+        print(f"⏺️ Recording session to {self.directory}")
+
+    def start_turn(self, speech: Optional[str] = None, proactive: bool = False) -> int:
+        """Start a turn in the current task; later events from this task are tagged with it."""
+        turn = next(self._turns)
+        CURRENT_TURN.set(turn)
+        self._emit("turn", turn=turn, speech=speech, proactive=proactive)
+        return turn
+
+    def resume_turn(self, turn: int):
+        """Continue a turn started in another task (the turn pipeline captures and thinks on separate tasks)."""
+        CURRENT_TURN.set(turn)
+
+    def record_speech(self, text: str):
+        """An STT result (recorded when it arrives, before its turn starts)."""
+        self._emit("speech", turn=None, text=text)
+
+    def record_frame(self, frame):
+        """A captured CapturedFrame (encoded and stored on the writer thread)."""
+        if frame is not None:
+            self._emit("frame", frame=frame, left=frame.left, top=frame.top)
+
+    def record_window(self, title: Optional[str]):
+        """The active window title (stored once per turn, and again when it changes)."""
+        turn = CURRENT_TURN.get()
+        with self._lock:
+            if self._last_window == (turn, title):
+                return
+            self._last_window = (turn, title)
+        self._emit("window", title=title)
+
+    def record_cloud(self, speech: Optional[str], reply: Optional[str], status: str, latency: float,
+                     priority: str = "user"):
+        """One cloud call as the pipeline saw it (after routing and failover)."""
+        self._emit("cloud", speech=speech, reply=reply, status=status, priority=priority,
+                   latency_ms=round(latency * 1000, 1))
+
+    def record_reply(self, reply: Optional[str], latency: float):
+        """What generate_response() returned for the current turn."""
+        self._emit("reply", reply=reply, latency_ms=round(latency * 1000, 1))
+
+    def close(self):
+        """Flush everything to disk."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        print(f"💾 Session saved: {self.events} events, {self.frames_written} frames "
+              f"({self.frames_reused} repeats stored once) → {self.directory}")
+
+    def _emit(self, kind: str, **fields):
+        if self.closed:
+            return
+        event = {"kind": kind, "t": round(time.time() - self.started, 3)}
+        if "turn" not in fields:
+            event["turn"] = CURRENT_TURN.get()
+        event.update(fields)
+        self._queue.put(event)
+
+    def _writer(self):
+        while True:
+            event = self._queue.get()
+            if event is None:
+                self._file.flush()
+                return
+            try:
+                if event["kind"] == "frame":
+                    self._store_frame(event)
+                self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+                self.events += 1
+                if self._queue.empty():
+                    self._file.flush()
+            except Exception as e:
+                print(f"⚠️ Session recorder error: {e}")
+
+    def _store_frame(self, event: Dict):
+        frame = event.pop("frame")
+        digest = hashlib.blake2b(memoryview(frame.raw), digest_size=16).hexdigest()
+        name = self._frame_files.get(digest)
+        if name is None:
+            name = f"{FRAMES_DIR}/{next(self._frame_numbers):06d}.jpg"
+            frame.to_image().save(self.directory / name, quality=self.frame_quality)
+            self._frame_files[digest] = name
+            self.frames_written += 1
+        else:
+            self.frames_reused += 1
+        event.update(file=name, width=frame.width, height=frame.height)
+
+
+class SessionLog:
+    """A recorded session loaded from disk, indexed by turn."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        path = self.directory / EVENTS_FILE
+        if not path.exists():
+            raise FileNotFoundError(f"No {EVENTS_FILE} in {self.directory}")
+        with open(path, 'r', encoding='utf-8') as f:
+            self.events = [json.loads(line) for line in f if line.strip()]
+
+        self.turns = [e for e in self.events if e["kind"] == "turn"]
+        self.frames = [e for e in self.events if e["kind"] == "frame"]
+        self.replies = {e["turn"]: e for e in self.events if e["kind"] == "reply"}
+        self.by_turn: Dict[tuple, List[Dict]] = {}
+        for event in self.events:
+            if event["kind"] in ("frame", "window", "cloud"):
+                self.by_turn.setdefault((event["kind"], event.get("turn")), []).append(event)
+
+    @property
+    def duration(self) -> float:
+        return self.events[-1]["t"] if self.events else 0.0
+
+    def in_turn(self, kind: str, turn: Optional[int]) -> List[Dict]:
+        return self.by_turn.get((kind, turn), [])
+
+    def latest_before(self, kind: str, turn: Optional[int]) -> Optional[Dict]:
+        """Last `kind` event recorded before `turn` started."""
+        earlier = [e for e in self.events if e["kind"] == kind and (e.get("turn") or 0) < (turn or 0)]
+        return earlier[-1] if earlier else None
+
+
+class RecordedFrames(CaptureBackend):
+    """Capture backend serving a session's frames: the ones captured in the same turn, in order."""
+
+    name = "session"
+    streaming = False
+
+    def __init__(self, session: SessionLog):
+        self.session = session
+        self._cursor: Dict[Optional[int], int] = {}
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return bool(self.session.frames)
+
+    def grab(self) -> CapturedFrame:
+        turn = CURRENT_TURN.get()
+        frames = self.session.in_turn("frame", turn)
+        with self._lock:
+            index = self._cursor.get(turn, 0)
+            self._cursor[turn] = index + 1
+        if frames:
+            event = frames[min(index, len(frames) - 1)]
+        else:
+            event = self.session.latest_before("frame", turn) or (self.session.frames or [None])[0]
+        if event is None:
+            raise RuntimeError("No frames in the recorded session")
+
+        from PIL import Image
+
+        started = time.time()
+        img = Image.open(self.session.directory / event["file"]).convert('RGB')
+        return CapturedFrame(
+            sequence=0,
+            timestamp=started,
+            width=img.width,
+            height=img.height,
+            raw=img.tobytes(),
+            left=event.get("left", 0),
+            top=event.get("top", 0),
+            grab_ms=(time.time() - started) * 1000,
+            channel_order='RGB',
+        )
+
+
+class RecordedCloud:
+    """LLM backend answering with the session's recorded replies (and their latency)."""
+
+    def __init__(self, session: SessionLog, latency_scale: float = 1.0):
+        self.session = session
+        self.latency_scale = latency_scale
+        self._cursor: Dict[Optional[int], int] = {}
+        self.unmatched = 0
+
+    async def think_async(self, user_speech=None, on_delta=None, **kwargs):
+        turn = CURRENT_TURN.get()
+        calls = self.session.in_turn("cloud", turn)
+        index = self._cursor.get(turn, 0)
+        self._cursor[turn] = index + 1
+        if index < len(calls):
+            event = calls[index]
+        else:
+            # The replayed pipeline called the cloud where the recording didn't
+            event = next((e for e in reversed(self.session.events)
+                          if e["kind"] == "cloud" and user_speech and e.get("speech") == user_speech), None)
+            if event is None:
+                self.unmatched += 1
+                reply = "Sir, I don't have a recorded reply for that." if user_speech else "[SILENCE]"
+                event = {"reply": reply, "status": "success", "latency_ms": 0.0}
+        await asyncio.sleep(event.get("latency_ms", 0.0) / 1000 * self.latency_scale)
+        if event["status"] in ("PREEMPTED", "DEADLINE"):
+            # The recorded call never finished (the user spoke, or the turn ran out of time)
+            return "[SILENCE]", "success", None
+        if on_delta is not None and event["status"] == "success":
+            on_delta(event["reply"])
+        return event["reply"], event["status"], None
+
+
+class SessionReplayer:
+    """
+    Friday's replay harness: runs a recorded session through a partner's
+    generate_response() without touching the screen, microphone, speakers,
+    the RL dataset or the real system (actions are logged, not executed).
+    """
+
+    def __init__(self, partner, session: SessionLog, speed: float = 0.0, cloud: str = "recorded",
+                 latency_scale: float = 1.0):
+        """
+        Initialize SessionReplayer.
+
+        Args:
+            partner: InteractiveGamingPartner to drive
+            session: Recorded session
+            speed: 1 = turns start at their recorded times, 2 = twice as fast, 0 = back to back
+            cloud: "recorded" (replies from the log) or "live" (the partner's configured backends,
+                   e.g. the mock server via GROQ_BASE_URL)
+            latency_scale: Multiplier for the recorded cloud latency (0 = instant)
+        """
+        self.partner = partner
+        self.session = session
+        self.speed = speed
+        self.cloud = cloud
+        self.latency_scale = latency_scale
+        self.timings: Dict[str, List[float]] = {stage: [] for stage, _ in REPLAY_STAGES}
+        self.timings["turn"] = []
+        self.results: List[Dict] = []
+        self.skipped_actions: List[Dict] = []
+        self.recorded_cloud = None
+        self._windows: Dict[Optional[int], int] = {}
+        self._isolate()
+        self._instrument()
+
+    async def run(self) -> Dict:
+        """Replay every turn, then print and return the report."""
+        print(f"⏯️ Replaying {len(self.session.turns)} turns ({self.session.duration:.0f}s session) "
+              f"from {self.session.directory}")
+        started = time.perf_counter()
+        tasks = []
+        for turn in self.session.turns:
+            if self.speed > 0:
+                delay = turn["t"] / self.speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # Overlapping turns overlap again, as they did live
+                tasks.append(asyncio.create_task(self._turn(turn)))
+            else:
+                await self._turn(turn)
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+        if hasattr(self.partner.llm_router, 'aclose'):
+            await self.partner.llm_router.aclose()
+        return self.report(elapsed)
+
+    async def _turn(self, turn: Dict):
+        CURRENT_TURN.set(turn["turn"])
+        started = time.perf_counter()
+        reply = await self.partner.generate_response(user_speech=turn.get("speech"),
+                                                     proactive=turn.get("proactive", False))
+        latency = time.perf_counter() - started
+        self.timings["turn"].append(latency * 1000)
+        recorded = self.session.replies.get(turn["turn"], {})
+        self.results.append({
+            "turn": turn["turn"],
+            "speech": turn.get("speech"),
+            "reply": reply,
+            "recorded_reply": recorded.get("reply"),
+            "latency_ms": round(latency * 1000, 1),
+            "recorded_latency_ms": recorded.get("latency_ms"),
+        })
+
+    def report(self, elapsed: float) -> Dict:
+        """Per-stage latency, call counts and how the replies compare with the recording."""
+        def pct(values, q):
+            return float(np.percentile(values, q)) if values else 0.0
+
+        stages = {}
+        print("\n" + "="*60)
+        print(" SESSION REPLAY")
+        print("="*60)
+        print(f"{len(self.results)} turns in {elapsed:.1f}s (speed {self.speed:g}, cloud {self.cloud})")
+        print(f"{'stage':<14}{'calls':>7}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'total ms':>11}")
+        for stage, values in self.timings.items():
+            stages[stage] = {"calls": len(values), "p50_ms": pct(values, 50), "p95_ms": pct(values, 95),
+                             "max_ms": max(values, default=0.0), "total_ms": sum(values)}
+            if values:
+                s = stages[stage]
+                print(f"{stage:<14}{s['calls']:>7}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}"
+                      f"{s['max_ms']:>10.1f}{s['total_ms']:>11.0f}")
+
+        recorded = [r for r in self.results if r["recorded_latency_ms"] is not None]
+        same = sum(1 for r in recorded if (r["reply"] or "") == (r["recorded_reply"] or ""))
+        spoken = sum(1 for r in self.results if r["reply"])
+        recorded_cloud = sum(1 for e in self.session.events if e["kind"] == "cloud")
+        print(f"\nReplies: {spoken} spoken, {len(self.results) - spoken} silent; "
+              f"{same}/{len(recorded)} identical to the recording")
+        print(f"Cloud calls: {stages['cloud']['calls']} (recorded session: {recorded_cloud})"
+              + (f", {self.recorded_cloud.unmatched} without a recorded reply" if self.recorded_cloud else ""))
+        if recorded:
+            print(f"Turn latency p50: {pct([r['latency_ms'] for r in self.results], 50):.0f}ms "
+                  f"(recorded {pct([r['recorded_latency_ms'] for r in recorded], 50):.0f}ms)")
+        if self.partner.response_cache is not None:
+            cache = self.partner.response_cache.get_stats()
+            print(f"Response cache: {cache['hits']} hits / {cache['hits'] + cache['misses']} lookups")
+        if self.skipped_actions:
+            print(f"Actions (not executed): {', '.join(a['intent'] for a in self.skipped_actions)}")
+
+        return {
+            "session": str(self.session.directory),
+            "speed": self.speed,
+            "cloud": self.cloud,
+            "elapsed_s": elapsed,
+            "stages": stages,
+            "identical_replies": same,
+            "cloud_calls": stages["cloud"]["calls"],
+            "recorded_cloud_calls": recorded_cloud,
+            "actions": self.skipped_actions,
+            "trace": self.partner.tracer.snapshot(),
+            "turns": self.results,
+        }
+
+    def _isolate(self):
+        """Point every input at the recording and every side effect at nothing."""
+        partner = self.partner
+        partner.stop_capture()
+        partner.capture_backend = RecordedFrames(self.session)
+        partner.use_capture_service = False
+        partner.use_camera = False
+        partner.stream_speech = False
+        partner.recorder = None
+        partner._log_interaction = lambda *args, **kwargs: None
+        partner._save_memory = lambda: None
+        if partner.smart_memory is not None:
+            from src.memory.smart_memory import SmartMemory
+            partner.smart_memory = SmartMemory(db_path=os.path.join(tempfile.mkdtemp(), "replay_memory.db"))
+        # Shared by the intent router and the workflow engine
+        partner.action_executor.execute = self._execute
+        if self.cloud == "recorded":
+            from src.core.llm_router import LLMRouter
+            self.recorded_cloud = RecordedCloud(self.session, self.latency_scale)
+            partner.llm_router = LLMRouter({"replay": self.recorded_cloud}, order=["replay"],
+                                           proactive_order=["replay"])
+
+    def _execute(self, intent, params):
+        if intent == "get_active_window":
+            return self._window()
+        self.skipped_actions.append({"turn": CURRENT_TURN.get(), "intent": intent, "params": params})
+        return {"status": "success", "message": f"[replay] {intent} not executed"}
+
+    def _window(self):
+        turn = CURRENT_TURN.get()
+        windows = self.session.in_turn("window", turn)
+        index = self._windows.get(turn, 0)
+        self._windows[turn] = index + 1
+        event = windows[min(index, len(windows) - 1)] if windows else self.session.latest_before("window", turn)
+        if event is None or not event.get("title"):
+            return {"status": "error", "message": "No window recorded"}
+        return {"status": "success", "message": event["title"]}
+
+    def _instrument(self):
+        for stage, path in REPLAY_STAGES:
+            *owners, attribute = path.split(".")
+            owner = self.partner
+            for name in owners:
+                owner = getattr(owner, name)
+            setattr(owner, attribute, self._timed(stage, getattr(owner, attribute)))
+
+    def _timed(self, stage, method):
+        timings = self.timings[stage]
+        if inspect.iscoroutinefunction(method):
+            async def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await method(*args, **kwargs)
+                finally:
+                    timings.append((time.perf_counter() - started) * 1000)
+        else:
+            def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    timings.append((time.perf_counter() - started) * 1000)
+        return timed
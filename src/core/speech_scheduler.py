@@ -0,0 +1,308 @@
+"""
+Friday's Speech Scheduler
+The one owner of the speakers: every line Friday says goes through it and
+only one plays at a time.
+- priority queue: replies to the user, then trigger alerts, then proactive
+  remarks (the request scheduler's PRIORITY_* levels); a line queues for the
+  floor once its first sentence is synthesized, so a slow TTS call never
+  holds the speakers
+- barge-in: when the user talks over Friday, playback stops and whatever is
+  queued is dropped
+- the same line queued twice is said once
+- lines that waited past their turn deadline or max age are dropped instead
+  of being said late
+"""
+
+import asyncio
+import difflib
+import heapq
+import itertools
+import os
+import re
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.core.deadline import Deadline
+from src.core.request_scheduler import PRIORITY_USER, PRIORITY_TRIGGER, PRIORITY_PROACTIVE, PRIORITY_NAMES
+from src.core.speech_stream import StreamingSpeaker
+
+# Seconds after Friday stopped talking during which the microphone may still hear her
+ECHO_TAIL = 3.0
+
+
+def _normalize(text: Optional[str]) -> str:
+    """Lowercase words only: what dedup and the echo check compare."""
+    return " ".join(re.findall(r'\w+', (text or "").lower()))
+
+
+class Utterance:
+    """
+    One line in the scheduler: text known up front (say()) or a reply streamed
+    while it is generated (stream()).
+    Status: queued -> playing -> spoken, or empty / dropped / expired / interrupted.
+    """
+
+    def __init__(self, priority: int, text: Optional[str] = None, deadline: Optional[Deadline] = None,
+                 max_age: Optional[float] = None, seq: int = 0):
+        self.priority = priority
+        self.text = text
+        self.key = _normalize(text) or None
+        self.deadline = deadline
+        self.max_age = max_age
+        self.seq = seq
+        self.created = time.monotonic()
+        self.status = "queued"
+        self.speaker: Optional[StreamingSpeaker] = None
+        self.waiting = False                 # in the queue for the floor (first sentence synthesized)
+        self.started = asyncio.Event()       # got the floor, or ended without it
+        self._floor = asyncio.Event()
+        self._done = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def spoken_text(self) -> str:
+        """The line's text (for a streamed reply: what has been generated so far)."""
+        if self.text:
+            return self.text
+        return self.speaker.chunker.text if self.speaker is not None else ""
+
+    def expired(self) -> bool:
+        """Too late to start: its turn deadline or its max age has passed."""
+        if self.deadline is not None and self.deadline.expired:
+            return True
+        return self.max_age is not None and time.monotonic() - self.created > self.max_age
+
+    async def wait(self) -> str:
+        """Wait until the line has been said (or dropped); returns its status."""
+        await self._done.wait()
+        return self.status
+
+
+class SpeechScheduler:
+    """
+    Priority queue in front of a single player.
+    Call from the event loop, except is_echo() which only reads state.
+    """
+
+    def __init__(self, synthesize: Callable[[str], Awaitable[bytes]],
+                 play: Callable[[bytes], Awaitable[None]],
+                 stop: Optional[Callable[[], None]] = None, lookahead: int = 2):
+        """
+        Args:
+            synthesize: async text -> encoded audio
+            play: async audio -> None (returns when playback finished)
+            stop: Cuts the audio currently playing (barge-in)
+            lookahead: Sentences synthesized ahead of playback, per line
+        """
+        self.synthesize = synthesize
+        self.play = play
+        self.stop_playback = stop
+        self.lookahead = lookahead
+        # A line that has not started after this many seconds is dropped (0 = no limit)
+        self.max_age = {
+            PRIORITY_USER: float(os.getenv('SPEECH_MAX_AGE_USER', '30') or 0),
+            PRIORITY_TRIGGER: float(os.getenv('SPEECH_MAX_AGE_TRIGGER', '15') or 0),
+            PRIORITY_PROACTIVE: float(os.getenv('SPEECH_MAX_AGE_PROACTIVE', '8') or 0),
+        }
+        # Share of a heard phrase found in what Friday is saying for it to count as her own echo
+        self.echo_similarity = float(os.getenv('BARGE_IN_ECHO_SIMILARITY', '0.6') or 0.6)
+
+        self._ready: List[tuple] = []          # heap of (priority, seq, utterance) waiting for the floor
+        self._open: List[Utterance] = []       # lines not finished yet
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.current: Optional[Utterance] = None
+        self._last_said = ("", 0.0)            # (text, monotonic end) of the last line played
+
+        # Stats
+        self.said = 0
+        self.deduped = 0
+        self.expired = 0
+        self.dropped = 0
+        self.interrupted = 0
+        self.barge_ins = 0
+        self.said_by_priority: Dict[str, int] = {name: 0 for name in PRIORITY_NAMES.values()}
+
+    def say(self, text: str, priority: int = PRIORITY_USER, deadline: Optional[Deadline] = None) -> Utterance:
+        """
+        Queue a line. The same line already queued or playing is not queued
+        again: its Utterance is returned instead.
+        """
+        key = _normalize(text)
+        for utterance in self._open:
+            if utterance.key == key and utterance.status in ("queued", "playing"):
+                self.deduped += 1
+                print(f"   - Already saying \"{text[:40]}\", not queued twice")
+                return utterance
+        utterance = self._add(priority, text, deadline)
+        utterance.speaker.feed(text)
+        asyncio.ensure_future(utterance.speaker.finish())
+        return utterance
+
+    def stream(self, priority: int = PRIORITY_USER, deadline: Optional[Deadline] = None) -> StreamingSpeaker:
+        """A started StreamingSpeaker for a reply still being generated (feed() it, then finish())."""
+        return self._add(priority, None, deadline).speaker
+
+    def cancel(self, utterance: Utterance):
+        """Drop a line (stops it if it is playing)."""
+        if utterance is self.current and utterance.status == "playing":
+            self._cut(utterance, "interrupted")
+        else:
+            self._drop(utterance, "dropped")
+
+    def barge_in(self) -> int:
+        """The user is talking: stop playback now and drop every queued line. Returns lines cut."""
+        cut = self._cut_all()
+        if cut:
+            self.barge_ins += 1
+            print(f"   ✋ Barge-in: stopped speaking ({cut} line(s) cut)")
+        return cut
+
+    def is_echo(self, heard: str) -> bool:
+        """Whether `heard` is the microphone picking up what Friday is saying (or just said)."""
+        heard = _normalize(heard)
+        if not heard:
+            return False
+        current = self.current
+        said = [current.spoken_text] if current is not None else []
+        text, ended = self._last_said
+        if time.monotonic() - ended <= ECHO_TAIL:
+            said.append(text)
+        for line in said:
+            line = _normalize(line)
+            if not line:
+                continue
+            matcher = difflib.SequenceMatcher(None, heard, line, autojunk=False)
+            matched = sum(block.size for block in matcher.get_matching_blocks())
+            if matched / len(heard) >= self.echo_similarity:
+                return True
+        return False
+
+    @property
+    def busy(self) -> bool:
+        return self.current is not None
+
+    async def stop(self):
+        """Drop everything and stop the scheduler task."""
+        self._cut_all()
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "queued": sum(1 for u in self._open if u.status == "queued"),
+            "said": self.said,
+            "said_by_priority": dict(self.said_by_priority),
+            "deduped": self.deduped,
+            "expired": self.expired,
+            "dropped": self.dropped,
+            "interrupted": self.interrupted,
+            "barge_ins": self.barge_ins,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _add(self, priority: int, text: Optional[str], deadline: Optional[Deadline]) -> Utterance:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._ready = []
+            self._task = asyncio.create_task(self._floor_loop())
+        utterance = Utterance(priority, text, deadline, self.max_age.get(priority) or None, next(self._seq))
+        utterance.speaker = StreamingSpeaker(self.synthesize, lambda audio: self._play(utterance, audio),
+                                             lookahead=self.lookahead)
+        self._open.append(utterance)
+        utterance.speaker.start()
+        watcher = asyncio.ensure_future(utterance.speaker.wait())
+        watcher.add_done_callback(lambda _: self._end(utterance))
+        return utterance
+
+    async def _play(self, utterance: Utterance, audio: bytes):
+        """Player for one line's speaker: the first sentence waits for the floor."""
+        if not utterance.waiting and utterance.status == "queued":
+            utterance.waiting = True
+            heapq.heappush(self._ready, (utterance.priority, utterance.seq, utterance))
+            self._wakeup.set()
+            await utterance._floor.wait()
+        if utterance.status != "playing":
+            return
+        await self.play(audio)
+
+    async def _floor_loop(self):
+        while True:
+            while not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            _, _, utterance = heapq.heappop(self._ready)
+            if utterance.status != "queued":
+                continue
+            if utterance.expired():
+                print(f"   - Dropped stale line ({PRIORITY_NAMES.get(utterance.priority, 'proactive')}, "
+                      f"waited {time.monotonic() - utterance.created:.1f}s)")
+                self._drop(utterance, "expired")
+                continue
+            utterance.status = "playing"
+            self.current = utterance
+            utterance.started.set()
+            utterance._floor.set()
+            try:
+                await utterance._done.wait()
+            finally:
+                self.current = None
+
+    def _cut_all(self) -> int:
+        cut = 0
+        for utterance in list(self._open):
+            if utterance.status not in ("queued", "playing"):
+                continue
+            if utterance is self.current and utterance.status == "playing":
+                self._cut(utterance, "interrupted")
+            else:
+                self._drop(utterance, "dropped")
+            cut += 1
+        return cut
+
+    def _cut(self, utterance: Utterance, status: str):
+        """Stop a line that is playing."""
+        if self.stop_playback is not None:
+            try:
+                self.stop_playback()
+            except Exception as e:
+                print(f"   ⚠️ Could not stop playback: {e}")
+        self._drop(utterance, status)
+
+    def _drop(self, utterance: Utterance, status: str):
+        if utterance.done or utterance.status not in ("queued", "playing"):
+            return
+        utterance.status = status
+        if status == "expired":
+            self.expired += 1
+        elif status == "interrupted":
+            self.interrupted += 1
+        else:
+            self.dropped += 1
+        utterance.speaker.cancel()
+
+    def _end(self, utterance: Utterance):
+        """The line's speaker has finished or was cancelled."""
+        if utterance.status == "playing":
+            utterance.status = "spoken"
+            self.said += 1
+            name = PRIORITY_NAMES.get(utterance.priority, "proactive")
+            self.said_by_priority[name] = self.said_by_priority.get(name, 0) + 1
+        elif utterance.status == "queued":
+            utterance.status = "empty"    # nothing to say (no sentence synthesized)
+        if utterance.status in ("spoken", "interrupted"):
+            self._last_said = (utterance.spoken_text, time.monotonic())
+        if utterance in self._open:
+            self._open.remove(utterance)
+        utterance.started.set()
+        utterance._floor.set()
+        utterance._done.set()
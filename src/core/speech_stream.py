@@ -0,0 +1,189 @@
+"""
+Friday's Streaming Speech
+Turns a streamed reply into audio sentence by sentence:
+- SentenceChunker cuts streamed text at sentence boundaries and removes
+  [ACTION:...], [WORKFLOW:...] and [SILENCE] markers as they arrive
+- StreamingSpeaker synthesizes the next sentence while the current one plays
+
+Time to first audio becomes "first sentence generated + synthesized"
+instead of "whole reply generated + synthesized".
+"""
+
+import asyncio
+import re
+import time
+from typing import Awaitable, Callable, List, Optional
+
+# Control markers the model may emit; never spoken
+MARKER_PATTERN = re.compile(r'\[(?:ACTION|WORKFLOW|SILENCE|Action )[^\]]*\]')
+
+# Sentence end: terminal punctuation (incl. Devanagari danda) followed by whitespace, or a line break
+SENTENCE_END = re.compile(r'(?<=[.!?।])\s+|\n+')
+
+# An unclosed "[" is held back until its "]" arrives, unless it grows past this (not a marker then)
+MAX_MARKER_CHARS = 120
+
+
+class SentenceChunker:
+    """
+    Incremental sentence splitter for streamed text.
+    feed() returns the sentences completed by a chunk; flush() returns the rest.
+    """
+
+    def __init__(self, min_chars: int = 12):
+        """
+        Args:
+            min_chars: Shorter sentences ("Sir.", "Done.") are merged with the next one
+        """
+        self.min_chars = min_chars
+        self._pending = ""   # raw text that may still hold an unfinished marker
+        self._buffer = ""    # marker-free text not yet emitted
+        self.sentences: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """Everything emitted so far."""
+        return " ".join(self.sentences)
+
+    def feed(self, delta: str) -> List[str]:
+        """Add a streamed chunk; returns complete sentences."""
+        self._pending += delta
+        ready = self._pending
+        open_at = ready.rfind("[")
+        if open_at != -1 and "]" not in ready[open_at:] and len(ready) - open_at < MAX_MARKER_CHARS:
+            ready, self._pending = ready[:open_at], ready[open_at:]
+        else:
+            self._pending = ""
+        self._buffer += MARKER_PATTERN.sub("", ready)
+        return self._take(final=False)
+
+    def flush(self) -> List[str]:
+        """End of stream: returns whatever is left as the last sentence."""
+        self._buffer += MARKER_PATTERN.sub("", self._pending)
+        self._pending = ""
+        return self._take(final=True)
+
+    def _take(self, final: bool) -> List[str]:
+        out = []
+        start = 0
+        for match in SENTENCE_END.finditer(self._buffer):
+            candidate = " ".join(self._buffer[start:match.start()].split())
+            if len(candidate) >= self.min_chars:
+                out.append(candidate)
+                start = match.end()
+        self._buffer = self._buffer[start:]
+
+        if final:
+            rest = " ".join(self._buffer.split())
+            self._buffer = ""
+            if rest:
+                out.append(rest)
+
+        # Drop fragments with nothing to say (e.g. punctuation left around a marker)
+        out = [sentence for sentence in out if re.search(r'\w', sentence)]
+        self.sentences.extend(out)
+        return out
+
+
+class StreamingSpeaker:
+    """
+    Friday's pipelined text-to-speech.
+    One task synthesizes sentences, another plays them; synthesis runs at most
+    `lookahead` sentences ahead of playback.
+    """
+
+    def __init__(self, synthesize: Callable[[str], Awaitable[bytes]],
+                 play: Callable[[bytes], Awaitable[None]],
+                 chunker: Optional[SentenceChunker] = None, lookahead: int = 2):
+        """
+        Args:
+            synthesize: async text -> encoded audio
+            play: async audio -> None (returns when playback finished)
+            chunker: Sentence splitter (default SentenceChunker())
+            lookahead: Synthesized sentences allowed to wait for playback
+        """
+        self.synthesize = synthesize
+        self.play = play
+        self.chunker = chunker or SentenceChunker()
+        self._sentences: asyncio.Queue = asyncio.Queue()
+        self._audio: asyncio.Queue = asyncio.Queue(maxsize=max(1, lookahead))
+        self._tasks: List[asyncio.Task] = []
+        self._finished = False
+        # Set when the first sentence starts playing (or when nothing is left to play)
+        self.audio_started = asyncio.Event()
+
+        # Stats
+        self.started = time.perf_counter()
+        self.first_audio_ms: Optional[float] = None
+        self.spoken: List[str] = []
+        self.errors = 0
+
+    def start(self):
+        """Start the synthesis and playback tasks (call from the event loop)."""
+        if not self._tasks:
+            self.started = time.perf_counter()
+            self._tasks = [
+                asyncio.create_task(self._synth_loop()),
+                asyncio.create_task(self._play_loop()),
+            ]
+
+    def feed(self, delta: str):
+        """Add streamed text; complete sentences are queued for synthesis."""
+        for sentence in self.chunker.feed(delta):
+            self._sentences.put_nowait(sentence)
+
+    def close(self):
+        """End of the stream: flush the last sentence (nothing more may be fed)."""
+        if not self._finished:
+            self._finished = True
+            for sentence in self.chunker.flush():
+                self._sentences.put_nowait(sentence)
+            self._sentences.put_nowait(None)
+
+    async def finish(self):
+        """Flush the last sentence and wait until everything has been played."""
+        self.close()
+        await self.wait()
+
+    async def wait(self):
+        """Wait until synthesis and playback have ended (finished or cancelled)."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def cancel(self):
+        """Stop synthesis and playback."""
+        for task in self._tasks:
+            task.cancel()
+
+    async def _synth_loop(self):
+        while True:
+            sentence = await self._sentences.get()
+            if sentence is None:
+                await self._audio.put(None)
+                return
+            try:
+                audio = await self.synthesize(sentence)
+            except Exception as e:
+                self.errors += 1
+                print(f"   ✗ TTS failed for \"{sentence[:40]}\": {e}")
+                continue
+            if audio:
+                await self._audio.put((sentence, audio))
+
+    async def _play_loop(self):
+        while True:
+            item = await self._audio.get()
+            if item is None:
+                self.audio_started.set()
+                return
+            sentence, audio = item
+            if self.first_audio_ms is None:
+                self.first_audio_ms = (time.perf_counter() - self.started) * 1000
+                print(f"   🔊 First audio after {self.first_audio_ms:.0f}ms")
+                self.audio_started.set()
+            try:
+                await self.play(audio)
+                self.spoken.append(sentence)
+            except Exception as e:
+                self.errors += 1
+                print(f"   ✗ Playback failed: {e}")
@@ -0,0 +1,363 @@
+"""
+Friday's Latency Tracing
+Span-based timing of every pipeline stage (capture, preprocess, encode,
+memory, window lookup, cloud call, actions, TTS synthesis and playback):
+- spans nest per task (a turn's stages share its trace id), so concurrent
+  user and proactive turns never mix
+- every stage feeds a log-bucketed HDR-style histogram (~1% relative error,
+  constant memory) for p50/p90/p99 without keeping samples
+- exports: JSONL span log (TRACE_FILE), Prometheus text snapshot file
+  (TRACE_PROM_FILE) and an optional local /metrics endpoint (TRACE_HTTP_PORT)
+
+Usage:
+    with get_tracer().span("encode", bytes=n):
+        ...
+"""
+
+import contextvars
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+# Bucket boundaries (seconds) of the exported Prometheus histograms
+PROMETHEUS_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+QUANTILES = [0.5, 0.9, 0.99]
+METRIC_PREFIX = "friday"
+
+_CURRENT_SPAN: contextvars.ContextVar = contextvars.ContextVar("trace_span", default=None)
+
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram: logarithmic buckets with a fixed relative
+    error, so 1ms and 10s are both recorded to ~1% without storing samples.
+    """
+
+    def __init__(self, relative_error: float = 0.01, min_value: float = 1e-6):
+        """
+        Args:
+            relative_error: Worst-case relative error of reported percentiles
+            min_value: Seconds; smaller values land in the first bucket
+        """
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        value = max(seconds, self.min_value)
+        index = math.ceil(math.log(value / self.min_value) / self._log_gamma)
+        with self._lock:
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+            self.count += 1
+            self.total += seconds
+            self.min = min(self.min, seconds)
+            self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Value at quantile q (0..1), or None when empty."""
+        with self._lock:
+            if not self.count:
+                return None
+            if q >= 1:
+                return self.max
+            rank = q * (self.count - 1)
+            seen = 0
+            for index in sorted(self.buckets):
+                seen += self.buckets[index]
+                if seen > rank:
+                    return min(self.max, max(self.min, self._value(index)))
+            return self.max
+
+    def cumulative(self, bounds: List[float]) -> List[int]:
+        """Counts at or below each bound (for Prometheus `le` buckets)."""
+        with self._lock:
+            items = sorted(self.buckets.items())
+        counts = []
+        for bound in bounds:
+            counts.append(sum(count for index, count in items if self._value(index) <= bound))
+        return counts
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def _value(self, index: int) -> float:
+        # Bucket midpoint: (gamma^(i-1), gamma^i] * min_value, within the relative error of any member
+        return self.min_value * 2 * self.gamma ** index / (self.gamma + 1)
+
+
+class Span:
+    """One timed stage."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "_started", "duration", "attrs", "error")
+
+    def __init__(self, name: str, trace_id: int, span_id: int, parent_id: Optional[int], attrs: Dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.attrs = attrs
+        self.error: Optional[str] = None
+
+    def set(self, **attrs):
+        """Attach attributes (status, backend, bytes...)."""
+        self.attrs.update(attrs)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds so far (the final duration once the span has ended)."""
+        return self.duration if self.duration is not None else time.perf_counter() - self._started
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace": f"{self.trace_id:x}",
+            "span": f"{self.span_id:x}",
+            "parent": f"{self.parent_id:x}" if self.parent_id is not None else None,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "ms": round(self.elapsed * 1000, 3),
+            "attrs": self.attrs,
+            "error": self.error,
+        }
+
+
+class Tracer:
+    """
+    Friday's span recorder and histogram registry.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, trace_file: Optional[str] = None,
+                 prometheus_file: Optional[str] = None, prometheus_interval: Optional[float] = None):
+        """
+        Initialize Tracer.
+
+        Args:
+            enabled: Record spans at all (TRACING, default on)
+            trace_file: Append finished spans as JSONL (TRACE_FILE, default off)
+            prometheus_file: Rewrite a Prometheus text snapshot here (TRACE_PROM_FILE, default off)
+            prometheus_interval: Seconds between snapshot rewrites (TRACE_PROM_INTERVAL, default 15)
+        """
+        if enabled is None:
+            enabled = os.getenv('TRACING', '1').lower() in ('1', 'true', 'yes', 'on')
+        self.enabled = enabled
+        self.trace_file = trace_file if trace_file is not None else (os.getenv('TRACE_FILE') or None)
+        self.prometheus_file = (prometheus_file if prometheus_file is not None
+                                else (os.getenv('TRACE_PROM_FILE') or None))
+        self.prometheus_interval = float(prometheus_interval or os.getenv('TRACE_PROM_INTERVAL', '15') or 15)
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+        self.deadline_misses: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._trace_handle = None
+        self._last_snapshot = time.monotonic()
+        self._server = None
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Time the enclosed block as stage `name` (nested under the current span, if any)."""
+        if not self.enabled:
+            # Still timed, so callers can print span.elapsed
+            yield Span(name, 0, 0, None, attrs)
+            return
+        parent = _CURRENT_SPAN.get()
+        span = Span(name, parent.trace_id if parent else next(self._ids), next(self._ids),
+                    parent.span_id if parent else None, attrs)
+        token = _CURRENT_SPAN.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            _CURRENT_SPAN.reset(token)
+            span.duration = time.perf_counter() - span._started
+            self._finish(span)
+
+    def observe(self, name: str, seconds: float):
+        """Record a latency that isn't a span (e.g. time to first token)."""
+        if self.enabled and seconds is not None:
+            self.histogram(name).record(seconds)
+
+    def deadline_missed(self, stage: str, overrun: float = 0.0):
+        """Count a turn abandoned because its deadline ran out in `stage`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.deadline_misses[stage] = self.deadline_misses.get(stage, 0) + 1
+        self.observe("deadline_overrun", overrun)
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Per-stage count, mean, p50/p90/p99 and max in milliseconds."""
+        stats = {}
+        for name, histogram in sorted(self.histograms.items()):
+            if not histogram.count:
+                continue
+            stats[name] = {
+                "count": histogram.count,
+                "errors": self.errors.get(name, 0),
+                "mean_ms": histogram.mean * 1000,
+                **{f"p{int(q * 100)}_ms": histogram.percentile(q) * 1000 for q in QUANTILES},
+                "max_ms": histogram.max * 1000,
+            }
+        return stats
+
+    def prometheus(self) -> str:
+        """All histograms in the Prometheus text exposition format."""
+        name = f"{METRIC_PREFIX}_stage_latency_seconds"
+        lines = [f"# HELP {name} Latency of each Friday pipeline stage.", f"# TYPE {name} histogram"]
+        for stage, histogram in sorted(self.histograms.items()):
+            for bound, count in zip(PROMETHEUS_BUCKETS, histogram.cumulative(PROMETHEUS_BUCKETS)):
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound:g}"}} {count}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.total:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+
+        quantile_name = f"{METRIC_PREFIX}_stage_latency_quantile_seconds"
+        lines += [f"# HELP {quantile_name} Latency percentiles of each stage (from the HDR histogram).",
+                  f"# TYPE {quantile_name} gauge"]
+        for stage, histogram in sorted(self.histograms.items()):
+            for q in QUANTILES:
+                value = histogram.percentile(q)
+                if value is not None:
+                    lines.append(f'{quantile_name}{{stage="{stage}",quantile="{q:g}"}} {value:.6f}')
+
+        errors_name = f"{METRIC_PREFIX}_stage_errors_total"
+        lines += [f"# HELP {errors_name} Spans that ended with an exception.", f"# TYPE {errors_name} counter"]
+        for stage, count in sorted(self.errors.items()):
+            lines.append(f'{errors_name}{{stage="{stage}"}} {count}')
+
+        missed_name = f"{METRIC_PREFIX}_deadline_exceeded_total"
+        lines += [f"# HELP {missed_name} Turns abandoned because the deadline ran out in this stage.",
+                  f"# TYPE {missed_name} counter"]
+        for stage, count in sorted(self.deadline_misses.items()):
+            lines.append(f'{missed_name}{{stage="{stage}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Optional[str] = None):
+        """Atomically rewrite the Prometheus snapshot file."""
+        path = path or self.prometheus_file
+        if not path:
+            return
+        try:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not write metrics to {path}: {e}")
+
+    def serve(self, port: Optional[int] = None, host: str = "127.0.0.1") -> Optional[int]:
+        """
+        Serve /metrics (Prometheus text) and /stats (JSON snapshot) on a
+        background thread (TRACE_HTTP_PORT; 0 = off). Returns the bound port.
+        """
+        port = int(port if port is not None else (os.getenv('TRACE_HTTP_PORT', '0') or 0))
+        if not port or self._server is not None:
+            return None
+        tracer = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics"):
+                    body, kind = tracer.prometheus().encode(), "text/plain; version=0.0.4"
+                elif self.path.startswith("/stats"):
+                    body, kind = json.dumps(tracer.snapshot(), indent=2).encode(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", kind)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as e:
+            print(f"⚠️ Metrics endpoint not started on port {port}: {e}")
+            return None
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        bound = self._server.server_address[1]
+        print(f"📈 Metrics: http://{host}:{bound}/metrics")
+        return bound
+
+    def close(self):
+        """Flush the exports and stop the endpoint."""
+        self.write_prometheus()
+        with self._lock:
+            if self._trace_handle is not None:
+                self._trace_handle.close()
+                self._trace_handle = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def report(self):
+        """Print the per-stage latency table."""
+        stats = self.snapshot()
+        if not stats:
+            return
+        print(f"📊 {'stage':<18}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for name, s in stats.items():
+            print(f"   {name:<18}{s['count']:>7}{s['p50_ms']:>10.1f}{s['p90_ms']:>10.1f}"
+                  f"{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}")
+        if self.deadline_misses:
+            missed = ", ".join(f"{stage} {count}" for stage, count in sorted(self.deadline_misses.items()))
+            print(f"⌛ Deadlines missed: {missed}")
+
+    def _finish(self, span: Span):
+        self.histogram(span.name).record(span.duration)
+        if span.error:
+            with self._lock:
+                self.errors[span.name] = self.errors.get(span.name, 0) + 1
+        if self.trace_file:
+            line = json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n"
+            with self._lock:
+                try:
+                    if self._trace_handle is None:
+                        self._trace_handle = open(self.trace_file, 'a', encoding='utf-8', buffering=1)
+                    self._trace_handle.write(line)
+                except OSError as e:
+                    print(f"⚠️ Trace log disabled ({self.trace_file}): {e}")
+                    self.trace_file = None
+        if self.prometheus_file and time.monotonic() - self._last_snapshot >= self.prometheus_interval:
+            self._last_snapshot = time.monotonic()
+            self.write_prometheus()
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer (configured from the environment on first use)."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
@@ -0,0 +1,216 @@
+"""
+Friday's TTS Cache
+Synthesized speech kept on disk, so phrases Friday says again and again
+("Done, Sir.", trigger alerts, intent confirmations) play in milliseconds
+instead of after an edge-tts round-trip:
+- content-addressed: one MP3 per sha256 of (text, voice, rate, pitch), so a
+  change of voice never replays the old one
+- size-bounded LRU on disk (file mtime is the recency), least recently
+  played files evicted first
+- hot set: phrases that were replayed or pre-warmed stay in memory
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+DEFAULT_DIR = os.path.join("training_data", "tts_cache")
+
+
+class TTSCache:
+    """
+    Disk LRU of synthesized sentences with an in-memory hot set.
+    get()/put() do file I/O: call them from a worker thread (asyncio.to_thread).
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None,
+                 hot_entries: Optional[int] = None, max_chars: Optional[int] = None):
+        """
+        Initialize TTSCache.
+
+        Args:
+            directory: Cache directory (TTS_CACHE_DIR, default training_data/tts_cache)
+            max_bytes: Disk budget (TTS_CACHE_MB, default 64 MB)
+            hot_entries: Phrases kept in memory (TTS_CACHE_HOT, default 64)
+            max_chars: Longer sentences are not cached, they rarely recur (TTS_CACHE_MAX_CHARS, default 200)
+        """
+        self.directory = directory or os.getenv('TTS_CACHE_DIR', DEFAULT_DIR) or DEFAULT_DIR
+        self.max_bytes = int(max_bytes or float(os.getenv('TTS_CACHE_MB', '64') or 64) * 1024 * 1024)
+        self.hot_entries = int(hot_entries or os.getenv('TTS_CACHE_HOT', '64') or 64)
+        self.max_chars = int(max_chars or os.getenv('TTS_CACHE_MAX_CHARS', '200') or 200)
+        self._lock = threading.Lock()
+        self._hot: "OrderedDict[str, bytes]" = OrderedDict()
+        self._index: "OrderedDict[str, int]" = OrderedDict()   # key -> bytes on disk, least recent first
+        self.disk_bytes = 0
+
+        # Stats
+        self.hot_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def key(text: str, voice: str, rate: str, pitch: str) -> str:
+        """Content address of one sentence in one voice."""
+        text = " ".join(text.split())
+        return hashlib.sha256("\x1f".join((text, voice, rate, pitch)).encode("utf-8")).hexdigest()
+
+    def cacheable(self, text: str) -> bool:
+        return bool(text and text.strip()) and len(text) <= self.max_chars
+
+    def get_hot(self, key: str) -> Optional[bytes]:
+        """Audio from the hot set only (no disk access: safe on the event loop)."""
+        with self._lock:
+            audio = self._hot.get(key)
+            if audio is not None:
+                self._hot.move_to_end(key)
+                if key in self._index:
+                    self._index.move_to_end(key)
+                self.hot_hits += 1
+        return audio
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached audio for `key`, or None. A disk hit joins the hot set."""
+        audio = self.get_hot(key)
+        if audio is not None:
+            return audio
+        with self._lock:
+            known = key in self._index
+        if not known:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                audio = f.read()
+        except OSError:
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+        self._touch(key)
+        with self._lock:
+            self.disk_hits += 1
+            self._remember(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes, hot: bool = False):
+        """Store audio on disk (and in the hot set when `hot`), evicting the least recently played."""
+        if not audio:
+            return
+        path = self._path(key)
+        partial = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(partial, "wb") as f:
+                f.write(audio)
+            os.replace(partial, path)
+        except OSError as e:
+            print(f"   ⚠️ TTS cache write failed: {e}")
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self.disk_bytes -= self._index.pop(key, 0)
+            self._index[key] = len(audio)
+            self.disk_bytes += len(audio)
+            self.stores += 1
+            if hot:
+                self._remember(key, audio)
+            evicted = self._evict()
+        for old in evicted:
+            try:
+                os.remove(self._path(old))
+            except OSError:
+                pass
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._index
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics."""
+        lookups = self.hot_hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._index),
+            "hot": len(self._hot),
+            "disk_mb": self.disk_bytes / (1024 * 1024),
+            "hot_hits": self.hot_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hot_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals (the _lock is held by the caller unless noted)
+    # ------------------------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def _load_index(self):
+        """Index the files already on disk, least recently played first (no lock needed: init)."""
+        files = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".tmp"):
+                # Left behind by an interrupted write
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            if not name.endswith(".mp3"):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self._index[key] = size
+            self.disk_bytes += size
+        for old in self._evict():
+            try:
+                os.remove(self._path(old))
+            except OSError:
+                pass
+
+    def _touch(self, key: str):
+        """Mark as just played (lock not held: updates the file mtime too)."""
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _remember(self, key: str, audio: bytes):
+        self._hot[key] = audio
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_entries:
+            self._hot.popitem(last=False)
+
+    def _forget(self, key: str):
+        self.disk_bytes -= self._index.pop(key, 0)
+        self._hot.pop(key, None)
+
+    def _evict(self) -> Iterable[str]:
+        """Drop least recently played entries until the disk budget is met; returns their keys."""
+        evicted = []
+        while self.disk_bytes > self.max_bytes and len(self._index) > 1:
+            key, _ = next(iter(self._index.items()))
+            self._forget(key)
+            self.evictions += 1
+            evicted.append(key)
+        return evicted
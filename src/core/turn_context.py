@@ -0,0 +1,91 @@
+"""
+Friday's Turn Context
+Memoized, concurrent context lookups for one turn (active window, current
+project, memory context, workflow templates):
+- each lookup runs at most once per turn, however many stages ask for it
+- prefetch() starts several on worker threads at once, so the turn waits for
+  the slowest lookup instead of their sum
+"""
+
+import asyncio
+import contextvars
+from typing import Any, Callable, Dict
+
+# Context of the turn the running task belongs to (set by TurnContext.begin)
+CURRENT_CONTEXT: contextvars.ContextVar = contextvars.ContextVar("turn_context", default=None)
+
+
+class TurnContext:
+    """
+    Per-turn lookup memo. Lookups that fail return None (and are not retried
+    within the turn); the turn goes on without that piece of context.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._token = None
+
+        # Stats
+        self.lookups = 0
+        self.reused = 0
+
+    @classmethod
+    def begin(cls) -> "TurnContext":
+        """Start a fresh context for the turn running in the current task."""
+        context = cls()
+        context._token = CURRENT_CONTEXT.set(context)
+        return context
+
+    @classmethod
+    def current(cls) -> "TurnContext":
+        """The running turn's context (a throwaway one outside a turn)."""
+        return CURRENT_CONTEXT.get() or cls()
+
+    def prefetch(self, name: str, func: Callable, *args, thread: bool = True) -> asyncio.Future:
+        """Start `func(*args)` as lookup `name` unless it already ran this turn."""
+        task = self._tasks.get(name)
+        if task is not None:
+            self.reused += 1
+            return task
+        self.lookups += 1
+        if thread:
+            task = asyncio.ensure_future(self._run(name, func, args))
+        else:
+            task = asyncio.get_running_loop().create_future()
+            task.set_result(self._call(name, func, args))
+        self._tasks[name] = task
+        return task
+
+    async def get(self, name: str, func: Callable, *args, thread: bool = True) -> Any:
+        """Result of lookup `name` (runs it now if nothing prefetched it)."""
+        # Shielded: a cancelled waiter must not cancel a lookup other stages still want
+        return await asyncio.shield(self.prefetch(name, func, *args, thread=thread))
+
+    async def gather(self, lookups: Dict[str, asyncio.Future]) -> Dict[str, Any]:
+        """Wait for several prefetched lookups at once: {name: result}."""
+        results = await asyncio.gather(*(asyncio.shield(task) for task in lookups.values()))
+        return dict(zip(lookups, results))
+
+    def close(self):
+        """End the turn: forget its lookups (still-running threads finish on their own)."""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+        self._tasks.clear()
+        if self._token is not None:
+            CURRENT_CONTEXT.reset(self._token)
+            self._token = None
+
+    async def _run(self, name: str, func: Callable, args: tuple) -> Any:
+        try:
+            return await asyncio.to_thread(func, *args)
+        except Exception as e:
+            print(f"      ⚠️ Context lookup '{name}' failed: {e}")
+            return None
+
+    def _call(self, name: str, func: Callable, args: tuple) -> Any:
+        try:
+            return func(*args)
+        except Exception as e:
+            print(f"      ⚠️ Context lookup '{name}' failed: {e}")
+            return None
@@ -0,0 +1,349 @@
+"""
+Friday's Turn Pipeline
+Runs a turn as three stages on their own tasks, joined by bounded queues:
+- perceive: capture and preprocess the screen
+- think: local intent / cache / cloud (generate_response)
+- speak: synthesize and play the reply
+
+While reply N is being spoken, turn N+1 is already being captured, encoded
+and sent to the cloud. A full queue makes the stage before it wait
+(backpressure), except for proactive observations: the oldest queued one is
+dropped instead, so a slow cloud call never builds a backlog of stale frames.
+When the user speaks, a proactive turn still being thought about is cancelled
+so the user's turn gets the think stage at once.
+Each turn carries its Deadline through all three stages (queue waits count).
+"""
+
+import asyncio
+import itertools
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from src.core.deadline import Deadline, DeadlineExceeded
+from src.core.request_scheduler import PRIORITY_USER, PRIORITY_PROACTIVE
+
+
+@dataclass
+class TurnJob:
+    """One turn moving through the pipeline."""
+    user_speech: Optional[str] = None
+    proactive: bool = False
+    greeting: bool = False
+    id: int = 0
+    submitted: float = field(default_factory=time.time)
+    turn: Optional[int] = None          # session recorder turn (see SessionRecorder.start_turn)
+    frame: Optional[Dict[str, Any]] = None
+    reply: Optional[str] = None
+    streamed: Any = (None, None)        # (playback task, text) when the reply was spoken while streaming
+    status: str = "queued"
+    enqueued: float = 0.0
+    deadline: Optional[Deadline] = None  # from submit() to the first word spoken
+    priority: int = PRIORITY_PROACTIVE   # speech priority of the reply (see SpeechScheduler)
+
+    @property
+    def droppable(self) -> bool:
+        """Proactive observations may be dropped; the user's turns never are."""
+        return self.user_speech is None
+
+
+class StageQueue:
+    """
+    Bounded hand-off between two stages.
+    put() waits while the queue is full, unless a droppable item can make room:
+    the oldest droppable item is dropped (or the new one, if nothing queued is droppable).
+    """
+
+    def __init__(self, name: str, maxsize: int, on_drop: Optional[Callable[[TurnJob], None]] = None):
+        self.name = name
+        self.maxsize = max(1, int(maxsize))
+        self.on_drop = on_drop
+        self._items: deque = deque()
+        self._changed = asyncio.Condition()
+
+        # Stats
+        self.put_count = 0
+        self.dropped = 0
+        self.waited = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    async def put(self, job: TurnJob) -> bool:
+        """Queue a job; returns False if it was dropped instead."""
+        async with self._changed:
+            while len(self._items) >= self.maxsize:
+                victim = next((queued for queued in self._items if queued.droppable), None)
+                if victim is not None:
+                    self._items.remove(victim)
+                    self._drop(victim)
+                elif job.droppable:
+                    self._drop(job)
+                    return False
+                else:
+                    self.waited += 1
+                    await self._changed.wait()
+            job.enqueued = time.perf_counter()
+            self._items.append(job)
+            self.put_count += 1
+            self._changed.notify_all()
+            return True
+
+    async def get(self) -> TurnJob:
+        """Oldest job (waits for one)."""
+        async with self._changed:
+            while not self._items:
+                await self._changed.wait()
+            job = self._items.popleft()
+            self._changed.notify_all()
+            return job
+
+    async def discard(self, predicate: Callable[[TurnJob], bool]) -> int:
+        """Drop queued jobs matching predicate; returns how many."""
+        async with self._changed:
+            stale = [job for job in self._items if predicate(job)]
+            for job in stale:
+                self._items.remove(job)
+                self._drop(job)
+            if stale:
+                self._changed.notify_all()
+            return len(stale)
+
+    def _drop(self, job: TurnJob):
+        self.dropped += 1
+        if self.on_drop is not None:
+            self.on_drop(job)
+
+
+class TurnPipeline:
+    """
+    Friday's staged turn runner.
+    submit() a turn and it flows perceive -> think -> speak; each stage works on
+    the next turn as soon as it has handed the current one on.
+    """
+
+    def __init__(self, partner, queue_size: Optional[int] = None, frame_slots: Optional[int] = None,
+                 reply_slots: Optional[int] = None, tracer=None):
+        """
+        Initialize TurnPipeline.
+
+        Args:
+            partner: InteractiveGamingPartner (prepare_frame, generate_response, speak)
+            queue_size: Turns waiting to be captured (PIPELINE_QUEUE_SIZE, default 2)
+            frame_slots: Captured frames waiting for the think stage (PIPELINE_FRAME_SLOTS, default 1)
+            reply_slots: Replies waiting to be spoken (PIPELINE_REPLY_SLOTS, default 2)
+            tracer: Tracer for queue waits (default: the partner's)
+        """
+        self.partner = partner
+        self.tracer = tracer or getattr(partner, 'tracer', None)
+        self.jobs = StageQueue("jobs", queue_size or int(os.getenv('PIPELINE_QUEUE_SIZE', '2') or 2),
+                               self._on_drop)
+        self.frames = StageQueue("frames", frame_slots or int(os.getenv('PIPELINE_FRAME_SLOTS', '1') or 1),
+                                 self._on_drop)
+        self.replies = StageQueue("replies", reply_slots or int(os.getenv('PIPELINE_REPLY_SLOTS', '2') or 2),
+                                  self._on_drop)
+        self.on_spoken: Optional[Callable[[TurnJob], None]] = None
+        self._ids = itertools.count(1)
+        self._tasks = []
+        self._in_flight = 0
+        self._idle: Optional[asyncio.Event] = None
+        self._thinking: Optional[TurnJob] = None
+        self._think_task: Optional[asyncio.Task] = None
+
+        # Stats
+        self.completed = 0
+        self.spoken = 0
+        self.silent = 0
+        self.stale = 0
+        self.expired = 0
+        self.preempted = 0
+        self.errors = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        """Start the stage tasks (call from the event loop)."""
+        if self._tasks:
+            return
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks = [
+            asyncio.create_task(self._perceive_loop()),
+            asyncio.create_task(self._think_loop()),
+            asyncio.create_task(self._speak_loop()),
+        ]
+
+    async def stop(self):
+        """Cancel the stage tasks (turns in progress are abandoned)."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def submit(self, user_speech: Optional[str] = None, proactive: bool = False,
+                     greeting: bool = False) -> TurnJob:
+        """
+        Queue a turn. The user's turns wait for room (backpressure), make queued
+        proactive turns stale and cancel the one being thought about; a proactive
+        turn replaces the oldest queued one.
+        """
+        if not self._tasks:
+            self.start()
+        job = TurnJob(user_speech=user_speech, proactive=proactive and not user_speech,
+                      greeting=greeting, id=next(self._ids), deadline=Deadline.for_turn(user_speech),
+                      priority=PRIORITY_USER if user_speech else PRIORITY_PROACTIVE)
+        self._in_flight += 1
+        self._idle.clear()
+        if user_speech:
+            self._preempt_think()
+            for stage in (self.jobs, self.frames):
+                await stage.discard(lambda queued: queued.droppable)
+        await self.jobs.put(job)
+        return job
+
+    async def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted turn has been spoken, silenced or dropped."""
+        if self._idle is None:
+            return True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self._in_flight,
+            "completed": self.completed,
+            "spoken": self.spoken,
+            "silent": self.silent,
+            "stale": self.stale,
+            "expired": self.expired,
+            "preempted": self.preempted,
+            "errors": self.errors,
+            "queues": {stage.name: {"depth": len(stage), "dropped": stage.dropped, "waited": stage.waited}
+                       for stage in (self.jobs, self.frames, self.replies)},
+        }
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    async def _perceive_loop(self):
+        while True:
+            job = await self._take(self.jobs)
+            try:
+                job.deadline.check("queue")
+                job.turn = self.partner.start_turn(job.user_speech, job.proactive)
+                job.frame = await self.partner.prepare_frame(deadline=job.deadline)
+            except DeadlineExceeded as e:
+                self._expire(job, e)
+                continue
+            except Exception as e:
+                # The think stage captures again on its own
+                print(f"⚠️ Pipeline capture failed: {e}")
+            job.status = "captured"
+            await self.frames.put(job)
+
+    async def _think_loop(self):
+        while True:
+            job = await self._take(self.frames)
+            try:
+                job.deadline.check("queue")
+            except DeadlineExceeded as e:
+                self._expire(job, e)
+                continue
+            # A turn that runs over is reported by generate_response and comes back empty
+            self._thinking = job
+            self._think_task = asyncio.ensure_future(self.partner.generate_response(
+                job.user_speech, job.proactive, frame=job.frame, turn=job.turn, deadline=job.deadline))
+            try:
+                job.reply = await self._think_task
+                job.streamed = self.partner.take_streamed_speech()
+                job.priority = getattr(self.partner, 'last_reply_priority', job.priority)
+            except asyncio.CancelledError:
+                if job.status != "preempted":
+                    raise
+                job.frame = None
+                self.preempted += 1
+                self._finish(job, "preempted")
+                continue
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ Pipeline turn failed: {e}")
+            finally:
+                self._thinking, self._think_task = None, None
+            job.frame = None
+            if job.deadline.missed:
+                self.expired += 1
+                self._finish(job, "expired")
+                continue
+            if not job.reply and job.streamed[0] is None:
+                if job.greeting:
+                    print("⚠️ Initial greeting failed - check logs above!\n")
+                elif job.user_speech:
+                    print("⚠️ No response generated for user speech")
+                self.silent += 1
+                self._finish(job, "silent")
+                continue
+            job.status = "answered"
+            await self.replies.put(job)
+
+    async def _speak_loop(self):
+        while True:
+            job = await self._take(self.replies)
+            if job.droppable and getattr(self.partner, '_last_user_turn', 0.0) > job.submitted:
+                print("   - Proactive reply dropped: the user spoke in the meantime")
+                self.stale += 1
+                self._finish(job, "stale")
+                continue
+            try:
+                await self.partner.speak(job.reply, streamed=job.streamed, deadline=job.deadline,
+                                         priority=job.priority)
+                self.spoken += 1
+                if self.on_spoken is not None:
+                    self.on_spoken(job)
+            except DeadlineExceeded as e:
+                self._expire(job, e)
+                continue
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ Pipeline speech failed: {e}")
+            self._finish(job, "spoken")
+
+    def _preempt_think(self):
+        """Cancel the proactive turn in the think stage (its cloud call included)."""
+        job, task = self._thinking, self._think_task
+        if job is None or not job.droppable or task is None or task.done():
+            return
+        if task.cancel():
+            job.status = "preempted"
+            print("   ✋ Proactive turn cancelled: the user is speaking")
+
+    async def _take(self, stage: StageQueue) -> TurnJob:
+        job = await stage.get()
+        if self.tracer is not None:
+            self.tracer.observe(f"queue_{stage.name}", time.perf_counter() - job.enqueued)
+        return job
+
+    def _expire(self, job: TurnJob, error: DeadlineExceeded):
+        print(f"⌛ Turn abandoned ({'user' if job.user_speech else 'proactive'}): {error}")
+        if self.tracer is not None:
+            self.tracer.deadline_missed(error.stage, error.overrun)
+        self.expired += 1
+        self._finish(job, "expired")
+
+    def _on_drop(self, job: TurnJob):
+        self._finish(job, "dropped")
+
+    def _finish(self, job: TurnJob, status: str):
+        job.status = status
+        self.completed += 1
+        self._in_flight -= 1
+        if self._in_flight <= 0 and self._idle is not None:
+            self._in_flight = 0
+            self._idle.set()
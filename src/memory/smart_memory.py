@@ -535,7 +535,8 @@ class SmartMemory:
         except Exception as e:
             print(f"⚠️ Failed to set profile: {e}")
     
-    def format_context_for_prompt(self, query: str, recent_n: int = 3, relevant_k: int = 3) -> str:
+    def format_context_for_prompt(self, query: str, recent_n: int = 3, relevant_k: int = 3,
+                                  include_project: bool = True) -> str:
         """
         Format memory context for inclusion in AI prompt.
         
@@ -543,6 +544,7 @@ class SmartMemory:
             query: Current user query
             recent_n: Number of recent interactions to include
             relevant_k: Number of relevant past interactions to include
+            include_project: Look up and add the current project (off when the caller already has it)
             
         Returns:
             Formatted context string
@@ -550,7 +552,7 @@ class SmartMemory:
         parts = []
         
         # Add current project
-        current_project = self.get_current_project()
+        current_project = self.get_current_project() if include_project else None
         if current_project:
             parts.append(f"Current Project: {current_project}")
         
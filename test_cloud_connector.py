@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Cloud Connector Test Suite - Friday's Async, Pooled Cloud Calls
+Runs against a local HTTP server, no API key or network needed.
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.cloud_connector import CloudMindConnector, MarkerParser
+
+
+class FakeGroqHandler(BaseHTTPRequestHandler):
+    """OpenAI-style chat completion endpoint with keep-alive and a configurable delay."""
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    connections = set()
+    stream_chunks = ["Right away, Sir. ", "Opening ", "Firefox now.", " [ACTION:open_application|app_name=firefox]"]
+
+    def do_POST(self):
+        FakeGroqHandler.connections.add(self.client_address)
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length))
+        time.sleep(FakeGroqHandler.delay)
+        if request.get("stream"):
+            return self._stream(FakeGroqHandler.stream_chunks)
+        body = json.dumps({
+            "choices": [{"message": {"content": f"Done, Sir. ({len(request['messages'])} messages)"}}]
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, chunks):
+        """Server-sent events, one delta per event, written with small gaps."""
+        events = [f"data: {json.dumps({'choices': [{'delta': {'content': chunk}}]})}\n\n".encode() for chunk in chunks]
+        events.append(b"data: [DONE]\n\n")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(sum(len(event) for event in events)))
+        self.end_headers()
+        for event in events:
+            self.wfile.write(event)
+            self.wfile.flush()
+            time.sleep(0.05)
+
+    def log_message(self, *args):
+        pass
+
+
+class QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        pass  # clients hanging up on purpose (timeout tests)
+
+
+def start_server():
+    server = QuietServer(("127.0.0.1", 0), FakeGroqHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_connector(server):
+    connector = CloudMindConnector(api_key="test-key")
+    connector.endpoint = f"http://127.0.0.1:{server.server_address[1]}/openai/v1/chat/completions"
+    return connector
+
+
+def test_sync_think_reuses_connection():
+    """Test the blocking wrapper on the pooled session."""
+    print("\n" + "="*60)
+    print("🧪 CLOUD: SYNC THINK ON A POOLED SESSION")
+    print("="*60)
+
+    server = start_server()
+    FakeGroqHandler.connections = set()
+    FakeGroqHandler.delay = 0.0
+    connector = make_connector(server)
+
+    for _ in range(3):
+        reply, status, _ = connector.think("screen", "hello")
+        assert status == "success", reply
+    print(f"   3 calls over {len(FakeGroqHandler.connections)} connection(s)")
+    assert len(FakeGroqHandler.connections) == 1
+    assert len(connector.request_history) == 3
+
+    connector.close()
+    server.shutdown()
+    print("\n✅ Sync think tests complete")
+
+
+def test_async_think_keeps_loop_responsive():
+    """Test that think_async lets other tasks run while a call is in flight."""
+    print("\n" + "="*60)
+    print("🧪 CLOUD: ASYNC THINK")
+    print("="*60)
+
+    server = start_server()
+    FakeGroqHandler.connections = set()
+    FakeGroqHandler.delay = 0.3
+    connector = make_connector(server)
+
+    async def run():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        beat = asyncio.create_task(heartbeat())
+        results = [await connector.think_async("screen", "hello", image_b64=b"aGVsbG8=") for _ in range(2)]
+        beat.cancel()
+        await connector.aclose()
+        return results, ticks
+
+    results, ticks = asyncio.run(run())
+    print(f"   Replies: {[r[0] for r in results]}")
+    print(f"   Heartbeat ticks during 2 calls: {ticks}, connections: {len(FakeGroqHandler.connections)}")
+    assert all(status == "success" for _, status, _ in results)
+    assert ticks >= 30, "event loop was blocked during the cloud call"
+    assert len(FakeGroqHandler.connections) == 1
+    assert connector.request_history[-1]["payload_bytes"] == 8
+
+    print("\n[Test 2] Read timeout surfaces as a reply, not an exception...")
+    FakeGroqHandler.delay = 0.5
+    connector = make_connector(server)
+    connector.read_timeout = 0.1
+
+    async def slow():
+        try:
+            return await connector.think_async("screen", "hello")
+        finally:
+            await connector.aclose()
+
+    reply, status, _ = asyncio.run(slow())
+    print(f"   {status}: {reply}")
+    assert status == "ERROR" and "timed out" in reply
+
+    server.shutdown()
+    print("\n✅ Async think tests complete")
+
+
+def test_streamed_think():
+    """Test SSE streaming: deltas arrive before the call returns, full reply and action at the end."""
+    print("\n" + "="*60)
+    print("🧪 CLOUD: STREAMED THINK")
+    print("="*60)
+
+    server = start_server()
+    FakeGroqHandler.delay = 0.0
+    connector = make_connector(server)
+    deltas = []
+
+    async def run():
+        try:
+            return await connector.think_async("screen", "open firefox",
+                                               on_delta=lambda text: deltas.append((time.time(), text)))
+        finally:
+            await connector.aclose()
+
+    reply, status, action = asyncio.run(run())
+    finished = time.time()
+    print(f"   {len(deltas)} deltas, reply: {reply!r}")
+    print(f"   Action: {action}")
+    assert status == "success"
+    assert "".join(text for _, text in deltas).strip() == reply
+    assert action["intent"] == "open_application"
+    assert finished - deltas[0][0] >= 0.1, "first delta should arrive well before the stream ends"
+    assert connector.request_history[-1]["first_token"] < connector.request_history[-1]["latency"]
+
+    server.shutdown()
+    print("\n✅ Streamed think tests complete")
+
+
+def test_incremental_marker_parser():
+    """Test that markers are emitted as soon as their closing bracket arrives."""
+    print("\n" + "="*60)
+    print("🧪 CLOUD: INCREMENTAL MARKER PARSER")
+    print("="*60)
+
+    print("\n[Test 1] Several actions, split across chunks...")
+    parser = MarkerParser()
+    chunks = ["On it, Sir. [ACTION:open_app", "lication|app_name=chrome", "] Searching [now]. [ACTION:search_web|query=rust ",
+              "async] [WORKFLOW:research_topic|topic=AI] [SILENCE]"]
+    per_chunk = [[action["intent"] for action in parser.feed(chunk)] for chunk in chunks]
+    print(f"   Per chunk: {per_chunk}")
+    assert per_chunk == [[], [], ["open_application"], ["search_web", "execute_workflow"]]
+    assert parser.actions[1]["params"] == {"query": "rust async"}
+    assert parser.actions[2]["params"] == {"template_id": "research_topic", "context": {"topic": "AI"}}
+
+    print("\n[Test 2] Final-text extraction keeps its old contract...")
+    connector = CloudMindConnector(api_key="test-key")
+    text = "Done [ACTION:lock_screen] and [WORKFLOW:setup_streaming]"
+    assert connector._extract_action(text)["intent"] == "execute_workflow"
+    assert [a["intent"] for a in connector._extract_actions(text)] == ["lock_screen", "execute_workflow"]
+    assert connector._extract_action("Just a normal response without action") is None
+
+    print("\n✅ Marker parser tests complete")
+
+
+def test_ollama_provider():
+    """Test the local Ollama provider on the same OpenAI-compatible code path."""
+    print("\n" + "="*60)
+    print("🧪 CLOUD: OLLAMA PROVIDER")
+    print("="*60)
+
+    server = start_server()
+    FakeGroqHandler.delay = 0.0
+    os.environ["OLLAMA_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/openai"
+    try:
+        connector = CloudMindConnector(provider="ollama")
+    finally:
+        del os.environ["OLLAMA_BASE_URL"]
+    print(f"   Endpoint: {connector.endpoint}, model: {connector.model}")
+    assert connector.endpoint.endswith("/openai/v1/chat/completions")
+
+    async def run():
+        try:
+            return await connector.think_async("screen", "hello")
+        finally:
+            await connector.aclose()
+
+    reply, status, _ = asyncio.run(run())
+    print(f"   {status}: {reply}")
+    assert status == "success"
+
+    server.shutdown()
+    print("\n✅ Ollama provider tests complete")
+
+
+if __name__ == "__main__":
+    print("\n🤖 SARTHAKA - Cloud Connector Test Suite")
+
+    test_sync_think_reuses_connection()
+    test_async_think_keeps_loop_responsive()
+    test_streamed_think()
+    test_incremental_marker_parser()
+    test_ollama_provider()
+
+    print("\n" + "="*60)
+    print("🎉 ALL CLOUD CONNECTOR TESTS COMPLETE")
+    print("="*60)
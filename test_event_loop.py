@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Event Loop Test Suite - Friday's Wake-Ups
+Tests the asyncio bridge that replaced the 50 ms poll: STT results from a
+thread, proactive timers and screen-change wake-ups (no mic or screen needed).
+"""
+
+import sys
+import os
+import time
+import queue
+import asyncio
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.interactive_gaming_partner import InteractiveGamingPartner
+from src.core.capture_backends import CaptureBackend
+from src.core.screen_capture import ScreenCaptureService, CapturedFrame
+
+
+def bare_partner():
+    """Only the event-bridge state: the full constructor opens the mic, TTS and every engine."""
+    partner = InteractiveGamingPartner.__new__(InteractiveGamingPartner)
+    partner.speech_queue = queue.Queue()
+    partner._loop = None
+    partner.speech_events = None
+    partner.screen_changed = None
+    partner.proactive_on_change = True
+    partner.change_wake_bits = 10
+    partner.proactive_min_gap = 10.0
+    partner._watch_fingerprint = None
+    partner._last_user_turn = 0.0
+    return partner
+
+
+def make_frame(seed):
+    pixels = np.random.default_rng(seed).integers(0, 256, (90, 160, 4), dtype=np.uint8)
+    return CapturedFrame(sequence=0, timestamp=time.time(), width=160, height=90, raw=pixels.tobytes())
+
+
+class NoiseBackend(CaptureBackend):
+    """Streams a new random frame every grab."""
+    name = "noise"
+
+    def __init__(self):
+        self.grabs = 0
+
+    def grab(self):
+        time.sleep(0.01)
+        self.grabs += 1
+        return make_frame(self.grabs)
+
+
+def test_speech_and_timer():
+    """Test that speech wakes the loop at once and the timer still fires."""
+    print("\n" + "="*60)
+    print("🧪 EVENT LOOP: SPEECH AND TIMER")
+    print("="*60)
+
+    partner = bare_partner()
+    partner._deliver_speech("before the loop")
+
+    async def session():
+        partner.bind_event_loop()
+        first = await partner.next_event(timeout=1.0)
+
+        started = time.time()
+        threading.Timer(0.05, partner._deliver_speech, args=("open firefox",)).start()
+        second = await partner.next_event(timeout=5.0)
+        woke_after = time.time() - started
+
+        started = time.time()
+        third = await partner.next_event(timeout=0.05)
+        return first, second, woke_after, third, time.time() - started
+
+    first, second, woke_after, third, timer_after = asyncio.run(session())
+
+    print("\n[Test 1] Speech heard before the loop started is kept...")
+    assert first == ("speech", "before the loop")
+
+    print("\n[Test 2] Speech from the recognizer thread wakes the loop...")
+    print(f"   Woke after {woke_after * 1000:.0f}ms")
+    assert second == ("speech", "open firefox") and woke_after < 1.0
+    assert partner._last_user_turn > 0
+
+    print("\n[Test 3] Without events the timer fires...")
+    assert third == ("timer", None) and timer_after < 1.0
+
+    print("\n✅ Speech and timer tests complete")
+
+
+def test_screen_change():
+    """Test that only a real screen change wakes the loop, and the minimum gap holds."""
+    print("\n" + "="*60)
+    print("🧪 EVENT LOOP: SCREEN CHANGE")
+    print("="*60)
+
+    partner = bare_partner()
+
+    async def session():
+        partner.bind_event_loop()
+        frame = make_frame(1)
+        await asyncio.to_thread(partner._on_captured_frame, frame)
+        await asyncio.to_thread(partner._on_captured_frame, frame)
+        unchanged = await partner.next_event(timeout=0.1)
+        await asyncio.to_thread(partner._on_captured_frame, make_frame(2))
+        changed = await partner.next_event(timeout=5.0)
+        return unchanged, changed
+
+    unchanged, changed = asyncio.run(session())
+
+    print("\n[Test 1] Same frame again: no wake-up...")
+    assert unchanged == ("timer", None)
+
+    print("\n[Test 2] Different frame: the loop wakes with a screen event...")
+    assert changed == ("screen", None)
+
+    print("\n[Test 3] Change-driven checks respect the minimum gap...")
+    now = time.time()
+    assert partner.proactive_due("screen", now - 15, interval=20)
+    assert not partner.proactive_due("screen", now - 2, interval=20)
+    assert partner.proactive_due("timer", now - 21, interval=20)
+    assert not partner.proactive_due("timer", now - 15, interval=20)
+
+    print("\n[Test 4] The capture service hands every frame to its listeners...")
+    seen = []
+    service = ScreenCaptureService(fps=50, buffer_size=2, backend=NoiseBackend())
+    service.add_listener(seen.append)
+    service.add_listener(lambda frame: 1 / 0)
+    assert service.start()
+    frame = service.wait_for_frame(after_sequence=3, timeout=2.0)
+    service.stop()
+    print(f"   {len(seen)} frames delivered")
+    assert frame is not None and len(seen) >= 3
+    assert [f.sequence for f in seen] == sorted(f.sequence for f in seen)
+
+    print("\n✅ Screen change tests complete")
+
+
+if __name__ == "__main__":
+    print("\n🤖 SARTHAKA - Event Loop Test Suite")
+
+    test_speech_and_timer()
+    test_screen_change()
+
+    print("\n" + "="*60)
+    print("🎉 ALL EVENT LOOP TESTS COMPLETE")
+    print("="*60)
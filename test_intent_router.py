@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Intent Router Test Suite - Friday's Local Fast Path
+Tests English, Hinglish and Devanagari commands, cloud fallback for anything
+ambiguous, and the decision log (nothing is executed).
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.action_executor import ActionExecutor
+from src.core.intent_router import LocalIntentRouter
+
+
+def test_direct_commands_route_locally():
+    """Test that plain commands are resolved without the cloud."""
+    print("\n" + "="*60)
+    print("🧪 INTENT ROUTER: DIRECT COMMANDS")
+    print("="*60)
+
+    router = LocalIntentRouter(ActionExecutor(), threshold=0.85, log_path=None)
+    cases = [
+        ("Open calculator", "open_application", {"app_name": "calculator"}),
+        ("please launch google chrome", "open_application", {"app_name": "chrome"}),
+        ("close firefox", "close_application", {"app_name": "firefox"}),
+        ("volume up", "volume_control", {"action": "up"}),
+        ("awaaz kam karo", "volume_control", {"action": "down"}),
+        ("agla gaana chalao", "media_control", {"command": "next"}),
+        ("gaana roko", "media_control", {"command": "pause"}),
+        ("take a screenshot", "screenshot", {}),
+        ("कैलकुलेटर ओपन करो", "open_application", {"app_name": "calculator"}),
+        ("क्रोम खोलो", "open_application", {"app_name": "chrome"}),
+        ("आवाज़ बढ़ाओ", "volume_control", {"action": "up"}),
+    ]
+    for text, intent, params in cases:
+        match = router.route(text)
+        print(f"   {text!r} -> {match.intent if match else None} {match.params if match else ''} "
+              f"({match.confidence if match else 0:.2f}, {match.latency_ms if match else 0:.2f}ms)")
+        assert match is not None and match.routed, text
+        assert match.intent == intent and match.params == params, text
+        assert match.reply.endswith("Sir.")
+
+    print("\n✅ Direct command tests complete")
+
+
+def test_ambiguous_requests_go_to_cloud():
+    """Test that questions, negations and compound requests are left to the cloud."""
+    print("\n" + "="*60)
+    print("🧪 INTENT ROUTER: CLOUD FALLBACK")
+    print("="*60)
+
+    router = LocalIntentRouter(ActionExecutor(), threshold=0.85, log_path=None)
+    for text in ["how do I open the terminal?", "chrome mat kholo", "what's on my screen",
+                 "open chrome and search for rust async", "pause the song and play the next one",
+                 "open my thesis draft", "हेलो", "",
+                 "my friend said search engine optimization is dead", "इस सॉन्ग को प्ले करो"]:
+        match = router.route(text)
+        print(f"   {text!r} -> {match.intent if match else None} ({match.confidence if match else 0:.2f})")
+        assert match is None or not match.routed, text
+
+    stats = router.get_stats()
+    print(f"   Stats: {stats}")
+    assert stats["routed"] == 0 and stats["decisions"] == 10
+
+    print("\n✅ Cloud fallback tests complete")
+
+
+def test_stop_and_search():
+    """Test that a bare "stop" stops Friday talking and search queries keep to one side of the verb."""
+    from src.core.intent_router import STOP_SPEAKING
+
+    print("\n" + "="*60)
+    print("🧪 INTENT ROUTER: STOP AND SEARCH")
+    print("="*60)
+
+    router = LocalIntentRouter(ActionExecutor(), threshold=0.85, log_path=None)
+
+    print("\n[Test 1] A bare \"stop\" is for Friday's voice, not the music...")
+    for text in ["stop", "Friday, stop!", "stop talking", "bas karo", "चुप"]:
+        match = router.route(text)
+        assert match is not None and match.routed and match.intent == STOP_SPEAKING, text
+        assert match.reply == ""
+    assert router.route("stop the music").params == {"command": "stop"}
+
+    print("\n[Test 2] Search queries in English and Hindi word order...")
+    for text, query in [("search rust async", "rust async"), ("python tutorial सर्च करो", "python tutorial")]:
+        match = router.route(text)
+        print(f"   {text!r} -> {match.params} ({match.confidence:.2f})")
+        assert match.routed and match.params == {"query": query}, text
+
+    print("\n✅ Stop and search tests complete")
+
+
+def test_decision_log():
+    """Test that every decision is appended to the JSONL log."""
+    print("\n" + "="*60)
+    print("🧪 INTENT ROUTER: DECISION LOG")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "router.jsonl")
+        router = LocalIntentRouter(ActionExecutor(), log_path=log_path)
+        router.route("mute")
+        router.route("why is the build red")
+
+        with open(log_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        print(f"   {entries}")
+        assert [e["routed"] for e in entries] == [True, False]
+        assert entries[0]["intent"] == "volume_control" and entries[0]["params"] == {"action": "mute"}
+        assert entries[1]["intent"] is None
+
+    print("\n✅ Decision log tests complete")
+
+
+if __name__ == "__main__":
+    print("\n🤖 SARTHAKA - Intent Router Test Suite")
+
+    test_direct_commands_route_locally()
+    test_ambiguous_requests_go_to_cloud()
+    test_stop_and_search()
+    test_decision_log()
+
+    print("\n" + "="*60)
+    print("🎉 ALL INTENT ROUTER TESTS COMPLETE")
+    print("="*60)
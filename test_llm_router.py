@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+LLM Router Test Suite - Friday's Backend Selection and Failover
+Tests circuit breakers, failover, latency-aware ordering and proactive
+routing with fake backends (no network needed).
+"""
+
+import sys
+import os
+import time
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.llm_router import CircuitBreaker, LLMRouter
+
+
+class FakeBackend:
+    """think_async() stand-in with a switchable failure mode and latency."""
+
+    def __init__(self, name, healthy=True, delay=0.0, chunks=None):
+        self.name = name
+        self.healthy = healthy
+        self.delay = delay
+        self.chunks = chunks
+        self.calls = 0
+
+    async def think_async(self, on_delta=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.chunks and on_delta is not None:
+            for chunk in self.chunks:
+                on_delta(chunk)
+        if not self.healthy:
+            return "Sir, the cloud connection has timed out.", "ERROR", None
+        return f"{self.name} reply", "success", None
+
+
+def test_failover_and_circuit():
+    """Test failover to the next backend and circuit open / half-open / close."""
+    print("\n" + "="*60)
+    print("🧪 LLM ROUTER: FAILOVER AND CIRCUIT BREAKER")
+    print("="*60)
+
+    groq, ollama = FakeBackend("groq", healthy=False), FakeBackend("ollama")
+    router = LLMRouter({"groq": groq, "ollama": ollama}, order=["groq", "ollama"],
+                       failure_threshold=2, cooldown=0.2)
+
+    async def run(n):
+        return [await router.think(user_speech="hi") for _ in range(n)]
+
+    print("\n[Test 1] Failures fail over, then the circuit skips the broken backend...")
+    replies = asyncio.run(run(4))
+    print(f"   Replies: {[r[0] for r in replies]}, groq calls: {groq.calls}")
+    assert all(reply == "ollama reply" for reply, _, _ in replies)
+    assert groq.calls == 2 and router.breakers["groq"].state == CircuitBreaker.OPEN
+
+    print("\n[Test 2] After the cool-down one probe closes the circuit again...")
+    groq.healthy = True
+    time.sleep(0.25)
+    reply, status, _ = asyncio.run(router.think(user_speech="hi"))
+    print(f"   {reply} ({router.breakers['groq'].state})")
+    assert reply == "groq reply" and router.breakers["groq"].state == CircuitBreaker.CLOSED
+
+    print("\n[Test 3] Everything down returns the last error...")
+    groq.healthy = ollama.healthy = False
+    reply, status, _ = asyncio.run(router.think(user_speech="hi"))
+    assert status == "ERROR" and router.all_failed == 1
+
+    print("\n[Test 4] No failover once text has been streamed...")
+    router = LLMRouter({"groq": FakeBackend("groq", healthy=False, chunks=["Half a sent"]),
+                        "ollama": FakeBackend("ollama")}, order=["groq", "ollama"])
+    deltas = []
+    reply, status, _ = asyncio.run(router.think(on_delta=deltas.append, user_speech="hi"))
+    assert status == "ERROR" and deltas == ["Half a sent"]
+    assert router.backends["ollama"].calls == 0
+
+    print("\n✅ Failover tests complete")
+
+
+def test_latency_and_priority_ordering():
+    """Test that slow backends are demoted and proactive traffic uses its own order."""
+    print("\n" + "="*60)
+    print("🧪 LLM ROUTER: LATENCY-AWARE ORDER")
+    print("="*60)
+
+    groq, ollama = FakeBackend("groq", delay=0.05), FakeBackend("ollama")
+    router = LLMRouter({"groq": groq, "ollama": ollama}, order=["groq", "ollama"],
+                       proactive_order=["ollama", "groq"], slow_p95=0.02)
+
+    async def run():
+        first = await router.think(user_speech="hi")
+        second = await router.think(user_speech="hi")
+        proactive = await router.think(priority="proactive", user_speech=None)
+        return first, second, proactive
+
+    first, second, proactive = asyncio.run(run())
+    stats = router.get_stats()
+    print(f"   User: {first[0]} then {second[0]}, proactive: {proactive[0]}")
+    print(f"   groq p95: {stats['backends']['groq']['p95']:.3f}s")
+    assert first[0] == "groq reply"
+    assert second[0] == "ollama reply", "groq's p95 is above LLM_SLOW_P95, the healthy faster backend goes first"
+    assert proactive[0] == "ollama reply"
+
+    print("\n✅ Ordering tests complete")
+
+
+if __name__ == "__main__":
+    print("\n🤖 SARTHAKA - LLM Router Test Suite")
+
+    test_failover_and_circuit()
+    test_latency_and_priority_ordering()
+
+    print("\n" + "="*60)
+    print("🎉 ALL LLM ROUTER TESTS COMPLETE")
+    print("="*60)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Request Scheduler Test Suite - Friday's Priority Admission and Rate Limits
+Tests priority ordering, proactive preemption, token buckets and 429
+Retry-After handling (no network needed).
+"""
+
+import sys
+import os
+import time
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.cloud_connector import CloudMindConnector
+from src.core.llm_router import LLMRouter
+from src.core.request_scheduler import (RequestScheduler, RequestPreempted, TokenBucket,
+                                        PRIORITY_USER, PRIORITY_TRIGGER, PRIORITY_PROACTIVE)
+
+
+def test_priority_and_preemption():
+    """Test that the user is admitted first and cancels proactive work."""
+    print("\n" + "="*60)
+    print("🧪 SCHEDULER: PRIORITY AND PREEMPTION")
+    print("="*60)
+
+    async def run():
+        scheduler = RequestScheduler(max_concurrent=1)
+        order = []
+
+        async def job(name, delay):
+            await asyncio.sleep(delay)
+            order.append(name)
+            return name
+
+        print("\n[Test 1] Waiting requests are admitted by priority...")
+        blocker = asyncio.create_task(scheduler.run(PRIORITY_TRIGGER, lambda: job("blocker", 0.05)))
+        await asyncio.sleep(0)
+        queued = [asyncio.create_task(scheduler.run(priority, lambda n=name: job(n, 0.0)))
+                  for name, priority in [("proactive", PRIORITY_PROACTIVE), ("trigger", PRIORITY_TRIGGER)]]
+        await asyncio.gather(blocker, *queued)
+        print(f"   Order: {order}")
+        assert order == ["blocker", "trigger", "proactive"]
+
+        print("\n[Test 2] The user cancels in-flight and queued proactive requests...")
+        order.clear()
+        in_flight = asyncio.create_task(scheduler.run(PRIORITY_PROACTIVE, lambda: job("proactive", 1.0)))
+        await asyncio.sleep(0.01)
+        queued = asyncio.create_task(scheduler.run(PRIORITY_PROACTIVE, lambda: job("proactive-2", 0.0)))
+        await asyncio.sleep(0.01)
+        started = time.perf_counter()
+        user = await scheduler.run(PRIORITY_USER, lambda: job("user", 0.05))
+        waited = time.perf_counter() - started
+        results = await asyncio.gather(in_flight, queued, return_exceptions=True)
+        print(f"   User reply after {waited * 1000:.0f}ms, proactive: {[type(r).__name__ for r in results]}")
+        assert user == "user" and waited < 0.5
+        assert all(isinstance(r, RequestPreempted) for r in results)
+        assert scheduler.get_stats()["running"] == 0 and scheduler.preempted == 2
+
+    asyncio.run(run())
+    print("\n✅ Priority tests complete")
+
+
+def test_rate_limits():
+    """Test the token bucket, Retry-After parsing and rate-limit failover."""
+    print("\n" + "="*60)
+    print("🧪 SCHEDULER: TOKEN BUCKET AND RETRY-AFTER")
+    print("="*60)
+
+    print("\n[Test 1] Burst, then refill at the configured rate...")
+    bucket = TokenBucket(rate_per_min=600, burst=2)
+    assert bucket.try_take() and bucket.try_take() and not bucket.try_take()
+    time.sleep(0.12)
+    assert bucket.try_take()
+
+    print("\n[Test 2] Retry-After pauses the bucket...")
+    assert CloudMindConnector._retry_after({"retry-after": "7"}) == 7.0
+    assert CloudMindConnector._retry_after({}) == 10.0
+    bucket.pause(0.2)
+    assert not bucket.try_take() and bucket.wait_time() > 0.1
+
+    print("\n[Test 3] A 429 fails over without opening the circuit...")
+
+    class Limited:
+        rate_limited_until = 0.0
+
+        async def think_async(self, on_delta=None, **kwargs):
+            self.rate_limited_until = time.time() + 30
+            return "Sir, I'm being rate limited by the cloud.", "RATE_LIMITED", None
+
+    class Local:
+        async def think_async(self, on_delta=None, **kwargs):
+            return "local reply", "success", None
+
+    groq_bucket = TokenBucket(rate_per_min=30, burst=5)
+    router = LLMRouter({"groq": Limited(), "ollama": Local()}, order=["groq", "ollama"],
+                       limits={"groq": groq_bucket})
+    first = asyncio.run(router.think(user_speech="hi"))
+    second = asyncio.run(router.think(user_speech="hi"))
+    print(f"   {first[0]!r}, {second[0]!r}, groq wait {groq_bucket.wait_time():.0f}s")
+    assert first[0] == second[0] == "local reply"
+    assert router.breakers["groq"].state == "closed" and groq_bucket.wait_time() > 25
+    assert router.rate_limited == 2
+
+    print("\n✅ Rate limit tests complete")
+
+
+if __name__ == "__main__":
+    print("\n🤖 SARTHAKA - Request Scheduler Test Suite")
+
+    test_priority_and_preemption()
+    test_rate_limits()
+
+    print("\n" + "="*60)
+    print("🎉 ALL REQUEST SCHEDULER TESTS COMPLETE")
+    print("="*60)
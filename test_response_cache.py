@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Response Cache Test Suite - Friday's Cloud Reply Cache
+Tests fingerprint tolerance, key normalization, TTL/LRU eviction, the
+no-actions rule and that localized changes bypass the cache (no network needed).
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.response_cache import ResponseCache, frame_fingerprint
+from src.core.change_detector import TileChangeDetector
+from src.core.interactive_gaming_partner import InteractiveGamingPartner
+
+
+def make_screen(label="Error: NameError", noise=0):
+    img = Image.new('RGB', (640, 360), (30, 30, 36))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((40, 40, 400, 200), fill=(220, 220, 220))
+    draw.rectangle((420, 220, 620, 340), fill=(60, 120, 200))
+    draw.text((60, 60), label, fill=(200, 30, 30))
+    if noise:
+        rng = np.random.default_rng(0)
+        pixels = np.asarray(img).astype(np.int16) + rng.integers(-noise, noise + 1, (360, 640, 3))
+        img = Image.fromarray(pixels.clip(0, 255).astype(np.uint8))
+    return img
+
+
+def test_cache_keys():
+    """Test that near-identical frames and rephrased speech hit, other contexts miss."""
+    print("\n" + "="*60)
+    print("🧪 RESPONSE CACHE: KEYS")
+    print("="*60)
+
+    cache = ResponseCache(ttl=60, max_entries=8, max_distance=4)
+    screen = make_screen()
+    cache.put(cache.make_key(screen, "main.py - VS Code", "What's this error?"), "That is a NameError, Sir.")
+
+    noisy = make_screen(noise=3)
+    distance = bin(frame_fingerprint(screen) ^ frame_fingerprint(noisy)).count("1")
+    print(f"   Fingerprint distance with JPEG-like noise: {distance} bits")
+    assert cache.get(cache.make_key(noisy, "main.py - VS Code", "friday, what's this error")) is not None
+
+    other_screen = make_screen().transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+    assert cache.get(cache.make_key(other_screen, "main.py - VS Code", "what's this error")) is None
+    assert cache.get(cache.make_key(screen, "Firefox", "what's this error")) is None
+    assert cache.get(cache.make_key(screen, "main.py - VS Code", "how do I fix it")) is None
+
+    stats = cache.get_stats()
+    print(f"   Stats: {stats}")
+    assert stats["hits"] == 1 and stats["misses"] == 3
+
+    print("\n[Test 2] User turns never get a proactive reply...")
+    cache.put(cache.make_key(screen, "main.py - VS Code", None), "[SILENCE]")
+    for filler_only in ("kya hai?", "Hey Friday", "okay"):
+        key = cache.make_key(screen, "main.py - VS Code", filler_only)
+        assert key is not None and key.mode == "user" and key.speech
+        assert cache.get(key) is None
+    assert cache.make_key(screen, "main.py - VS Code", " ?! ") is None
+
+    print("\n[Test 3] Words that change the request are kept...")
+    cache.put(cache.make_key(screen, "Settings", "turn it on"), "Bluetooth is on, Sir.")
+    assert cache.get(cache.make_key(screen, "Settings", "turn it off")) is None
+    assert cache.get(cache.make_key(screen, "Settings", "Friday, turn it on please")) == "Bluetooth is on, Sir."
+
+    print("\n✅ Cache key tests complete")
+
+
+def test_cache_policy():
+    """Test that actions are never cached and entries expire / get evicted."""
+    print("\n" + "="*60)
+    print("🧪 RESPONSE CACHE: TTL, LRU AND ACTIONS")
+    print("="*60)
+
+    cache = ResponseCache(ttl=0.2, max_entries=2)
+    screen = make_screen()
+
+    print("\n[Test 1] Replies with actions are rejected...")
+    assert not cache.put(cache.make_key(screen, "", "open chrome"), "Opening [ACTION:open_application|app_name=chrome]")
+    assert not cache.put(cache.make_key(screen, "", "set up"), "Sure [WORKFLOW:setup_streaming]")
+    assert cache.put(cache.make_key(screen, "", None), "[SILENCE]")
+
+    print("\n[Test 2] LRU keeps the recently used entry...")
+    cache.put(cache.make_key(screen, "", "first"), "one")
+    assert cache.get(cache.make_key(screen, "", None)) == "[SILENCE]"
+    cache.put(cache.make_key(screen, "", "second"), "two")
+    assert cache.get(cache.make_key(screen, "", "first")) is None
+    assert cache.get(cache.make_key(screen, "", None)) == "[SILENCE]"
+
+    print("\n[Test 3] TTL expiry...")
+    time.sleep(0.25)
+    assert cache.get(cache.make_key(screen, "", "second")) is None
+    stats = cache.get_stats()
+    print(f"   Stats: {stats}")
+    assert stats["rejected"] == 2 and stats["evictions"] == 1 and stats["expired"] == 2
+
+    print("\n✅ Cache policy tests complete")
+
+
+def make_ide(popup=False):
+    """768x432 editor-like frame; `popup` pastes a small red error box (about 5% of the screen)."""
+    img = Image.new('RGB', (768, 432), (30, 30, 36))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((0, 0, 160, 432), fill=(45, 45, 52))
+    for line in range(24):
+        width = 200 + (line * 37) % 380
+        draw.rectangle((190, 12 + line * 17, 190 + width, 22 + line * 17), fill=(150, 160, 175))
+    if popup:
+        draw.rectangle((520, 330, 700, 422), fill=(200, 30, 30))
+        draw.text((530, 360), "ERROR: build failed", fill=(255, 255, 255))
+    return img
+
+
+def test_localized_change_bypasses_cache():
+    """Test that a small popup on an unchanged frame is not answered from the cache."""
+    print("\n" + "="*60)
+    print("🧪 RESPONSE CACHE: LOCALIZED CHANGES")
+    print("="*60)
+
+    partner = InteractiveGamingPartner.__new__(InteractiveGamingPartner)
+    partner.response_cache = ResponseCache(ttl=120, max_entries=8, max_distance=4)
+    detector = TileChangeDetector()
+    screen, popup = make_ide(), make_ide(popup=True)
+
+    detector.analyze_image(screen)
+    partner.response_cache.put(partner._response_cache_key(screen, "main.py - VS Code", None), "[SILENCE]")
+    report = detector.analyze_image(popup)
+
+    distance = bin(frame_fingerprint(screen) ^ frame_fingerprint(popup)).count("1")
+    print(f"\n[Test 1] Popup moves the fingerprint {distance} bits; detector: {report.summary()}")
+    assert report.reason == "localized change" and report.dirty_tiles
+    # The whole-frame fingerprint alone would replay the cached [SILENCE]
+    assert partner.response_cache.get(ResponseCache.make_key(popup, "main.py - VS Code", None)) == "[SILENCE]"
+
+    print("\n[Test 2] With the change report the popup frame is a cache miss...")
+    assert partner._response_cache_key(popup, "main.py - VS Code", None, report) is None
+
+    print("\n[Test 3] Unchanged frames still use the cache...")
+    unchanged = detector.analyze_image(popup)
+    key = partner._response_cache_key(popup, "main.py - VS Code", None, unchanged)
+    assert unchanged.reason == "no change" and key is not None
+
+    print("\n✅ Localized change tests complete")
+
+
+if __name__ == "__main__":
+    print("\n🤖 SARTHAKA - Response Cache Test Suite")
+
+    test_cache_keys()
+    test_cache_policy()
+    test_localized_change_bypasses_cache()
+
+    print("\n" + "="*60)
+    print("🎉 ALL RESPONSE CACHE TESTS COMPLETE")
+    print("="*60)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Speech Scheduler Test Suite - Friday's Voice
+Tests priority order, dedup, stale lines and barge-in with stand-in TTS and
+player (no edge-tts or speakers needed).
+"""
+
+import sys
+import os
+import time
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.deadline import Deadline
+from src.core.request_scheduler import PRIORITY_USER, PRIORITY_TRIGGER, PRIORITY_PROACTIVE
+from src.core.speech_scheduler import SpeechScheduler
+
+
+class FakeVoice:
+    """TTS returns the sentence as bytes; playback takes `play` seconds and can be cut."""
+
+    def __init__(self, synth=0.01, play=0.05):
+        self.synth_delay = synth
+        self.play_delay = play
+        self.played = []
+        self.stops = 0
+        self.playing = None
+
+    async def synthesize(self, text):
+        await asyncio.sleep(self.synth_delay)
+        return text.encode()
+
+    async def play(self, audio):
+        self.playing = audio.decode()
+        try:
+            await asyncio.sleep(self.play_delay)
+            self.played.append(self.playing)
+        finally:
+            self.playing = None
+
+    def stop(self):
+        self.stops += 1
+
+    def scheduler(self):
+        return SpeechScheduler(self.synthesize, self.play, stop=self.stop)
+
+
+def test_priority_and_dedup():
+    """Test that queued lines play by priority, one at a time, each once."""
+    print("\n" + "="*60)
+    print("🧪 SPEECH SCHEDULER: PRIORITY AND DEDUP")
+    print("="*60)
+
+    voice = FakeVoice()
+    speech = voice.scheduler()
+
+    async def session():
+        first = speech.say("Looks like a long compile.", PRIORITY_PROACTIVE)
+        await first.started.wait()
+        # Queued while the first line plays, lowest priority first
+        lines = [speech.say("Nice progress on the tests.", PRIORITY_PROACTIVE),
+                 speech.say("The build just failed.", PRIORITY_TRIGGER),
+                 speech.say("Sure, opening the docs.", PRIORITY_USER)]
+        again = speech.say("the build just FAILED", PRIORITY_TRIGGER)
+        statuses = [await line.wait() for line in [first] + lines]
+        await speech.stop()
+        return lines, again, statuses
+
+    lines, again, statuses = asyncio.run(session())
+
+    print(f"\n[Test 1] Played in order: {voice.played}")
+    assert voice.played == ["Looks like a long compile.", "Sure, opening the docs.",
+                            "The build just failed.", "Nice progress on the tests."]
+    assert statuses == ["spoken"] * 4
+
+    print("\n[Test 2] The same line queued twice is said once...")
+    assert again is lines[1] and speech.deduped == 1
+    print(f"   {speech.get_stats()}")
+    assert speech.said == 4 and speech.said_by_priority == {"user": 1, "trigger": 1, "proactive": 2}
+
+    print("\n[Test 3] A streamed reply waits for the floor like any other line...")
+    voice = FakeVoice()
+    speech = voice.scheduler()
+
+    async def streamed():
+        remark = speech.say("Still compiling.", PRIORITY_PROACTIVE)
+        await remark.started.wait()
+        speaker = speech.stream(PRIORITY_USER)
+        for delta in ("Your branch is ", "up to date. ", "Want me to push it?"):
+            speaker.feed(delta)
+            await asyncio.sleep(0.01)
+        await speaker.finish()
+        await speech.stop()
+
+    asyncio.run(streamed())
+    assert voice.played == ["Still compiling.", "Your branch is up to date.", "Want me to push it?"]
+
+    print("\n✅ Priority and dedup tests complete")
+
+
+def test_stale_lines_and_barge_in():
+    """Test that stale lines are dropped and the user can talk over Friday."""
+    print("\n" + "="*60)
+    print("🧪 SPEECH SCHEDULER: STALE LINES AND BARGE-IN")
+    print("="*60)
+
+    print("\n[Test 1] A remark that waited too long is dropped, not said late...")
+    voice = FakeVoice(play=0.2)
+    speech = voice.scheduler()
+    speech.max_age[PRIORITY_PROACTIVE] = 0.1
+
+    async def stale():
+        reply = speech.say("Here is the summary you asked for.", PRIORITY_USER)
+        await reply.started.wait()
+        remark = speech.say("By the way, nice font.", PRIORITY_PROACTIVE)
+        late = speech.say("Your answer is ready.", PRIORITY_USER, deadline=Deadline(0.1))
+        results = await reply.wait(), await remark.wait(), await late.wait()
+        await speech.stop()
+        return results
+
+    assert asyncio.run(stale()) == ("spoken", "expired", "expired")
+    assert voice.played == ["Here is the summary you asked for."] and speech.expired == 2
+
+    print("\n[Test 2] Barge-in stops playback at once and drops the queue...")
+    voice = FakeVoice(play=1.0)
+    speech = voice.scheduler()
+
+    async def interrupted():
+        line = speech.say("Let me walk you through the whole stack trace.", PRIORITY_USER)
+        queued = speech.say("Also, the tests are green.", PRIORITY_PROACTIVE)
+        await line.started.wait()
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        cut = speech.barge_in()
+        statuses = await line.wait(), await queued.wait()
+        stopped = time.perf_counter() - started
+        await speech.stop()
+        return cut, statuses, stopped
+
+    cut, statuses, stopped = asyncio.run(interrupted())
+    print(f"   Cut {cut} line(s) in {stopped * 1000:.0f}ms: {statuses}")
+    assert cut == 2 and statuses == ("interrupted", "dropped")
+    assert voice.stops == 1 and voice.played == [] and stopped < 0.2
+    assert speech.barge_ins == 1
+
+    print("\n[Test 3] Friday's own voice is not a barge-in...")
+    voice = FakeVoice(play=0.3)
+    speech = voice.scheduler()
+
+    async def echo():
+        line = speech.say("The deployment finished without errors.", PRIORITY_USER)
+        await line.started.wait()
+        heard = (speech.is_echo("deployment finished without errors"),
+                 speech.is_echo("wait, stop"),
+                 speech.is_echo(""))
+        await line.wait()
+        after = speech.is_echo("the deployment finished")
+        await speech.stop()
+        return heard, after
+
+    heard, after = asyncio.run(echo())
+    assert heard == (True, False, False) and after is True
+
+    print("\n✅ Stale line and barge-in tests complete")
+
+
+if __name__ == "__main__":
+    print("\n🤖 SARTHAKA - Speech Scheduler Test Suite")
+
+    test_priority_and_dedup()
+    test_stale_lines_and_barge_in()
+
+    print("\n" + "="*60)
+    print("🎉 ALL SPEECH SCHEDULER TESTS COMPLETE")
+    print("="*60)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tracing Test Suite - Friday's Per-Stage Latency
+Tests the HDR-style histogram, span nesting across concurrent turns and the
+JSONL / Prometheus / HTTP exports (no network needed).
+"""
+
+import sys
+import os
+import json
+import random
+import asyncio
+import tempfile
+
+import numpy as np
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.tracing import LatencyHistogram, Tracer
+
+
+def test_histogram():
+    """Test percentile accuracy over four decades of latency."""
+    print("\n" + "="*60)
+    print("🧪 TRACING: HDR HISTOGRAM")
+    print("="*60)
+
+    rng = random.Random(5)
+    samples = [rng.lognormvariate(-3, 1.5) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in samples:
+        histogram.record(value)
+
+    print(f"\n[Test 1] {histogram.count} samples in {len(histogram.buckets)} buckets...")
+    assert histogram.count == 20000 and len(histogram.buckets) < 1000
+    for q in (0.5, 0.9, 0.99):
+        exact = float(np.percentile(samples, q * 100, method="lower"))
+        estimate = histogram.percentile(q)
+        print(f"   p{int(q * 100)}: {estimate * 1000:.2f}ms (exact {exact * 1000:.2f}ms)")
+        assert abs(estimate - exact) / exact < 0.02
+    assert histogram.percentile(1.0) == max(samples)
+    assert LatencyHistogram().percentile(0.5) is None
+
+    print("\n[Test 2] Cumulative buckets...")
+    counts = histogram.cumulative([0.01, 0.1, 100.0])
+    assert counts[0] <= counts[1] <= counts[2] == histogram.count
+
+    print("\n✅ Histogram tests complete")
+
+
+def test_spans_and_exports():
+    """Test span nesting per task, error counts and the three exports."""
+    print("\n" + "="*60)
+    print("🧪 TRACING: SPANS AND EXPORTS")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        trace_file = os.path.join(directory, "trace.jsonl")
+        prom_file = os.path.join(directory, "metrics.prom")
+        tracer = Tracer(enabled=True, trace_file=trace_file, prometheus_file=prom_file)
+
+        async def turn(mode, delay):
+            with tracer.span("turn", mode=mode):
+                with tracer.span("capture"):
+                    await asyncio.sleep(delay)
+                with tracer.span("cloud") as span:
+                    await asyncio.sleep(delay)
+                    span.set(status="success")
+
+        async def session():
+            await asyncio.gather(turn("user", 0.02), turn("proactive", 0.01))
+
+        print("\n[Test 1] Concurrent turns keep separate traces...")
+        asyncio.run(session())
+        try:
+            with tracer.span("action", intent="open_application"):
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        tracer.observe("cloud_first_token", 0.3)
+        tracer.close()
+
+        with open(trace_file, encoding="utf-8") as f:
+            spans = [json.loads(line) for line in f]
+        roots = {s["span"]: s for s in spans if s["name"] == "turn"}
+        children = [s for s in spans if s["name"] in ("capture", "cloud")]
+        print(f"   {len(spans)} spans, {len(roots)} traces")
+        assert len(roots) == 2 and len(children) == 4
+        for child in children:
+            root = roots[child["parent"]]
+            assert child["trace"] == root["trace"]
+        assert {roots[c["parent"]]["attrs"]["mode"] for c in children} == {"user", "proactive"}
+        assert any(s["attrs"].get("status") == "success" for s in spans)
+        assert next(s for s in spans if s["name"] == "action")["error"] == "RuntimeError"
+
+        print("\n[Test 2] Snapshot and Prometheus text...")
+        stats = tracer.snapshot()
+        print(f"   {sorted(stats)}")
+        assert stats["turn"]["count"] == 2 and stats["action"]["errors"] == 1
+        assert stats["turn"]["p50_ms"] >= stats["capture"]["p50_ms"]
+        with open(prom_file, encoding="utf-8") as f:
+            text = f.read()
+        assert 'friday_stage_latency_seconds_count{stage="turn"} 2' in text
+        assert 'friday_stage_latency_seconds_bucket{stage="cloud",le="+Inf"} 2' in text
+        assert 'friday_stage_errors_total{stage="action"} 1' in text
+        assert 'stage="cloud_first_token"' in text
+
+        print("\n[Test 3] Local /metrics endpoint...")
+        port = tracer.serve(port=_free_port())
+        try:
+            metrics = requests.get(f"http://127.0.0.1:{port}/metrics", timeout=5)
+            assert metrics.status_code == 200 and "friday_stage_latency_seconds" in metrics.text
+            assert requests.get(f"http://127.0.0.1:{port}/stats", timeout=5).json()["turn"]["count"] == 2
+        finally:
+            tracer.close()
+
+    print("\n[Test 4] Disabled tracer still times spans but records nothing...")
+    tracer = Tracer(enabled=False)
+    with tracer.span("capture") as span:
+        pass
+    assert span.elapsed >= 0 and tracer.snapshot() == {}
+
+    print("\n✅ Span and export tests complete")
+
+
+def _free_port():
+    import socket
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+if __name__ == "__main__":
+    print("\n🤖 SARTHAKA - Tracing Test Suite")
+
+    test_histogram()
+    test_spans_and_exports()
+
+    print("\n" + "="*60)
+    print("🎉 ALL TRACING TESTS COMPLETE")
+    print("="*60)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+TTS Cache Test Suite - Friday's Recurring Phrases
+Tests content-addressed keys, the disk LRU with its hot set, pre-warming and
+that cached sentences skip synthesis (temporary directory, no edge-tts needed).
+"""
+
+import sys
+import os
+import time
+import asyncio
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.tts_cache import TTSCache
+from src.core.tracing import Tracer
+from src.core.proactivity_engine import ProactivityEngine
+from src.core.interactive_gaming_partner import InteractiveGamingPartner
+
+VOICE = ("en-IN-NeerjaNeural", "+8%", "+0Hz")
+
+
+def test_keys_and_lru():
+    """Test keys, disk hits, the hot set and eviction by size."""
+    print("\n" + "="*60)
+    print("🧪 TTS CACHE: KEYS AND LRU")
+    print("="*60)
+
+    print("\n[Test 1] Keys depend on text, voice, rate and pitch...")
+    key = TTSCache.key("Done, Sir.", *VOICE)
+    assert key == TTSCache.key("Done,  Sir. ", *VOICE)
+    assert key != TTSCache.key("Done, Sir.", "en-IN-NeerjaNeural", "-5%", "+0Hz")
+    assert key != TTSCache.key("Done, Sir.", "en-GB-SoniaNeural", "+8%", "+0Hz")
+    assert key != TTSCache.key("Done, sir.", *VOICE) and len(key) == 64
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("\n[Test 2] Stored audio survives a restart; a replay joins the hot set...")
+        cache = TTSCache(directory, max_bytes=10_000, hot_entries=2)
+        assert cache.get(key) is None and cache.misses == 1
+        cache.put(key, b"mp3" * 100)
+        restarted = TTSCache(directory, max_bytes=10_000, hot_entries=2)
+        assert key in restarted and restarted.get_hot(key) is None
+        assert restarted.get(key) == b"mp3" * 100 and restarted.disk_hits == 1
+        assert restarted.get_hot(key) == b"mp3" * 100 and restarted.hot_hits == 1
+
+        print("\n[Test 3] The least recently played sentences are evicted first...")
+        cache = TTSCache(directory, max_bytes=1000, hot_entries=2)
+        keys = [TTSCache.key(f"Phrase {i}.", *VOICE) for i in range(4)]
+        for k in keys[:3]:
+            cache.put(k, b"x" * 300)
+        cache.get(keys[0])                 # played again: most recent now
+        cache.put(keys[3], b"x" * 300)     # over budget: evicts the oldest unplayed one
+        print(f"   {cache.get_stats()}")
+        assert keys[0] in cache and keys[1] not in cache and keys[2] in cache and keys[3] in cache
+        assert cache.evictions >= 1 and cache.disk_bytes <= 1000
+        assert not any(name.endswith(".tmp") for name in os.listdir(directory))
+        assert len([name for name in os.listdir(directory) if name.endswith(".mp3")]) == len(cache._index)
+
+        print("\n[Test 4] Long sentences are not cached...")
+        assert not cache.cacheable("word " * 100) and cache.cacheable("Build successful, Sir.")
+
+    print("\n✅ Keys and LRU tests complete")
+
+
+def voice_partner(cache, round_trip=0.2):
+    """Only the TTS state: the full constructor opens the mic, TTS and every engine."""
+    partner = InteractiveGamingPartner.__new__(InteractiveGamingPartner)
+    partner.tts_voice, partner.tts_rate, partner.tts_pitch = VOICE
+    partner.tts_timeout = 5.0
+    partner.tts_mood_voice = False
+    partner.tts_cache = cache
+    partner.tts_prewarm = True
+    partner._prewarm_task = None
+    partner.tracer = Tracer(enabled=False)
+    partner.synthesized = []
+
+    async def edge_tts(text, voice=None, rate=None, pitch=None):
+        partner.synthesized.append(text)
+        await asyncio.sleep(round_trip)   # network round-trip
+        return f"audio of {text}".encode()
+
+    partner._edge_tts = edge_tts
+    return partner
+
+
+def test_cached_synthesis():
+    """Test that cached sentences skip the synthesis round-trip, and pre-warming."""
+    print("\n" + "="*60)
+    print("🧪 TTS CACHE: CACHED SYNTHESIS")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        partner = voice_partner(TTSCache(directory))
+
+        async def say_three_times():
+            timings = []
+            for _ in range(3):
+                started = time.perf_counter()
+                audio = await partner._synthesize_speech("Build successful, Sir.")
+                timings.append(time.perf_counter() - started)
+            return audio, timings
+
+        audio, timings = asyncio.run(say_three_times())
+        print(f"\n[Test 1] Synthesis {timings[0] * 1000:.0f}ms, then {timings[1] * 1000:.1f}ms and {timings[2] * 1000:.2f}ms...")
+        assert audio == b"audio of Build successful, Sir." and partner.synthesized == ["Build successful, Sir."]
+        assert timings[1] < 0.05 and timings[2] < 0.05
+        assert partner.tts_cache.disk_hits == 1 and partner.tts_cache.hot_hits == 1
+
+        print("\n[Test 2] Long sentences are synthesized every time...")
+        long_sentence = "This is a long explanation of the stack trace. " * 5
+        asyncio.run(partner._synthesize_speech(long_sentence))
+        assert partner.tts_cache.key(long_sentence, *VOICE) not in partner.tts_cache
+
+    with tempfile.TemporaryDirectory() as directory:
+        partner = voice_partner(TTSCache(directory), round_trip=0.01)
+        partner.proactivity_engine = ProactivityEngine()
+        phrases = partner._canned_phrases()
+
+        print(f"\n[Test 3] Pre-warming {len(phrases)} canned sentences, split as they are spoken...")
+        assert "Done, Sir." in phrases and "Muted, Sir." in phrases
+        assert "Would you like me to help debug it?" in phrases
+        assert not any("{" in phrase for phrase in phrases)
+        assert len(phrases) == len(set(phrases))
+
+        async def warm_then_confirm():
+            await partner.prewarm_tts()
+            partner.synthesized.clear()
+            started = time.perf_counter()
+            audio = await partner._synthesize_speech("Volume up, Sir.")
+            return audio, time.perf_counter() - started
+
+        audio, took = asyncio.run(warm_then_confirm())
+        print(f"   First 'Volume up, Sir.' after {took * 1000:.2f}ms")
+        assert audio == b"audio of Volume up, Sir." and partner.synthesized == [] and took < 0.05
+        assert partner.tts_cache.get_stats()["hot"] == min(len(phrases), partner.tts_cache.hot_entries)
+
+    print("\n✅ Cached synthesis tests complete")
+
+
+if __name__ == "__main__":
+    print("\n🤖 SARTHAKA - TTS Cache Test Suite")
+
+    test_keys_and_lru()
+    test_cached_synthesis()
+
+    print("\n" + "="*60)
+    print("🎉 ALL TTS CACHE TESTS COMPLETE")
+    print("="*60)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Turn Context Test Suite - Friday's Context Fan-Out
+Tests that a turn's context lookups run concurrently, once per turn, and
+stay separate between overlapping turns (no xdotool or database needed).
+"""
+
+import sys
+import os
+import time
+import asyncio
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.turn_context import TurnContext, CURRENT_CONTEXT
+
+
+class SlowLookups:
+    """Blocking lookups like xdotool and SQLite: 100ms each, counted per name."""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, name):
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        time.sleep(self.delay)
+        return f"{name} value"
+
+    def broken(self):
+        raise RuntimeError("xdotool not found")
+
+
+def test_fan_out_and_memo():
+    """Test that lookups overlap and each runs once per turn."""
+    print("\n" + "="*60)
+    print("🧪 TURN CONTEXT: FAN-OUT AND MEMO")
+    print("="*60)
+
+    source = SlowLookups()
+
+    async def turn():
+        context = TurnContext.begin()
+        try:
+            started = time.perf_counter()
+            lookups = {name: context.prefetch(name, source.lookup, name)
+                       for name in ("window", "project", "memory")}
+            lookups["workflows"] = context.prefetch("workflows", lambda: ["start_coding"], thread=False)
+            found = await context.gather(lookups)
+            fan_out = time.perf_counter() - started
+
+            # Later stages asking again get the memoized result at once
+            started = time.perf_counter()
+            again = await TurnContext.current().get("window", source.lookup, "window")
+            reuse = time.perf_counter() - started
+            failed = await context.get("broken", source.broken)
+            return found, fan_out, again, reuse, failed, context
+        finally:
+            context.close()
+
+    found, fan_out, again, reuse, failed, context = asyncio.run(turn())
+
+    print(f"\n[Test 1] Four lookups in {fan_out * 1000:.0f}ms (serial: {3 * source.delay * 1000:.0f}ms)...")
+    assert found == {"window": "window value", "project": "project value",
+                     "memory": "memory value", "workflows": ["start_coding"]}
+    assert fan_out < 2 * source.delay
+
+    print("\n[Test 2] Asking again reuses the turn's result...")
+    assert again == "window value" and reuse < source.delay / 2
+    assert source.calls == {"window": 1, "project": 1, "memory": 1}
+    assert context.reused == 1
+
+    print("\n[Test 3] A failed lookup gives None instead of failing the turn...")
+    assert failed is None
+
+    print("\n✅ Fan-out and memo tests complete")
+
+
+def test_turn_isolation():
+    """Test that overlapping turns each get their own lookups."""
+    print("\n" + "="*60)
+    print("🧪 TURN CONTEXT: TURN ISOLATION")
+    print("="*60)
+
+    source = SlowLookups(delay=0.05)
+
+    async def turn():
+        context = TurnContext.begin()
+        try:
+            await asyncio.sleep(0.01)
+            assert TurnContext.current() is context
+            return await TurnContext.current().get("window", source.lookup, "window")
+        finally:
+            context.close()
+
+    async def session():
+        results = await asyncio.gather(turn(), turn())
+        return results, CURRENT_CONTEXT.get()
+
+    print("\n[Test 1] Two concurrent turns look the window up once each...")
+    results, leftover = asyncio.run(session())
+    assert results == ["window value", "window value"] and source.calls["window"] == 2
+
+    print("\n[Test 2] Outside a turn nothing is memoized...")
+    assert leftover is None
+    assert TurnContext.current() is not TurnContext.current()
+
+    print("\n✅ Turn isolation tests complete")
+
+
+if __name__ == "__main__":
+    print("\n🤖 SARTHAKA - Turn Context Test Suite")
+
+    test_fan_out_and_memo()
+    test_turn_isolation()
+
+    print("\n" + "="*60)
+    print("🎉 ALL TURN CONTEXT TESTS COMPLETE")
+    print("="*60)
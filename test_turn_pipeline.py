@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Turn Pipeline Test Suite - Friday's Staged Turns
+Tests stage overlap, drop-oldest for proactive frames and backpressure for
+the user's turns, with a stand-in partner (no screen, cloud or speakers needed).
+"""
+
+import sys
+import os
+import time
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.turn_pipeline import StageQueue, TurnJob, TurnPipeline
+
+
+class FakePartner:
+    """Stage timings of a real turn, scaled down: capture, think (cloud) and speak."""
+
+    def __init__(self, capture=0.05, think=0.1, speak=0.1):
+        self.delays = {"capture": capture, "think": think, "speak": speak}
+        self.log = []
+        self.spoken = []
+        self._last_user_turn = 0.0
+
+    def start_turn(self, user_speech=None, proactive=False):
+        return None
+
+    async def _stage(self, name, label):
+        self.log.append((name, label, "start", time.perf_counter()))
+        await asyncio.sleep(self.delays[name])
+        self.log.append((name, label, "end", time.perf_counter()))
+
+    async def prepare_frame(self, deadline=None):
+        self.frame_count = getattr(self, "frame_count", 0) + 1
+        await self._stage("capture", self.frame_count)
+        return {"frame": self.frame_count}
+
+    async def generate_response(self, user_speech=None, proactive=False, frame=None, turn=None, deadline=None):
+        label = user_speech or f"frame {frame['frame']}"
+        await self._stage("think", label)
+        return f"reply to {label}"
+
+    def take_streamed_speech(self):
+        return None, None
+
+    async def speak(self, text, streamed=None, deadline=None, priority=None):
+        await self._stage("speak", text)
+        self.spoken.append(text)
+
+    def when(self, name, label, edge):
+        return next(t for n, l, e, t in self.log if (n, l, e) == (name, label, edge))
+
+
+def test_stage_overlap():
+    """Test that the next turn is captured and thought about while a reply is spoken."""
+    print("\n" + "="*60)
+    print("🧪 TURN PIPELINE: STAGE OVERLAP")
+    print("="*60)
+
+    partner = FakePartner()
+    pipeline = TurnPipeline(partner, queue_size=4, frame_slots=1, reply_slots=2)
+
+    async def session():
+        started = time.perf_counter()
+        for text in ("one", "two", "three"):
+            await pipeline.submit(user_speech=text)
+        assert await pipeline.join(timeout=5)
+        await pipeline.stop()
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(session())
+    serial = 3 * sum(partner.delays.values())
+
+    print(f"\n[Test 1] Three turns in {elapsed * 1000:.0f}ms (serial: {serial * 1000:.0f}ms)...")
+    assert partner.spoken == ["reply to one", "reply to two", "reply to three"]
+    assert elapsed < serial * 0.8
+
+    print("\n[Test 2] Turn two was thought about while reply one played...")
+    assert partner.when("think", "two", "start") < partner.when("speak", "reply to one", "end")
+    print(f"   {pipeline.get_stats()}")
+    assert pipeline.spoken == 3 and pipeline.get_stats()["in_flight"] == 0
+
+    print("\n✅ Stage overlap tests complete")
+
+
+def test_drop_oldest_and_backpressure():
+    """Test that stale proactive frames are dropped and the user's turns never are."""
+    print("\n" + "="*60)
+    print("🧪 TURN PIPELINE: DROP-OLDEST AND BACKPRESSURE")
+    print("="*60)
+
+    print("\n[Test 1] A slow cloud call keeps only the newest proactive frame waiting...")
+    partner = FakePartner(capture=0.01, think=0.2, speak=0.01)
+    pipeline = TurnPipeline(partner, queue_size=1, frame_slots=1, reply_slots=1)
+
+    async def proactive_burst():
+        for _ in range(6):
+            await pipeline.submit(proactive=True)
+            await asyncio.sleep(0.03)
+        assert await pipeline.join(timeout=5)
+        await pipeline.stop()
+
+    asyncio.run(proactive_burst())
+    stats = pipeline.get_stats()
+    print(f"   Spoken: {partner.spoken}")
+    print(f"   {stats['queues']}")
+    assert len(partner.spoken) < 6 and stats["queues"]["jobs"]["dropped"] + stats["queues"]["frames"]["dropped"] > 0
+    assert partner.spoken[-1] == f"reply to frame {partner.frame_count}"
+
+    print("\n[Test 2] The user's turns wait for room instead...")
+    partner = FakePartner(capture=0.01, think=0.05, speak=0.01)
+    pipeline = TurnPipeline(partner, queue_size=1, frame_slots=1, reply_slots=1)
+
+    async def user_burst():
+        for i in range(5):
+            await pipeline.submit(user_speech=f"question {i}")
+        assert await pipeline.join(timeout=5)
+        await pipeline.stop()
+
+    asyncio.run(user_burst())
+    print(f"   {pipeline.get_stats()['queues']}")
+    assert partner.spoken == [f"reply to question {i}" for i in range(5)]
+    assert pipeline.jobs.waited > 0
+
+    print("\n[Test 3] The user's turn does not wait for a slow proactive cloud call...")
+    partner = FakePartner(capture=0.01, think=0.1, speak=0.01)
+    partner.delays["think"] = 3.0
+    pipeline = TurnPipeline(partner)
+
+    async def user_during_proactive():
+        await pipeline.submit(proactive=True)
+        while not any(n == "think" for n, _, _, _ in partner.log):
+            await asyncio.sleep(0.01)
+        partner.delays["think"] = 0.1
+        partner._last_user_turn = time.time()
+        submitted = time.perf_counter()
+        await pipeline.submit(user_speech="what's this error")
+        assert await pipeline.join(timeout=5)
+        await pipeline.stop()
+        return partner.when("think", "what's this error", "start") - submitted
+
+    waited = asyncio.run(user_during_proactive())
+    print(f"   User turn started thinking after {waited * 1000:.0f}ms; {pipeline.get_stats()}")
+    assert waited < 0.2 and pipeline.preempted == 1
+    assert partner.spoken == ["reply to what's this error"]
+
+    print("\n[Test 4] Speech makes finished proactive replies stale...")
+    partner = FakePartner(capture=0.01, think=0.05, speak=0.2)
+    pipeline = TurnPipeline(partner)
+
+    async def interrupted():
+        await pipeline.submit(user_speech="first")
+        await pipeline.submit(proactive=True)
+        await asyncio.sleep(0.2)
+        partner._last_user_turn = time.time()
+        await pipeline.submit(user_speech="wait")
+        assert await pipeline.join(timeout=5)
+        await pipeline.stop()
+
+    asyncio.run(interrupted())
+    print(f"   Spoken: {partner.spoken}, stale: {pipeline.stale}")
+    assert partner.spoken == ["reply to first", "reply to wait"] and pipeline.stale == 1
+
+    print("\n[Test 5] A full queue of user turns drops the new proactive one...")
+    queue = StageQueue("frames", maxsize=1)
+
+    async def full():
+        await queue.put(TurnJob(user_speech="hi"))
+        return await queue.put(TurnJob(proactive=True))
+
+    assert asyncio.run(full()) is False and queue.dropped == 1 and len(queue) == 1
+
+    print("\n✅ Drop-oldest and backpressure tests complete")
+
+
+if __name__ == "__main__":
+    print("\n🤖 SARTHAKA - Turn Pipeline Test Suite")
+
+    test_stage_overlap()
+    test_drop_oldest_and_backpressure()
+
+    print("\n" + "="*60)
+    print("🎉 ALL TURN PIPELINE TESTS COMPLETE")
+    print("="*60)